@@ -21,6 +21,13 @@ if config.config_file_name is not None:
 from app.db.models import Base
 target_metadata = Base.metadata
 
+# Tables managed by the partitioning of emission_statements (migration 0006,
+# app/db/partitioning.py) rather than by the models; autogenerate must not drop them
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and reflected and compare_to is None:
+        return not (name.startswith("emission_statements_") or name == "emission_statement_keys")
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -32,6 +39,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -49,7 +57,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,160 @@
+"""Initial schema
+
+Baseline of the tables defined in app/db/models.py and app/db/csrd_models.py.
+Databases created before migrations were introduced can be marked as being at
+this revision with ``alembic stamp 0001``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-04-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps():
+    return [
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'organizations',
+        sa.Column('organization_pk', sa.String(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('parent_organization_id', sa.String(), sa.ForeignKey('organizations.organization_pk'), nullable=True),
+        *_timestamps()
+    )
+    op.create_table(
+        'facilities',
+        sa.Column('facility_pk', sa.String(), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('address', sa.String(), nullable=True),
+        sa.Column('city', sa.String(), nullable=True),
+        sa.Column('country', sa.String(), nullable=True),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        *_timestamps()
+    )
+    op.create_table(
+        'organization_facility',
+        sa.Column('organization_id', sa.String(), sa.ForeignKey('organizations.organization_pk')),
+        sa.Column('facility_id', sa.String(), sa.ForeignKey('facilities.facility_pk')),
+    )
+    op.create_table(
+        'emission_statements',
+        sa.Column('emission_statement_pk', sa.String(), primary_key=True),
+        sa.Column('emission_activity_id', sa.String(), nullable=False),
+        sa.Column('emission_calculation_model_id', sa.String(), nullable=True),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.Column('unit', sa.String(), nullable=False),
+        sa.Column('reporting_period_start', sa.DateTime(), nullable=False),
+        sa.Column('reporting_period_end', sa.DateTime(), nullable=False),
+        sa.Column('facility_id', sa.String(), sa.ForeignKey('facilities.facility_pk'), nullable=True),
+        sa.Column('organization_id', sa.String(), sa.ForeignKey('organizations.organization_pk'), nullable=False),
+        *_timestamps()
+    )
+    op.create_table(
+        'emission_reports',
+        sa.Column('emission_report_pk', sa.String(), primary_key=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('report_period_start', sa.DateTime(), nullable=False),
+        sa.Column('report_period_end', sa.DateTime(), nullable=False),
+        sa.Column('organization_id', sa.String(), sa.ForeignKey('organizations.organization_pk'), nullable=False),
+        sa.Column('report_type', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        *_timestamps()
+    )
+    op.create_table(
+        'emission_report_statements',
+        sa.Column('emission_report_id', sa.String(), sa.ForeignKey('emission_reports.emission_report_pk')),
+        sa.Column('emission_statement_id', sa.String(), sa.ForeignKey('emission_statements.emission_statement_pk')),
+    )
+    op.create_table(
+        'environmental_product_declarations',
+        sa.Column('environmental_product_declaration_pk', sa.String(), primary_key=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('product_name', sa.String(), nullable=False),
+        sa.Column('organization_id', sa.String(), sa.ForeignKey('organizations.organization_pk'), nullable=False),
+        sa.Column('valid_from', sa.DateTime(), nullable=False),
+        sa.Column('valid_to', sa.DateTime(), nullable=True),
+        *_timestamps()
+    )
+    op.create_table(
+        'water_activity_types',
+        sa.Column('water_activity_type_id', sa.String(), primary_key=True),
+        sa.Column('water_activity_type_name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        *_timestamps()
+    )
+    op.create_table(
+        'data_quality',
+        sa.Column('entity_id', sa.String(), primary_key=True),
+        sa.Column('quality_score', sa.Float(), nullable=True),
+        sa.Column('verification_status', sa.String(), nullable=True),
+        sa.Column('verification_date', sa.DateTime(), nullable=True),
+        sa.Column('verified_by', sa.String(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        *_timestamps()
+    )
+    op.create_table(
+        'csrd_reports',
+        sa.Column('csrd_report_pk', sa.String(), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('reporting_period_start', sa.DateTime(), nullable=False),
+        sa.Column('reporting_period_end', sa.DateTime(), nullable=False),
+        sa.Column('organization_id', sa.String(), sa.ForeignKey('organizations.organization_pk'), nullable=False),
+        sa.Column('report_type', sa.Enum('ANNUAL', 'INTERIM', 'SUPPLEMENTARY', name='csrdreporttype'), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('DRAFT', 'IN_REVIEW', 'APPROVED', 'PUBLISHED', 'SUBMITTED', name='csrdreportstatus'),
+            nullable=False
+        ),
+        sa.Column('version', sa.String(), nullable=False),
+        sa.Column('prepared_by', sa.String(), nullable=False),
+        sa.Column('approved_by', sa.String(), nullable=True),
+        *_timestamps(),
+        sa.Column('esrs_compliance', sa.JSON(), nullable=True),
+        sa.Column('materiality_assessment', sa.JSON(), nullable=True),
+        sa.Column('double_materiality', sa.JSON(), nullable=True),
+        sa.Column('sustainability_targets', sa.JSON(), nullable=True),
+        sa.Column('value_chain_assessment', sa.JSON(), nullable=True),
+    )
+    op.create_index('ix_csrd_reports_csrd_report_pk', 'csrd_reports', ['csrd_report_pk'])
+    op.create_table(
+        'csrd_emission_reports',
+        sa.Column('csrd_report_pk', sa.String(), sa.ForeignKey('csrd_reports.csrd_report_pk')),
+        sa.Column('emission_report_pk', sa.String(), sa.ForeignKey('emission_reports.emission_report_pk')),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('csrd_emission_reports')
+    op.drop_index('ix_csrd_reports_csrd_report_pk', table_name='csrd_reports')
+    op.drop_table('csrd_reports')
+    op.drop_table('data_quality')
+    op.drop_table('water_activity_types')
+    op.drop_table('environmental_product_declarations')
+    op.drop_table('emission_report_statements')
+    op.drop_table('emission_reports')
+    op.drop_table('emission_statements')
+    op.drop_table('organization_facility')
+    op.drop_table('facilities')
+    op.drop_table('organizations')
+    sa.Enum(name='csrdreportstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='csrdreporttype').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,86 @@
+"""Emission statement and association table indexes
+
+emission_statements gets one composite index per common access path, each
+ending in reporting_period_start so period filters are served by the same
+index:
+
+- (organization_id, reporting_period_start): per-organization totals and lists
+- (facility_id, reporting_period_start): per-facility totals and lists
+- (emission_activity_id, reporting_period_start): per-activity breakdowns
+- (reporting_period_start, reporting_period_end): cross-organization period scans
+
+The association tables get a composite primary key (which also serves lookups
+from the first column) plus an index on the second column for the reverse
+direction. Duplicate and NULL rows are removed first, since neither can be
+represented once the primary key exists.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-04-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+EMISSION_STATEMENT_INDEXES = {
+    'ix_emission_statements_org_period': ['organization_id', 'reporting_period_start'],
+    'ix_emission_statements_facility_period': ['facility_id', 'reporting_period_start'],
+    'ix_emission_statements_activity_period': ['emission_activity_id', 'reporting_period_start'],
+    'ix_emission_statements_period': ['reporting_period_start', 'reporting_period_end'],
+}
+
+# table -> (leading primary key column, second primary key column)
+ASSOCIATION_TABLES = {
+    'organization_facility': ('organization_id', 'facility_id'),
+    'emission_report_statements': ('emission_report_id', 'emission_statement_id'),
+    'csrd_emission_reports': ('csrd_report_pk', 'emission_report_pk'),
+}
+
+
+def _deduplicate(table: str, first: str, second: str) -> None:
+    op.execute(f"DELETE FROM {table} WHERE {first} IS NULL OR {second} IS NULL")
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            f"DELETE FROM {table} a USING {table} b "
+            f"WHERE a.ctid < b.ctid AND a.{first} = b.{first} AND a.{second} = b.{second}"
+        )
+    else:
+        op.execute(
+            f"DELETE FROM {table} WHERE rowid NOT IN "
+            f"(SELECT MIN(rowid) FROM {table} GROUP BY {first}, {second})"
+        )
+
+
+def upgrade() -> None:
+    for name, columns in EMISSION_STATEMENT_INDEXES.items():
+        op.create_index(name, 'emission_statements', columns)
+
+    for table, (first, second) in ASSOCIATION_TABLES.items():
+        _deduplicate(table, first, second)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(first, existing_type=sa.String(), nullable=False)
+            batch_op.alter_column(second, existing_type=sa.String(), nullable=False)
+            batch_op.create_primary_key(f'pk_{table}', [first, second])
+        op.create_index(f'ix_{table}_{second}', table, [second])
+
+
+def downgrade() -> None:
+    for table, (first, second) in ASSOCIATION_TABLES.items():
+        op.drop_index(f'ix_{table}_{second}', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f'pk_{table}', type_='primary')
+            batch_op.alter_column(first, existing_type=sa.String(), nullable=True)
+            batch_op.alter_column(second, existing_type=sa.String(), nullable=True)
+
+    for name in EMISSION_STATEMENT_INDEXES:
+        op.drop_index(name, table_name='emission_statements')
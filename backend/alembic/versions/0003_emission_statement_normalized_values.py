@@ -0,0 +1,68 @@
+"""Normalized emission statement values
+
+Adds normalized_value and normalized_unit to emission_statements and fills
+them for existing rows whose unit is known. The factors are a snapshot of the
+unit registry in app/services/units.py at the time of this revision; rows in
+units added later can be filled with emission_service.backfill_normalized_values.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-05-06 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CANONICAL_UNIT = 'kg CO2e'
+
+# Unit with spaces removed -> factor to kg CO2e
+UNIT_FACTORS = {
+    'mgCO2e': 1e-6,
+    'gCO2e': 1e-3,
+    'kgCO2e': 1.0,
+    'tCO2e': 1e3,
+    'tonneCO2e': 1e3,
+    'tonnesCO2e': 1e3,
+    'metrictonCO2e': 1e3,
+    'ktCO2e': 1e6,
+    'MtCO2e': 1e9,
+    'GtCO2e': 1e12,
+    'lbCO2e': 0.45359237,
+    'shorttonCO2e': 907.18474,
+    'longtonCO2e': 1016.0469088,
+}
+
+UNIT_KEY_SQL = (
+    "replace(replace(replace(replace(unit, ' ', ''), 'CO2-eq', 'CO2e'), 'CO2eq', 'CO2e'), 'CO2-e', 'CO2e')"
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('emission_statements') as batch_op:
+        batch_op.add_column(sa.Column('normalized_value', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('normalized_unit', sa.String(), nullable=True))
+
+    factor_case = " ".join(f"WHEN '{key}' THEN {factor!r}" for key, factor in UNIT_FACTORS.items())
+    keys = ", ".join(f"'{key}'" for key in UNIT_FACTORS)
+    op.execute(
+        f"UPDATE emission_statements "
+        f"SET normalized_value = value * (CASE {UNIT_KEY_SQL} {factor_case} END), "
+        f"normalized_unit = '{CANONICAL_UNIT}' "
+        f"WHERE {UNIT_KEY_SQL} IN ({keys})"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('emission_statements') as batch_op:
+        batch_op.drop_column('normalized_unit')
+        batch_op.drop_column('normalized_value')
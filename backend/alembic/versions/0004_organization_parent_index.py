@@ -0,0 +1,28 @@
+"""Index on organizations.parent_organization_id
+
+Serves the recursive subtree query behind organization rollups, which looks
+up the children of every organization it reaches.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-05-13 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_organizations_parent_organization_id', 'organizations', ['parent_organization_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_organizations_parent_organization_id', table_name='organizations')
@@ -0,0 +1,51 @@
+"""Emission rollup table
+
+Totals per organization, facility, month and unit, maintained by the service
+layer on every statement write and repaired by the reconcile job. The table
+is filled from the existing statements here.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-05-20 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'emission_rollups',
+        sa.Column('organization_id', sa.String(), primary_key=True),
+        sa.Column('facility_key', sa.String(), primary_key=True),
+        sa.Column('month', sa.DateTime(), primary_key=True),
+        sa.Column('unit', sa.String(), primary_key=True),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('statement_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        month = "date_trunc('month', reporting_period_start)"
+    else:
+        # Same text format SQLAlchemy uses for DateTime values on SQLite
+        month = "strftime('%Y-%m-01 00:00:00.000000', reporting_period_start)"
+    op.execute(
+        f"INSERT INTO emission_rollups (organization_id, facility_key, month, unit, total, statement_count) "
+        f"SELECT organization_id, COALESCE(facility_id, ''), {month}, unit, SUM(value), COUNT(*) "
+        f"FROM emission_statements "
+        f"GROUP BY organization_id, COALESCE(facility_id, ''), {month}, unit"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('emission_rollups')
@@ -0,0 +1,168 @@
+"""Partition emission_statements by reporting period
+
+On PostgreSQL, emission_statements becomes a table partitioned by range of
+reporting_period_start, yearly or monthly depending on
+EMISSION_STATEMENT_PARTITION_INTERVAL ("year" by default), with one partition
+per interval from the oldest statement to the next interval and a default
+partition for anything outside. Partitions for later periods are created
+with app/db/partitioning.py.
+
+A partitioned table can only have unique constraints that include the
+partition key, so the primary key becomes (emission_statement_pk,
+reporting_period_start). Uniqueness of emission_statement_pk on its own is
+kept by emission_statement_keys, which a trigger maintains on every insert,
+update and delete; emission_report_statements now references that table
+with a foreign key checked at commit.
+
+The existing rows are copied into the new table, so run this in a
+maintenance window on large databases. Other databases are left unchanged.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-06-02 00:00:00
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITION_INTERVAL = os.getenv('EMISSION_STATEMENT_PARTITION_INTERVAL', 'year')
+
+INDEXES = {
+    'ix_emission_statements_org_period': ['organization_id', 'reporting_period_start'],
+    'ix_emission_statements_facility_period': ['facility_id', 'reporting_period_start'],
+    'ix_emission_statements_activity_period': ['emission_activity_id', 'reporting_period_start'],
+    'ix_emission_statements_period': ['reporting_period_start', 'reporting_period_end'],
+}
+
+REPORT_LINK_FK = 'emission_report_statements_emission_statement_id_fkey'
+
+KEYS_FUNCTION = """
+CREATE FUNCTION emission_statement_keys_sync() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO emission_statement_keys VALUES (NEW.emission_statement_pk, NEW.reporting_period_start);
+        RETURN NEW;
+    ELSIF TG_OP = 'DELETE' THEN
+        DELETE FROM emission_statement_keys WHERE emission_statement_pk = OLD.emission_statement_pk;
+        RETURN OLD;
+    END IF;
+    UPDATE emission_statement_keys
+    SET emission_statement_pk = NEW.emission_statement_pk, reporting_period_start = NEW.reporting_period_start
+    WHERE emission_statement_pk = OLD.emission_statement_pk;
+    RETURN NEW;
+END
+$$
+"""
+
+# An update that moves a row to another partition fires the DELETE and INSERT
+# triggers instead, so the key is briefly missing; the report link foreign key
+# is deferred to commit for that reason
+KEYS_TRIGGER = """
+CREATE TRIGGER emission_statement_keys_sync
+AFTER INSERT OR DELETE OR UPDATE OF emission_statement_pk, reporting_period_start ON emission_statements
+FOR EACH ROW EXECUTE FUNCTION emission_statement_keys_sync()
+"""
+
+
+def _interval_start(value: datetime) -> datetime:
+    if PARTITION_INTERVAL == 'month':
+        return datetime(value.year, value.month, 1)
+    return datetime(value.year, 1, 1)
+
+
+def _next_interval(start: datetime) -> datetime:
+    if PARTITION_INTERVAL == 'month':
+        return datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return datetime(start.year + 1, 1, 1)
+
+
+def _partition_name(start: datetime) -> str:
+    if PARTITION_INTERVAL == 'month':
+        return f'emission_statements_m{start:%Y%m}'
+    return f'emission_statements_y{start:%Y}'
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    if PARTITION_INTERVAL not in ('year', 'month'):
+        raise ValueError("EMISSION_STATEMENT_PARTITION_INTERVAL must be 'year' or 'month'")
+
+    op.execute(f'ALTER TABLE emission_report_statements DROP CONSTRAINT IF EXISTS {REPORT_LINK_FK}')
+    op.execute('ALTER TABLE emission_statements RENAME TO emission_statements_unpartitioned')
+    op.execute('ALTER TABLE emission_statements_unpartitioned RENAME CONSTRAINT emission_statements_pkey TO emission_statements_unpartitioned_pkey')
+    for name in INDEXES:
+        op.drop_index(name, table_name='emission_statements_unpartitioned')
+
+    op.execute(
+        'CREATE TABLE emission_statements (LIKE emission_statements_unpartitioned INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (reporting_period_start)'
+    )
+    op.create_primary_key('emission_statements_pkey', 'emission_statements', ['emission_statement_pk', 'reporting_period_start'])
+    op.create_foreign_key('emission_statements_organization_id_fkey', 'emission_statements', 'organizations', ['organization_id'], ['organization_pk'])
+    op.create_foreign_key('emission_statements_facility_id_fkey', 'emission_statements', 'facilities', ['facility_id'], ['facility_pk'])
+
+    oldest = op.get_bind().execute(sa.text('SELECT min(reporting_period_start) FROM emission_statements_unpartitioned')).scalar()
+    start = _interval_start(oldest or datetime.utcnow())
+    last = _next_interval(_interval_start(datetime.utcnow()))
+    while start <= last:
+        end = _next_interval(start)
+        op.execute(
+            f"CREATE TABLE {_partition_name(start)} PARTITION OF emission_statements "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+    op.execute('CREATE TABLE emission_statements_default PARTITION OF emission_statements DEFAULT')
+
+    op.execute('INSERT INTO emission_statements SELECT * FROM emission_statements_unpartitioned')
+    # Indexes on the parent are created on every partition, after the load
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'emission_statements', columns)
+
+    op.create_table(
+        'emission_statement_keys',
+        sa.Column('emission_statement_pk', sa.String(), primary_key=True),
+        sa.Column('reporting_period_start', sa.DateTime(), nullable=False),
+    )
+    op.execute('INSERT INTO emission_statement_keys SELECT emission_statement_pk, reporting_period_start FROM emission_statements_unpartitioned')
+    op.execute(KEYS_FUNCTION)
+    op.execute(KEYS_TRIGGER)
+    op.create_foreign_key(
+        REPORT_LINK_FK, 'emission_report_statements', 'emission_statement_keys',
+        ['emission_statement_id'], ['emission_statement_pk'], deferrable=True, initially='DEFERRED'
+    )
+
+    op.drop_table('emission_statements_unpartitioned')
+    op.execute('ANALYZE emission_statements')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(f'ALTER TABLE emission_report_statements DROP CONSTRAINT IF EXISTS {REPORT_LINK_FK}')
+    op.execute('CREATE TABLE emission_statements_unpartitioned (LIKE emission_statements INCLUDING DEFAULTS)')
+    op.execute('INSERT INTO emission_statements_unpartitioned SELECT * FROM emission_statements')
+    op.execute('DROP TABLE emission_statements CASCADE')
+    op.execute('DROP FUNCTION emission_statement_keys_sync()')
+    op.drop_table('emission_statement_keys')
+
+    op.execute('ALTER TABLE emission_statements_unpartitioned RENAME TO emission_statements')
+    op.create_primary_key('emission_statements_pkey', 'emission_statements', ['emission_statement_pk'])
+    op.create_foreign_key('emission_statements_organization_id_fkey', 'emission_statements', 'organizations', ['organization_id'], ['organization_pk'])
+    op.create_foreign_key('emission_statements_facility_id_fkey', 'emission_statements', 'facilities', ['facility_id'], ['facility_pk'])
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'emission_statements', columns)
+    op.create_foreign_key(REPORT_LINK_FK, 'emission_report_statements', 'emission_statements', ['emission_statement_id'], ['emission_statement_pk'])
@@ -0,0 +1,29 @@
+"""Index on emission_rollups.month
+
+The rollup primary key leads with organization_id, which serves trends and
+totals for one organization. Trends over a period range across all
+organizations read the rollups by month instead.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-06-10 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_emission_rollups_month', 'emission_rollups', ['month', 'organization_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_emission_rollups_month', table_name='emission_rollups')
@@ -0,0 +1,43 @@
+"""Cover the ranked columns in the organization/period index
+
+Rankings and totals per facility or activity for an organization and period
+read facility_id, emission_activity_id and the value and unit columns of
+every statement in the range. On PostgreSQL ix_emission_statements_org_period
+now carries those columns (INCLUDE), so the scan is answered from the index
+without visiting the table. Other databases are left unchanged.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-06-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INCLUDED_COLUMNS = ['facility_id', 'emission_activity_id', 'value', 'unit', 'normalized_value', 'normalized_unit']
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_emission_statements_org_period', table_name='emission_statements')
+    op.create_index(
+        'ix_emission_statements_org_period', 'emission_statements', ['organization_id', 'reporting_period_start'],
+        postgresql_include=INCLUDED_COLUMNS
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_emission_statements_org_period', table_name='emission_statements')
+    op.create_index('ix_emission_statements_org_period', 'emission_statements', ['organization_id', 'reporting_period_start'])
@@ -0,0 +1,78 @@
+"""Normalize emission statements in every CO2e spelling
+
+Revision 0003 only recognised the CO2e suffix spelled "CO2e", "CO2-eq",
+"CO2eq" or "CO2-e" in that case, so statements in units such as "kg co2e",
+"t CO2eq" or "kg CO2_e" were left without a normalized value. This fills
+them with the same key the unit registry uses: whitespace removed and the
+suffix matched case-insensitively, the prefix keeping its case. The factors
+are the snapshot taken in revision 0003.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2025-06-23 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CANONICAL_UNIT = 'kg CO2e'
+
+# Unit key -> factor to kg CO2e
+UNIT_FACTORS = {
+    'mgCO2e': 1e-6,
+    'gCO2e': 1e-3,
+    'kgCO2e': 1.0,
+    'tCO2e': 1e3,
+    'tonneCO2e': 1e3,
+    'tonnesCO2e': 1e3,
+    'metrictonCO2e': 1e3,
+    'ktCO2e': 1e6,
+    'MtCO2e': 1e9,
+    'GtCO2e': 1e12,
+    'lbCO2e': 0.45359237,
+    'shorttonCO2e': 907.18474,
+    'longtonCO2e': 1016.0469088,
+}
+
+# Upper-cased CO2e suffix spellings, longest first
+SUFFIXES = sorted(
+    (f'CO2{separator}{suffix}' for separator in ('', '-', '_') for suffix in ('E', 'EQ', 'EQUIVALENT')),
+    key=len, reverse=True
+)
+
+STRIPPED_SQL = "replace(replace(replace(replace(unit, ' ', ''), '\t', ''), '\n', ''), '\r', '')"
+
+UNIT_KEY_SQL = (
+    "CASE "
+    + " ".join(
+        f"WHEN upper(substr({STRIPPED_SQL}, length({STRIPPED_SQL}) - {len(suffix) - 1})) = '{suffix}' "
+        f"THEN substr({STRIPPED_SQL}, 1, length({STRIPPED_SQL}) - {len(suffix)}) || 'CO2e'"
+        for suffix in SUFFIXES
+    )
+    + f" ELSE {STRIPPED_SQL} END"
+)
+
+
+def upgrade() -> None:
+    factor_case = " ".join(f"WHEN '{key}' THEN {factor!r}" for key, factor in UNIT_FACTORS.items())
+    keys = ", ".join(f"'{key}'" for key in UNIT_FACTORS)
+    op.execute(
+        f"UPDATE emission_statements "
+        f"SET normalized_value = value * (CASE {UNIT_KEY_SQL} {factor_case} END), "
+        f"normalized_unit = '{CANONICAL_UNIT}' "
+        f"WHERE normalized_value IS NULL AND {UNIT_KEY_SQL} IN ({keys})"
+    )
+
+
+def downgrade() -> None:
+    # The filled values are correct under either revision; nothing to undo
+    pass
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_report_db
+from app.db.routing import get_async_read_db, get_report_read_db
 from app.models.csrd_report import CSRDReport, CSRDReportCreate
 from app.services import csrd_report_service
+from app.services.pagination import set_next_cursor
+from app.services.bulkhead import heavy_bulkhead
 
 router = APIRouter(
     prefix="/api/csrd-reports",
@@ -13,39 +17,51 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[CSRDReport])
-async def get_csrd_reports(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_csrd_reports(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Retrieve a list of CSRD reports.
+
+    Pass the X-Next-Cursor header of a response as `cursor` to fetch the next page.
     """
-    return csrd_report_service.get_csrd_reports(db, skip=skip, limit=limit)
+    csrd_reports = await csrd_report_service.get_csrd_reports_async(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, csrd_reports, "csrd_report_pk", limit)
+    return csrd_reports
 
 @router.get("/{csrd_report_pk}", response_model=CSRDReport)
-async def get_csrd_report(csrd_report_pk: str, db: Session = Depends(get_db)):
+async def get_csrd_report(csrd_report_pk: str, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific CSRD report by its primary key.
     """
-    db_csrd_report = csrd_report_service.get_csrd_report(db, csrd_report_pk=csrd_report_pk)
+    db_csrd_report = await csrd_report_service.get_csrd_report_async(db, csrd_report_pk=csrd_report_pk)
     if db_csrd_report is None:
         raise HTTPException(status_code=404, detail="CSRD report not found")
     return db_csrd_report
 
 @router.post("/", response_model=CSRDReport)
-async def create_csrd_report(csrd_report: CSRDReportCreate, db: Session = Depends(get_db)):
+async def create_csrd_report(csrd_report: CSRDReportCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new CSRD report.
     """
-    return csrd_report_service.create_csrd_report(db, csrd_report=csrd_report)
+    return await csrd_report_service.create_csrd_report_async(db, csrd_report=csrd_report)
 
 @router.get("/{csrd_report_pk}/generate", response_model=dict)
-async def generate_csrd_report_document(csrd_report_pk: str, format: str = "pdf", db: Session = Depends(get_db)):
+async def generate_csrd_report_document(csrd_report_pk: str, format: str = "pdf", db: Session = Depends(get_report_read_db)):
     """
     Generate a CSRD-compliant report document in the specified format.
     """
-    return csrd_report_service.generate_report_document(db, csrd_report_pk=csrd_report_pk, format=format)
+    return await heavy_bulkhead.run(
+        csrd_report_service.generate_report_document, db, csrd_report_pk=csrd_report_pk, format=format
+    )
 
 @router.get("/{csrd_report_pk}/validate", response_model=dict)
-async def validate_csrd_report(csrd_report_pk: str, db: Session = Depends(get_db)):
+async def validate_csrd_report(csrd_report_pk: str, db: Session = Depends(get_report_db)):
     """
     Validate a CSRD report against ESRS requirements.
     """
-    return csrd_report_service.validate_csrd_report(db, csrd_report_pk=csrd_report_pk)
+    return await heavy_bulkhead.run(csrd_report_service.validate_csrd_report, db, csrd_report_pk=csrd_report_pk)
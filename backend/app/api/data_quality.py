@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from app.db.database import get_db
+from app.db.database import get_async_db
+from app.db.routing import get_async_read_db
 from app.models.data_quality import DataQuality, DataQualityCreate
 from app.services import data_quality_service
+from app.services.pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/api/data-quality",
@@ -13,25 +15,35 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[DataQuality])
-async def get_data_quality_entries(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_data_quality_entries(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Retrieve a list of data quality entries.
+
+    Pass the X-Next-Cursor header of a response as `cursor` to fetch the next page.
     """
-    return data_quality_service.get_data_quality_entries(db, skip=skip, limit=limit)
+    data_quality_entries = await data_quality_service.get_data_quality_entries_async(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, data_quality_entries, "entity_id", limit)
+    return data_quality_entries
 
 @router.get("/{entity_id}", response_model=DataQuality)
-async def get_data_quality(entity_id: str, db: Session = Depends(get_db)):
+async def get_data_quality(entity_id: str, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific data quality entry by its entity ID.
     """
-    db_data_quality = data_quality_service.get_data_quality(db, entity_id=entity_id)
+    db_data_quality = await data_quality_service.get_data_quality_async(db, entity_id=entity_id)
     if db_data_quality is None:
         raise HTTPException(status_code=404, detail="Data quality entry not found")
     return db_data_quality
 
 @router.post("/", response_model=DataQuality)
-async def create_data_quality(data_quality: DataQualityCreate, db: Session = Depends(get_db)):
+async def create_data_quality(data_quality: DataQualityCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new data quality entry.
     """
-    return data_quality_service.create_data_quality(db, data_quality=data_quality)
+    return await data_quality_service.create_data_quality_async(db, data_quality=data_quality)
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
-from app.db.database import get_db
-from app.models.emission_report import EmissionReport, EmissionReportCreate
+from app.db.database import get_async_db
+from app.db.routing import get_async_read_db
+from app.models.emission_report import EmissionReport, EmissionReportCreate, EmissionReportSummary
 from app.services import emission_report_service
+from app.services.pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/api/emission-reports",
@@ -13,25 +15,51 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[EmissionReport])
-async def get_emission_reports(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_emission_reports(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Retrieve a list of emission reports.
+
+    Pass the X-Next-Cursor header of a response as `cursor` to fetch the next page.
     """
-    return emission_report_service.get_emission_reports(db, skip=skip, limit=limit)
+    emission_reports = await emission_report_service.get_emission_reports_async(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, emission_reports, "emission_report_pk", limit)
+    return emission_reports
 
 @router.get("/{emission_report_pk}", response_model=EmissionReport)
-async def get_emission_report(emission_report_pk: str, db: Session = Depends(get_db)):
+async def get_emission_report(emission_report_pk: str, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific emission report by its primary key.
     """
-    db_emission_report = emission_report_service.get_emission_report(db, emission_report_pk=emission_report_pk)
+    db_emission_report = await emission_report_service.get_emission_report_async(db, emission_report_pk=emission_report_pk)
     if db_emission_report is None:
         raise HTTPException(status_code=404, detail="Emission report not found")
     return db_emission_report
 
+@router.get("/{emission_report_pk}/summary", response_model=EmissionReportSummary)
+async def get_emission_report_summary(
+    emission_report_pk: str,
+    normalize: bool = Query(True, description="Convert values to the canonical unit (kg CO2e) where the unit is known"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Totals of the emission statements linked to a report: overall, by facility,
+    by activity and by recorded unit.
+
+    Computed in the database with a single query; totals are split by unit.
+    """
+    if await emission_report_service.get_emission_report_async(db, emission_report_pk=emission_report_pk) is None:
+        raise HTTPException(status_code=404, detail="Emission report not found")
+    return await emission_report_service.get_emission_report_summary_async(db, emission_report_pk=emission_report_pk, normalize=normalize)
+
 @router.post("/", response_model=EmissionReport)
-async def create_emission_report(emission_report: EmissionReportCreate, db: Session = Depends(get_db)):
+async def create_emission_report(emission_report: EmissionReportCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new emission report.
     """
-    return emission_report_service.create_emission_report(db, emission_report=emission_report)
+    return await emission_report_service.create_emission_report_async(db, emission_report=emission_report)
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
+import os
 
-from app.db.database import get_db
-from app.models.emission_statement import EmissionStatement
-from app.services import emission_service
+from app.db.database import get_async_db, get_db
+from app.db.routing import get_async_read_db
+from app.models.bulk import BulkInsertResult, BulkUploadResult
+from app.models.emission_statement import EmissionStatement, EmissionStatementCreate
+from app.services import copy_import, emission_service, streaming_upload
+from app.services.pagination import set_next_cursor
 
 router = APIRouter(
     prefix="/api/emission-statements",
@@ -12,26 +17,89 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "50000"))
+
 @router.get("/", response_model=List[EmissionStatement])
-async def get_emission_statements(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_emission_statements(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Retrieve a list of emission statements.
+
+    Pass the X-Next-Cursor header of a response as `cursor` to fetch the next page.
     """
-    return emission_service.get_emission_statements(db, skip=skip, limit=limit)
+    emission_statements = await emission_service.get_emission_statements_async(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, emission_statements, "emission_statement_pk", limit)
+    return emission_statements
 
 @router.get("/{emission_statement_pk}", response_model=EmissionStatement)
-async def get_emission_statement(emission_statement_pk: str, db: Session = Depends(get_db)):
+async def get_emission_statement(emission_statement_pk: str, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific emission statement by its primary key.
     """
-    db_emission_statement = emission_service.get_emission_statement(db, emission_statement_pk=emission_statement_pk)
+    db_emission_statement = await emission_service.get_emission_statement_async(db, emission_statement_pk=emission_statement_pk)
     if db_emission_statement is None:
         raise HTTPException(status_code=404, detail="Emission statement not found")
     return db_emission_statement
 
 @router.post("/", response_model=EmissionStatement)
-async def create_emission_statement(emission_statement: EmissionStatement, db: Session = Depends(get_db)):
+async def create_emission_statement(emission_statement: EmissionStatementCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new emission statement.
     """
-    return emission_service.create_emission_statement(db, emission_statement=emission_statement)
+    return await emission_service.create_emission_statement_async(db, emission_statement=emission_statement)
+
+@router.post("/bulk", response_model=BulkInsertResult)
+def bulk_create_emission_statements(
+    statements: List[Dict[str, Any]] = Body(...),
+    chunk_size: int = Query(emission_service.BULK_CHUNK_SIZE, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many emission statements in one request.
+
+    Rows are validated individually and inserted in chunks of `chunk_size`, one
+    transaction per chunk. Rows that fail validation or are rejected by the
+    database are listed in `errors`; all other rows are stored.
+    """
+    if len(statements) > BULK_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ROWS} statements per request")
+    return emission_service.bulk_create_emission_statements(db, statements, chunk_size=chunk_size)
+
+@router.post("/upload", response_model=BulkUploadResult)
+async def upload_emission_statements(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or ndjson; defaults to the Content-Type"),
+    mode: str = Query("insert", pattern="^(insert|copy)$", description="insert, or copy for large backfills"),
+    chunk_size: Optional[int] = Query(None, ge=1, le=200000),
+    db: Session = Depends(get_db)
+):
+    """
+    Load emission statements from a CSV or NDJSON request body of any size.
+
+    The body is parsed as it is received and written in chunks of `chunk_size`
+    rows, one transaction per chunk. CSV files need a header row with the
+    EmissionStatementCreate field names. The response summarises how many rows
+    were read, stored and rejected.
+
+    With `mode=copy` each chunk (50,000 rows by default) is loaded with
+    PostgreSQL COPY into a staging table and merged in set-based SQL; rows may
+    then also carry an `emission_report_id` to link them to a report. Other
+    databases fall back to batched inserts.
+    """
+    upload_format = streaming_upload.upload_format(request.headers.get("content-type"), format)
+    if upload_format is None:
+        raise HTTPException(status_code=415, detail="Upload must be CSV (text/csv) or NDJSON (application/x-ndjson)")
+    if mode == "copy":
+        write_chunk = copy_import.copy_emission_statements
+        chunk_size = chunk_size or copy_import.COPY_CHUNK_SIZE
+    else:
+        write_chunk = emission_service.bulk_create_emission_statements
+        chunk_size = chunk_size or emission_service.BULK_CHUNK_SIZE
+        if chunk_size > 5000:
+            raise HTTPException(status_code=400, detail="chunk_size may be at most 5000 in insert mode")
+    return await streaming_upload.ingest_stream(db, request.stream(), upload_format, write_chunk, chunk_size=chunk_size)
@@ -0,0 +1,191 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from datetime import datetime
+
+from app.db.database import get_report_db
+from app.db.routing import get_async_read_db
+from app.models.emission_aggregate import AggregateDimension, EmissionAggregate, EmissionTopEmitters, EmissionTrendSeries, TimeBucket, TrendComparison
+from app.services import emission_aggregation_service, emission_ranking_service, emission_rollup_service, emission_trend_service, organization_service
+from app.services.units import CANONICAL_EMISSION_UNIT
+from app.services.bulkhead import heavy_bulkhead
+
+router = APIRouter(
+    prefix="/api/emissions",
+    tags=["emissions"],
+    responses={404: {"description": "Not found"}},
+)
+
+@router.get("/aggregate", response_model=List[EmissionAggregate])
+async def aggregate_emissions(
+    group_by: List[AggregateDimension] = Query([], description="Dimensions to group by; repeat the parameter for several"),
+    bucket: TimeBucket = Query(TimeBucket.MONTH, description="Size of the time bucket when grouping by period"),
+    normalize: bool = Query(False, description="Convert values to the canonical unit (kg CO2e) where the unit is known"),
+    prorate: bool = Query(False, description="Split statements across the time buckets their reporting period covers"),
+    organization_id: Optional[str] = None,
+    facility_id: Optional[str] = None,
+    emission_activity_id: Optional[str] = None,
+    unit: Optional[str] = None,
+    start: Optional[datetime] = Query(None, description="Only statements whose reporting period starts at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only statements whose reporting period starts before this time"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Total emission statement values grouped by any combination of organization,
+    facility, activity, unit and time bucket.
+
+    Results are always split by unit so values in different units are not added up.
+    With `normalize=true`, statements in known units are totalled in kg CO2e.
+    With `prorate=true`, each statement is split across the buckets its
+    reporting period covers, and `start`/`end` clip the periods to a window.
+    """
+    aggregate = (
+        emission_aggregation_service.prorate_emissions_async if prorate
+        else emission_aggregation_service.aggregate_emissions_async
+    )
+    return await aggregate(
+        db,
+        group_by,
+        bucket,
+        normalize,
+        organization_id=organization_id,
+        facility_id=facility_id,
+        emission_activity_id=emission_activity_id,
+        unit=unit,
+        start=start,
+        end=end
+    )
+
+@router.get("/rollup/{organization_pk}", response_model=List[EmissionAggregate])
+async def rollup_emissions(
+    organization_pk: str,
+    group_by: List[AggregateDimension] = Query([], description="Dimensions to group by; repeat the parameter for several"),
+    bucket: TimeBucket = Query(TimeBucket.MONTH, description="Size of the time bucket when grouping by period"),
+    normalize: bool = Query(False, description="Convert values to the canonical unit (kg CO2e) where the unit is known"),
+    prorate: bool = Query(False, description="Split statements across the time buckets their reporting period covers"),
+    facility_id: Optional[str] = None,
+    emission_activity_id: Optional[str] = None,
+    unit: Optional[str] = None,
+    start: Optional[datetime] = Query(None, description="Only statements whose reporting period starts at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only statements whose reporting period starts before this time"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Total emissions of an organization including all of its subsidiaries.
+
+    The subtree is resolved with a recursive query in the same statement as
+    the aggregation. Group by `organization` for a per-entity breakdown.
+    """
+    if await organization_service.get_organization_async(db, organization_pk=organization_pk) is None:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    aggregate = (
+        emission_aggregation_service.prorate_emissions_async if prorate
+        else emission_aggregation_service.aggregate_emissions_async
+    )
+    return await aggregate(
+        db,
+        group_by,
+        bucket,
+        normalize,
+        organization_subtree_of=organization_pk,
+        facility_id=facility_id,
+        emission_activity_id=emission_activity_id,
+        unit=unit,
+        start=start,
+        end=end
+    )
+
+@router.get("/trends", response_model=List[EmissionTrendSeries])
+async def emission_trends(
+    group_by: List[AggregateDimension] = Query([], description="Dimensions that make up a series: organization, facility, activity"),
+    bucket: TimeBucket = Query(TimeBucket.YEAR, description="Size of the time bucket"),
+    compare: TrendComparison = Query(TrendComparison.PREVIOUS, description="Compare each bucket with the previous one or with the same bucket a year earlier"),
+    normalize: bool = Query(True, description="Convert values to the canonical unit (kg CO2e) where the unit is known"),
+    prorate: bool = Query(False, description="Split statements across the time buckets their reporting period covers"),
+    organization_id: Optional[str] = None,
+    facility_id: Optional[str] = None,
+    emission_activity_id: Optional[str] = None,
+    unit: Optional[str] = None,
+    start: Optional[datetime] = Query(None, description="First bucket of the series; defaults to the first bucket with data"),
+    end: Optional[datetime] = Query(None, description="End of the series (exclusive); defaults to the last bucket with data"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Emission totals over consecutive time buckets per organization, facility
+    or activity, with the change and percentage change against the previous
+    bucket or the same bucket a year earlier.
+
+    Buckets without statements have a total of 0, so every series has the
+    same buckets. Computed from a single aggregation query.
+    """
+    try:
+        emission_trend_service.comparison_lag(bucket, compare)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Raised before the query for a start and end too far apart, after it for data spanning too many buckets
+    try:
+        return await emission_trend_service.get_emission_trends_async(
+            db,
+            group_by,
+            bucket,
+            compare,
+            normalize,
+            prorate,
+            organization_id=organization_id,
+            facility_id=facility_id,
+            emission_activity_id=emission_activity_id,
+            unit=unit,
+            start=start,
+            end=end
+        )
+    except emission_trend_service.TooManyBucketsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/top", response_model=EmissionTopEmitters)
+async def top_emitters(
+    dimension: AggregateDimension = Query(AggregateDimension.FACILITY, description="Rank facilities or activities"),
+    limit: int = Query(20, ge=1, le=1000, description="Number of groups to return"),
+    organization_id: Optional[str] = None,
+    include_subsidiaries: bool = Query(False, description="Include the statements of all subsidiaries of the organization"),
+    start: Optional[datetime] = Query(None, description="Only statements whose reporting period starts at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only statements whose reporting period starts before this time"),
+    normalize: bool = Query(True, description="Convert values to the canonical unit (kg CO2e) where the unit is known"),
+    unit: str = Query(CANONICAL_EMISSION_UNIT, description="Unit to rank in; statements in other units are left out"),
+    cumulative_share: bool = Query(True, description="Include the running share of the total for Pareto charts"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    The facilities or emission activities with the largest emissions, largest
+    first, with each one's share of the total.
+
+    Ranked in the database in a single query; facility rankings over whole
+    months are read from the monthly rollups.
+    """
+    if dimension not in emission_ranking_service.RANKED_DIMENSIONS:
+        raise HTTPException(status_code=400, detail="dimension must be facility or activity")
+    if include_subsidiaries and organization_id is None:
+        raise HTTPException(status_code=400, detail="include_subsidiaries needs an organization_id")
+    organization_filter = (
+        {"organization_subtree_of": organization_id} if include_subsidiaries else {"organization_id": organization_id}
+    )
+    return await emission_ranking_service.get_top_emitters_async(
+        db,
+        dimension,
+        limit,
+        unit,
+        normalize,
+        cumulative_share,
+        start=start,
+        end=end,
+        **organization_filter
+    )
+
+@router.post("/rollups/reconcile", response_model=Dict[str, int])
+async def reconcile_emission_rollups(organization_id: Optional[str] = None, db: Session = Depends(get_report_db)):
+    """
+    Recompute the monthly emission rollups from the statements and repair any drift.
+    """
+    return await heavy_bulkhead.run(
+        emission_rollup_service.reconcile_emission_rollups, db, organization_id=organization_id
+    )
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
+from app.db.routing import get_async_read_db
 from app.models.environmental_product_declaration import EnvironmentalProductDeclaration, EnvironmentalProductDeclarationCreate
+from app.models.bulk import BulkUpsertResult
 from app.services import environmental_product_declaration_service
+from app.services.pagination import set_next_cursor
+from app.services.upsert import UPSERT_MAX_ROWS
 
 router = APIRouter(
     prefix="/api/environmental-product-declarations",
@@ -13,18 +18,28 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[EnvironmentalProductDeclaration])
-async def get_environmental_product_declarations(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_environmental_product_declarations(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Retrieve a list of environmental product declarations.
+
+    Pass the X-Next-Cursor header of a response as `cursor` to fetch the next page.
     """
-    return environmental_product_declaration_service.get_environmental_product_declarations(db, skip=skip, limit=limit)
+    environmental_product_declarations = await environmental_product_declaration_service.get_environmental_product_declarations_async(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, environmental_product_declarations, "environmental_product_declaration_pk", limit)
+    return environmental_product_declarations
 
 @router.get("/{environmental_product_declaration_pk}", response_model=EnvironmentalProductDeclaration)
-async def get_environmental_product_declaration(environmental_product_declaration_pk: str, db: Session = Depends(get_db)):
+async def get_environmental_product_declaration(environmental_product_declaration_pk: str, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific environmental product declaration by its primary key.
     """
-    db_epd = environmental_product_declaration_service.get_environmental_product_declaration(
+    db_epd = await environmental_product_declaration_service.get_environmental_product_declaration_async(
         db, environmental_product_declaration_pk=environmental_product_declaration_pk
     )
     if db_epd is None:
@@ -32,8 +47,21 @@ async def get_environmental_product_declaration(environmental_product_declaratio
     return db_epd
 
 @router.post("/", response_model=EnvironmentalProductDeclaration)
-async def create_environmental_product_declaration(epd: EnvironmentalProductDeclarationCreate, db: Session = Depends(get_db)):
+async def create_environmental_product_declaration(epd: EnvironmentalProductDeclarationCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new environmental product declaration.
     """
-    return environmental_product_declaration_service.create_environmental_product_declaration(db, epd=epd)
+    return await environmental_product_declaration_service.create_environmental_product_declaration_async(db, epd=epd)
+
+@router.put("/batch", response_model=BulkUpsertResult)
+def upsert_environmental_product_declarations(rows: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db)):
+    """
+    Create or update many environmental product declarations in one request.
+
+    Each row has the same fields as for create. Existing records are updated
+    only where a value differs, so re-sending a batch is safe. The response
+    counts inserted, updated and unchanged rows and lists rejected rows.
+    """
+    if len(rows) > UPSERT_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {UPSERT_MAX_ROWS} rows per request")
+    return environmental_product_declaration_service.upsert_environmental_product_declarations(db, rows)
@@ -1,18 +1,17 @@
-import pandas as pd
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Callable, Dict, List, Tuple
 
-from app.db.database import get_db
-from app.models.organization import Organization
-from app.models.facility import Facility
-from app.models.emission_report import EmissionReport
-from app.models.emission_statement import EmissionStatement
-from app.models.csrd_report import CSRDReport
-from app.services.organization_service import OrganizationService
-from app.services.facility_service import FacilityService
-from app.services.emission_report_service import EmissionReportService
-from app.services.csrd_report_service import CSRDReportService
+from app.db import database
+from app.db.csrd_models import CSRDReport as DBCSRDReport
+from app.db.models import EmissionReport as DBEmissionReport, Facility as DBFacility, Organization as DBOrganization
+from app.db.routing import get_report_read_db, report_read_session_factory
+from app.models.export_job import ExcelExport, ExportJob, ExportJobStatus
+from app.services.bulkhead import heavy_bulkhead
+from app.services.excel_writer import EXCEL_EXPORT_CHUNK_ROWS, EXCEL_MEDIA_TYPE, ExcelSheet, SheetSource, excel_response, fetch_sheets, write_sheets, write_workbook
+from app.services.export_jobs import ExportJobEntry, export_jobs
 
 router = APIRouter(
     prefix="/api/excel",
@@ -20,372 +19,195 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+def _reporting_period(start, end) -> str:
+    return f"{start:%Y-%m-%d} - {end:%Y-%m-%d}"
+
+# Column header and value of each sheet, read from the selected row
+ORGANIZATION_COLUMNS = [
+    ("ID", lambda org: org.organization_pk),
+    ("Name", lambda org: org.name),
+    ("Description", lambda org: org.description),
+    ("Parent Organization", lambda org: org.parent_organization_id),
+    ("Created At", lambda org: org.created_at),
+    ("Updated At", lambda org: org.updated_at),
+]
+
+FACILITY_COLUMNS = [
+    ("ID", lambda facility: facility.facility_pk),
+    ("Name", lambda facility: facility.name),
+    ("Description", lambda facility: facility.description),
+    ("Address", lambda facility: facility.address),
+    ("City", lambda facility: facility.city),
+    ("Country", lambda facility: facility.country),
+    ("Latitude", lambda facility: facility.latitude),
+    ("Longitude", lambda facility: facility.longitude),
+    ("Created At", lambda facility: facility.created_at),
+    ("Updated At", lambda facility: facility.updated_at),
+]
+
+# Emission reports have no title of their own; the report type stands in for it
+EMISSION_REPORT_COLUMNS = [
+    ("ID", lambda report: report.emission_report_pk),
+    ("Title", lambda report: report.report_type),
+    ("Description", lambda report: report.description),
+    ("Reporting Period", lambda report: _reporting_period(report.report_period_start, report.report_period_end)),
+    ("Status", lambda report: report.status),
+    ("Organization ID", lambda report: report.organization_id),
+    ("Created At", lambda report: report.created_at),
+    ("Updated At", lambda report: report.updated_at),
+]
+
+CSRD_REPORT_COLUMNS = [
+    ("ID", lambda report: report.csrd_report_pk),
+    ("Title", lambda report: report.title),
+    ("Description", lambda report: report.description),
+    ("Reporting Period", lambda report: _reporting_period(report.reporting_period_start, report.reporting_period_end)),
+    ("Status", lambda report: report.status),
+    ("Organization ID", lambda report: report.organization_id),
+    ("ESRS Compliance", lambda report: report.esrs_compliance),
+    ("Materiality Assessment", lambda report: report.materiality_assessment),
+    ("Sustainability Targets", lambda report: report.sustainability_targets),
+    ("Created At", lambda report: report.created_at),
+    ("Updated At", lambda report: report.updated_at),
+]
+
+def _select_rows(entity, key: str, *names: str) -> Callable[[Session], object]:
+    """
+    Query for just the exported columns of a whole table, as plain rows ordered by primary key.
+
+    Rows carry the column names as attributes, so the sheet's getters read
+    them like the entities, without loading entities into the session. The
+    rows are streamed from a server-side cursor EXCEL_EXPORT_CHUNK_ROWS at a
+    time, so an export of any size holds only a few chunks in memory.
+    """
+    statement = (
+        select(*(getattr(entity, name) for name in names))
+        .order_by(getattr(entity, key))
+        .execution_options(stream_results=True, yield_per=EXCEL_EXPORT_CHUNK_ROWS)
+    )
+    return lambda db: db.execute(statement)
+
+ORGANIZATIONS_SHEET = SheetSource('Organizations', ORGANIZATION_COLUMNS, _select_rows(
+    DBOrganization, 'organization_pk',
+    'organization_pk', 'name', 'description', 'parent_organization_id', 'created_at', 'updated_at'
+))
+FACILITIES_SHEET = SheetSource('Facilities', FACILITY_COLUMNS, _select_rows(
+    DBFacility, 'facility_pk',
+    'facility_pk', 'name', 'description', 'address', 'city', 'country', 'latitude', 'longitude', 'created_at', 'updated_at'
+))
+EMISSION_REPORTS_SHEET = SheetSource('Emission Reports', EMISSION_REPORT_COLUMNS, _select_rows(
+    DBEmissionReport, 'emission_report_pk',
+    'emission_report_pk', 'report_type', 'description', 'report_period_start', 'report_period_end',
+    'status', 'organization_id', 'created_at', 'updated_at'
+))
+CSRD_REPORTS_SHEET = SheetSource('CSRD Reports', CSRD_REPORT_COLUMNS, _select_rows(
+    DBCSRDReport, 'csrd_report_pk',
+    'csrd_report_pk', 'title', 'description', 'reporting_period_start', 'reporting_period_end', 'status',
+    'organization_id', 'esrs_compliance', 'materiality_assessment', 'sustainability_targets', 'created_at', 'updated_at'
+))
+
+# File name and sheets of each export
+EXPORTS: Dict[ExcelExport, Tuple[str, List[SheetSource]]] = {
+    ExcelExport.ORGANIZATIONS: ("organizations.xlsx", [ORGANIZATIONS_SHEET]),
+    ExcelExport.FACILITIES: ("facilities.xlsx", [FACILITIES_SHEET]),
+    ExcelExport.EMISSION_REPORTS: ("emission_reports.xlsx", [EMISSION_REPORTS_SHEET]),
+    ExcelExport.CSRD_REPORTS: ("csrd_reports.xlsx", [CSRD_REPORTS_SHEET]),
+    ExcelExport.COMPREHENSIVE_REPORT: (
+        "openfootprint_comprehensive_report.xlsx",
+        [ORGANIZATIONS_SHEET, FACILITIES_SHEET, EMISSION_REPORTS_SHEET, CSRD_REPORTS_SHEET]
+    ),
+}
+
+# The workbooks are written into a per-request buffer by the heavy bulkhead
+# and streamed from there, so concurrent downloads never share a file
+
 @router.get("/organizations")
-def export_organizations_excel(
-    db: Session = Depends(get_db),
-    organization_service: OrganizationService = Depends()
-):
+async def export_organizations_excel(db: Session = Depends(get_report_read_db)):
     """Export organizations data as Excel spreadsheet"""
-    organizations = organization_service.get_organizations(db)
-    
-    # Convert to DataFrame
-    data = []
-    for org in organizations:
-        data.append({
-            "ID": org.organization_pk,
-            "Name": org.name,
-            "Description": org.description,
-            "Parent Organization": org.parent_organization_id,
-            "Created At": org.created_at,
-            "Updated At": org.updated_at
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Create Excel file in memory
-    output = pd.ExcelWriter('organizations.xlsx', engine='xlsxwriter')
-    df.to_excel(output, sheet_name='Organizations', index=False)
-    
-    # Configure the sheet
-    workbook = output.book
-    worksheet = output.sheets['Organizations']
-    
-    # Add formatting
-    header_format = workbook.add_format({
-        'bold': True,
-        'text_wrap': True,
-        'valign': 'top',
-        'fg_color': '#D7E4BC',
-        'border': 1
-    })
-    
-    # Write the column headers with the defined format
-    for col_num, value in enumerate(df.columns.values):
-        worksheet.write(0, col_num, value, header_format)
-        worksheet.set_column(col_num, col_num, 20)
-    
-    # Close the Pandas Excel writer and output the Excel file
-    output.close()
-    
-    # Return the Excel file as a downloadable attachment
-    with open('organizations.xlsx', 'rb') as f:
-        excel_data = f.read()
-    
-    return Response(
-        content=excel_data,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=organizations.xlsx"}
-    )
+    return await heavy_bulkhead.run(_export_excel, db, ExcelExport.ORGANIZATIONS)
 
 @router.get("/facilities")
-def export_facilities_excel(
-    db: Session = Depends(get_db),
-    facility_service: FacilityService = Depends()
-):
+async def export_facilities_excel(db: Session = Depends(get_report_read_db)):
     """Export facilities data as Excel spreadsheet"""
-    facilities = facility_service.get_facilities(db)
-    
-    # Convert to DataFrame
-    data = []
-    for facility in facilities:
-        data.append({
-            "ID": facility.facility_pk,
-            "Name": facility.name,
-            "Description": facility.description,
-            "Address": facility.address,
-            "City": facility.city,
-            "Country": facility.country,
-            "Latitude": facility.latitude,
-            "Longitude": facility.longitude,
-            "Created At": facility.created_at,
-            "Updated At": facility.updated_at
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Create Excel file in memory
-    output = pd.ExcelWriter('facilities.xlsx', engine='xlsxwriter')
-    df.to_excel(output, sheet_name='Facilities', index=False)
-    
-    # Configure the sheet
-    workbook = output.book
-    worksheet = output.sheets['Facilities']
-    
-    # Add formatting
-    header_format = workbook.add_format({
-        'bold': True,
-        'text_wrap': True,
-        'valign': 'top',
-        'fg_color': '#D7E4BC',
-        'border': 1
-    })
-    
-    # Write the column headers with the defined format
-    for col_num, value in enumerate(df.columns.values):
-        worksheet.write(0, col_num, value, header_format)
-        worksheet.set_column(col_num, col_num, 20)
-    
-    # Close the Pandas Excel writer and output the Excel file
-    output.close()
-    
-    # Return the Excel file as a downloadable attachment
-    with open('facilities.xlsx', 'rb') as f:
-        excel_data = f.read()
-    
-    return Response(
-        content=excel_data,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=facilities.xlsx"}
-    )
+    return await heavy_bulkhead.run(_export_excel, db, ExcelExport.FACILITIES)
 
 @router.get("/emission-reports")
-def export_emission_reports_excel(
-    db: Session = Depends(get_db),
-    emission_report_service: EmissionReportService = Depends()
-):
+async def export_emission_reports_excel(db: Session = Depends(get_report_read_db)):
     """Export emission reports data as Excel spreadsheet"""
-    reports = emission_report_service.get_emission_reports(db)
-    
-    # Convert to DataFrame
-    data = []
-    for report in reports:
-        data.append({
-            "ID": report.emission_report_pk,
-            "Title": report.title,
-            "Description": report.description,
-            "Reporting Period": report.reporting_period,
-            "Status": report.status,
-            "Organization ID": report.organization_id,
-            "Created At": report.created_at,
-            "Updated At": report.updated_at
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Create Excel file in memory
-    output = pd.ExcelWriter('emission_reports.xlsx', engine='xlsxwriter')
-    df.to_excel(output, sheet_name='Emission Reports', index=False)
-    
-    # Configure the sheet
-    workbook = output.book
-    worksheet = output.sheets['Emission Reports']
-    
-    # Add formatting
-    header_format = workbook.add_format({
-        'bold': True,
-        'text_wrap': True,
-        'valign': 'top',
-        'fg_color': '#D7E4BC',
-        'border': 1
-    })
-    
-    # Write the column headers with the defined format
-    for col_num, value in enumerate(df.columns.values):
-        worksheet.write(0, col_num, value, header_format)
-        worksheet.set_column(col_num, col_num, 20)
-    
-    # Close the Pandas Excel writer and output the Excel file
-    output.close()
-    
-    # Return the Excel file as a downloadable attachment
-    with open('emission_reports.xlsx', 'rb') as f:
-        excel_data = f.read()
-    
-    return Response(
-        content=excel_data,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=emission_reports.xlsx"}
-    )
+    return await heavy_bulkhead.run(_export_excel, db, ExcelExport.EMISSION_REPORTS)
 
 @router.get("/csrd-reports")
-def export_csrd_reports_excel(
-    db: Session = Depends(get_db),
-    csrd_report_service: CSRDReportService = Depends()
-):
+async def export_csrd_reports_excel(db: Session = Depends(get_report_read_db)):
     """Export CSRD reports data as Excel spreadsheet"""
-    reports = csrd_report_service.get_csrd_reports(db)
-    
-    # Convert to DataFrame
-    data = []
-    for report in reports:
-        data.append({
-            "ID": report.csrd_report_pk,
-            "Title": report.title,
-            "Description": report.description,
-            "Reporting Period": report.reporting_period,
-            "Status": report.status,
-            "Organization ID": report.organization_id,
-            "ESRS Compliance": report.esrs_compliance,
-            "Materiality Assessment": report.materiality_assessment,
-            "Sustainability Targets": report.sustainability_targets,
-            "Created At": report.created_at,
-            "Updated At": report.updated_at
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Create Excel file in memory
-    output = pd.ExcelWriter('csrd_reports.xlsx', engine='xlsxwriter')
-    df.to_excel(output, sheet_name='CSRD Reports', index=False)
-    
-    # Configure the sheet
-    workbook = output.book
-    worksheet = output.sheets['CSRD Reports']
-    
-    # Add formatting
-    header_format = workbook.add_format({
-        'bold': True,
-        'text_wrap': True,
-        'valign': 'top',
-        'fg_color': '#D7E4BC',
-        'border': 1
-    })
-    
-    # Write the column headers with the defined format
-    for col_num, value in enumerate(df.columns.values):
-        worksheet.write(0, col_num, value, header_format)
-        worksheet.set_column(col_num, col_num, 20)
-    
-    # Close the Pandas Excel writer and output the Excel file
-    output.close()
-    
-    # Return the Excel file as a downloadable attachment
-    with open('csrd_reports.xlsx', 'rb') as f:
-        excel_data = f.read()
-    
-    return Response(
-        content=excel_data,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=csrd_reports.xlsx"}
-    )
+    return await heavy_bulkhead.run(_export_excel, db, ExcelExport.CSRD_REPORTS)
+
+def _export_excel(db: Session, export: ExcelExport) -> StreamingResponse:
+    # Single-sheet exports write the rows straight from the result
+    filename, sources = EXPORTS[export]
+    sheets = [ExcelSheet(source.name, source.columns, source.fetch(db)) for source in sources]
+    return excel_response(write_workbook(sheets), filename)
 
 @router.get("/comprehensive-report")
-def export_comprehensive_excel(
-    db: Session = Depends(get_db),
-    organization_service: OrganizationService = Depends(),
-    facility_service: FacilityService = Depends(),
-    emission_report_service: EmissionReportService = Depends(),
-    csrd_report_service: CSRDReportService = Depends()
-):
+async def export_comprehensive_excel(session_factory: Callable[[], Session] = Depends(report_read_session_factory)):
     """Export comprehensive data as multi-sheet Excel spreadsheet"""
-    # Get all data
-    organizations = organization_service.get_organizations(db)
-    facilities = facility_service.get_facilities(db)
-    emission_reports = emission_report_service.get_emission_reports(db)
-    csrd_reports = csrd_report_service.get_csrd_reports(db)
-    
-    # Create Excel file with multiple sheets
-    output = pd.ExcelWriter('openfootprint_comprehensive_report.xlsx', engine='xlsxwriter')
-    
-    # Organizations sheet
-    org_data = []
-    for org in organizations:
-        org_data.append({
-            "ID": org.organization_pk,
-            "Name": org.name,
-            "Description": org.description,
-            "Parent Organization": org.parent_organization_id,
-            "Created At": org.created_at,
-            "Updated At": org.updated_at
-        })
-    
-    org_df = pd.DataFrame(org_data)
-    org_df.to_excel(output, sheet_name='Organizations', index=False)
-    
-    # Facilities sheet
-    facility_data = []
-    for facility in facilities:
-        facility_data.append({
-            "ID": facility.facility_pk,
-            "Name": facility.name,
-            "Description": facility.description,
-            "Address": facility.address,
-            "City": facility.city,
-            "Country": facility.country,
-            "Latitude": facility.latitude,
-            "Longitude": facility.longitude,
-            "Created At": facility.created_at,
-            "Updated At": facility.updated_at
-        })
-    
-    facility_df = pd.DataFrame(facility_data)
-    facility_df.to_excel(output, sheet_name='Facilities', index=False)
-    
-    # Emission Reports sheet
-    emission_data = []
-    for report in emission_reports:
-        emission_data.append({
-            "ID": report.emission_report_pk,
-            "Title": report.title,
-            "Description": report.description,
-            "Reporting Period": report.reporting_period,
-            "Status": report.status,
-            "Organization ID": report.organization_id,
-            "Created At": report.created_at,
-            "Updated At": report.updated_at
-        })
-    
-    emission_df = pd.DataFrame(emission_data)
-    emission_df.to_excel(output, sheet_name='Emission Reports', index=False)
-    
-    # CSRD Reports sheet
-    csrd_data = []
-    for report in csrd_reports:
-        csrd_data.append({
-            "ID": report.csrd_report_pk,
-            "Title": report.title,
-            "Description": report.description,
-            "Reporting Period": report.reporting_period,
-            "Status": report.status,
-            "Organization ID": report.organization_id,
-            "ESRS Compliance": report.esrs_compliance,
-            "Materiality Assessment": report.materiality_assessment,
-            "Sustainability Targets": report.sustainability_targets,
-            "Created At": report.created_at,
-            "Updated At": report.updated_at
-        })
-    
-    csrd_df = pd.DataFrame(csrd_data)
-    csrd_df.to_excel(output, sheet_name='CSRD Reports', index=False)
-    
-    # Format all sheets
-    workbook = output.book
-    header_format = workbook.add_format({
-        'bold': True,
-        'text_wrap': True,
-        'valign': 'top',
-        'fg_color': '#D7E4BC',
-        'border': 1
-    })
-    
-    # Apply formatting to each sheet
-    for sheet_name in ['Organizations', 'Facilities', 'Emission Reports', 'CSRD Reports']:
-        worksheet = output.sheets[sheet_name]
-        df = None
-        
-        if sheet_name == 'Organizations':
-            df = org_df
-        elif sheet_name == 'Facilities':
-            df = facility_df
-        elif sheet_name == 'Emission Reports':
-            df = emission_df
-        elif sheet_name == 'CSRD Reports':
-            df = csrd_df
-            
-        # Write headers with formatting
-        for col_num, value in enumerate(df.columns.values):
-            worksheet.write(0, col_num, value, header_format)
-            worksheet.set_column(col_num, col_num, 20)
-    
-    # Close the Pandas Excel writer and output the Excel file
-    output.close()
-    
-    # Return the Excel file as a downloadable attachment
-    with open('openfootprint_comprehensive_report.xlsx', 'rb') as f:
-        excel_data = f.read()
-    
-    return Response(
-        content=excel_data,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=openfootprint_comprehensive_report.xlsx"}
+    return await heavy_bulkhead.run(_export_comprehensive_excel, session_factory)
+
+def _export_comprehensive_excel(session_factory: Callable[[], Session]) -> StreamingResponse:
+    # The four sheets are fetched concurrently while the workbook is written
+    filename, sources = EXPORTS[ExcelExport.COMPREHENSIVE_REPORT]
+    return excel_response(write_workbook(fetch_sheets(session_factory, sources)), filename)
+
+# Export jobs: the same exports in the background, for downloads that take
+# longer than clients or proxies wait for a response
+
+def build_export(session_factory, export: ExcelExport, path: str, report_progress: Callable[[float], None]) -> None:
+    """
+    Write an export to ``path`` with sessions of its own, reporting progress per sheet.
+    """
+    _, sources = EXPORTS[export]
+    report_progress(0.0)
+    write_sheets(path, fetch_sheets(session_factory, sources), on_sheet=lambda done: report_progress(done / len(sources)))
+
+def _get_job(job_id: str) -> ExportJobEntry:
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found or expired")
+    return job
+
+@router.post("/jobs", response_model=ExportJob, status_code=202)
+async def create_export_job(export: ExcelExport, request: Request):
+    """
+    Start an export in the background and return the job to poll.
+
+    If the same export is already queued or running, its job is returned
+    instead of starting another.
+    """
+    # Clients that must see their own recent writes do not share a job reading the replica
+    session_factory = report_read_session_factory(request)
+    source = "primary" if session_factory is database.ReportSessionLocal else "replica"
+    filename, _ = EXPORTS[export]
+    job = export_jobs.submit(
+        f"{export.value}:{source}",
+        export.value,
+        filename,
+        lambda path, report_progress: build_export(session_factory, export, path, report_progress)
     )
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}", response_model=ExportJob)
+async def get_export_job(job_id: str):
+    """
+    Status and progress of an export job.
+    """
+    return _get_job(job_id).to_dict()
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(job_id: str):
+    """
+    Download the file of a finished export job; 409 while it is still running or if it failed.
+    """
+    job = _get_job(job_id)
+    if job.status != ExportJobStatus.SUCCEEDED:
+        detail = f"Export job failed: {job.error}" if job.status == ExportJobStatus.FAILED else f"Export job is {job.status.value}"
+        raise HTTPException(status_code=409, detail=detail)
+    return FileResponse(job.path, media_type=EXCEL_MEDIA_TYPE, filename=job.filename)
@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
+from app.db.routing import get_async_read_db
 from app.models.facility import Facility, FacilityCreate
+from app.models.bulk import BulkUpsertResult
 from app.services import facility_service
+from app.services.pagination import set_next_cursor
+from app.services.upsert import UPSERT_MAX_ROWS
 
 router = APIRouter(
     prefix="/api/facilities",
@@ -13,25 +18,48 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[Facility])
-async def get_facilities(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_facilities(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Retrieve a list of facilities.
+
+    Pass the X-Next-Cursor header of a response as `cursor` to fetch the next page.
     """
-    return facility_service.get_facilities(db, skip=skip, limit=limit)
+    facilities = await facility_service.get_facilities_async(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, facilities, "facility_pk", limit)
+    return facilities
 
 @router.get("/{facility_pk}", response_model=Facility)
-async def get_facility(facility_pk: str, db: Session = Depends(get_db)):
+async def get_facility(facility_pk: str, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific facility by its primary key.
     """
-    db_facility = facility_service.get_facility(db, facility_pk=facility_pk)
+    db_facility = await facility_service.get_facility_async(db, facility_pk=facility_pk)
     if db_facility is None:
         raise HTTPException(status_code=404, detail="Facility not found")
     return db_facility
 
 @router.post("/", response_model=Facility)
-async def create_facility(facility: FacilityCreate, db: Session = Depends(get_db)):
+async def create_facility(facility: FacilityCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new facility.
     """
-    return facility_service.create_facility(db, facility=facility)
+    return await facility_service.create_facility_async(db, facility=facility)
+
+@router.put("/batch", response_model=BulkUpsertResult)
+def upsert_facilities(rows: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db)):
+    """
+    Create or update many facilities in one request.
+
+    Each row has the same fields as for create. Existing records are updated
+    only where a value differs, so re-sending a batch is safe. The response
+    counts inserted, updated and unchanged rows and lists rejected rows.
+    """
+    if len(rows) > UPSERT_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {UPSERT_MAX_ROWS} rows per request")
+    return facility_service.upsert_facilities(db, rows)
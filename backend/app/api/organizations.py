@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
+from app.db.routing import get_async_read_db
 from app.models.organization import Organization, OrganizationCreate
+from app.models.bulk import BulkUpsertResult
 from app.services import organization_service
+from app.services.pagination import set_next_cursor
+from app.services.upsert import UPSERT_MAX_ROWS
 
 router = APIRouter(
     prefix="/api/organizations",
@@ -13,25 +18,68 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[Organization])
-async def get_organizations(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_organizations(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Retrieve a list of organizations.
+
+    Pass the X-Next-Cursor header of a response as `cursor` to fetch the next page.
     """
-    return organization_service.get_organizations(db, skip=skip, limit=limit)
+    organizations = await organization_service.get_organizations_async(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, organizations, "organization_pk", limit)
+    return organizations
 
 @router.get("/{organization_pk}", response_model=Organization)
-async def get_organization(organization_pk: str, db: Session = Depends(get_db)):
+async def get_organization(organization_pk: str, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific organization by its primary key.
     """
-    db_organization = organization_service.get_organization(db, organization_pk=organization_pk)
+    db_organization = await organization_service.get_organization_async(db, organization_pk=organization_pk)
     if db_organization is None:
         raise HTTPException(status_code=404, detail="Organization not found")
     return db_organization
 
+@router.get("/{organization_pk}/descendants", response_model=List[Organization])
+async def get_organization_descendants(
+    organization_pk: str,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Retrieve all direct and indirect subsidiaries of an organization.
+
+    Pass the X-Next-Cursor header of a response as `cursor` to fetch the next page.
+    """
+    if await organization_service.get_organization_async(db, organization_pk=organization_pk) is None:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    descendants = await organization_service.get_organization_descendants_async(db, organization_pk, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, descendants, "organization_pk", limit)
+    return descendants
+
 @router.post("/", response_model=Organization)
-async def create_organization(organization: OrganizationCreate, db: Session = Depends(get_db)):
+async def create_organization(organization: OrganizationCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new organization.
     """
-    return organization_service.create_organization(db, organization=organization)
+    return await organization_service.create_organization_async(db, organization=organization)
+
+@router.put("/batch", response_model=BulkUpsertResult)
+def upsert_organizations(rows: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db)):
+    """
+    Create or update many organizations in one request.
+
+    Each row has the same fields as for create. Existing records are updated
+    only where a value differs, so re-sending a batch is safe. The response
+    counts inserted, updated and unchanged rows and lists rejected rows.
+    """
+    if len(rows) > UPSERT_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {UPSERT_MAX_ROWS} rows per request")
+    return organization_service.upsert_organizations(db, rows)
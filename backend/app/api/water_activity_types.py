@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from app.db.database import get_db
+from app.db.database import get_async_db, get_db
+from app.db.routing import get_async_read_db
 from app.models.water_activity_type import WaterActivityType, WaterActivityTypeCreate
+from app.models.bulk import BulkUpsertResult
 from app.services import water_activity_type_service
+from app.services.pagination import set_next_cursor
+from app.services.upsert import UPSERT_MAX_ROWS
 
 router = APIRouter(
     prefix="/api/water-activity-types",
@@ -13,25 +18,48 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[WaterActivityType])
-async def get_water_activity_types(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def get_water_activity_types(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Retrieve a list of water activity types.
+
+    Pass the X-Next-Cursor header of a response as `cursor` to fetch the next page.
     """
-    return water_activity_type_service.get_water_activity_types(db, skip=skip, limit=limit)
+    water_activity_types = await water_activity_type_service.get_water_activity_types_async(db, skip=skip, limit=limit, cursor=cursor)
+    set_next_cursor(response, water_activity_types, "water_activity_type_id", limit)
+    return water_activity_types
 
 @router.get("/{water_activity_type_id}", response_model=WaterActivityType)
-async def get_water_activity_type(water_activity_type_id: str, db: Session = Depends(get_db)):
+async def get_water_activity_type(water_activity_type_id: str, db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve a specific water activity type by its ID.
     """
-    db_water_activity_type = water_activity_type_service.get_water_activity_type(db, water_activity_type_id=water_activity_type_id)
+    db_water_activity_type = await water_activity_type_service.get_water_activity_type_async(db, water_activity_type_id=water_activity_type_id)
     if db_water_activity_type is None:
         raise HTTPException(status_code=404, detail="Water activity type not found")
     return db_water_activity_type
 
 @router.post("/", response_model=WaterActivityType)
-async def create_water_activity_type(water_activity_type: WaterActivityTypeCreate, db: Session = Depends(get_db)):
+async def create_water_activity_type(water_activity_type: WaterActivityTypeCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new water activity type.
     """
-    return water_activity_type_service.create_water_activity_type(db, water_activity_type=water_activity_type)
+    return await water_activity_type_service.create_water_activity_type_async(db, water_activity_type=water_activity_type)
+
+@router.put("/batch", response_model=BulkUpsertResult)
+def upsert_water_activity_types(rows: List[Dict[str, Any]] = Body(...), db: Session = Depends(get_db)):
+    """
+    Create or update many water activity types in one request.
+
+    Each row has the same fields as for create. Existing records are updated
+    only where a value differs, so re-sending a batch is safe. The response
+    counts inserted, updated and unchanged rows and lists rejected rows.
+    """
+    if len(rows) > UPSERT_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {UPSERT_MAX_ROWS} rows per request")
+    return water_activity_type_service.upsert_water_activity_types(db, rows)
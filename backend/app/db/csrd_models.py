@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Table, Integer, Enum, JSON
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Table, Integer, Enum, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
@@ -21,8 +21,9 @@ class CSRDReportStatus(str, PyEnum):
 csrd_emission_reports = Table(
     'csrd_emission_reports',
     Base.metadata,
-    Column('csrd_report_pk', String, ForeignKey('csrd_reports.csrd_report_pk')),
-    Column('emission_report_pk', String, ForeignKey('emission_reports.emission_report_pk'))
+    Column('csrd_report_pk', String, ForeignKey('csrd_reports.csrd_report_pk'), primary_key=True),
+    Column('emission_report_pk', String, ForeignKey('emission_reports.emission_report_pk'), primary_key=True),
+    Index('ix_csrd_emission_reports_emission_report_pk', 'emission_report_pk')
 )
 
 class CSRDReport(Base):
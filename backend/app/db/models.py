@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, Float, Boolean, Table
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, Float, Boolean, Table, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -9,13 +9,30 @@ Base = declarative_base()
 organization_facility = Table(
     'organization_facility',
     Base.metadata,
-    Column('organization_id', String, ForeignKey('organizations.organization_pk')),
-    Column('facility_id', String, ForeignKey('facilities.facility_pk'))
+    Column('organization_id', String, ForeignKey('organizations.organization_pk'), primary_key=True),
+    Column('facility_id', String, ForeignKey('facilities.facility_pk'), primary_key=True),
+    Index('ix_organization_facility_facility_id', 'facility_id')
 )
 
 # Core data models based on the JSON files
 class EmissionStatement(Base):
     __tablename__ = "emission_statements"
+    # On PostgreSQL the table is range-partitioned by reporting_period_start
+    # (migration 0006, app/db/partitioning.py) and its primary key in the
+    # database is (emission_statement_pk, reporting_period_start); the key
+    # stays unique on its own through emission_statement_keys, so the mapping
+    # here keeps emission_statement_pk as the identity
+    # Access paths: by organization, facility or activity within a period, or by period alone.
+    # On PostgreSQL the organization index also carries the columns that rankings read (migration 0008)
+    __table_args__ = (
+        Index(
+            'ix_emission_statements_org_period', 'organization_id', 'reporting_period_start',
+            postgresql_include=['facility_id', 'emission_activity_id', 'value', 'unit', 'normalized_value', 'normalized_unit']
+        ),
+        Index('ix_emission_statements_facility_period', 'facility_id', 'reporting_period_start'),
+        Index('ix_emission_statements_activity_period', 'emission_activity_id', 'reporting_period_start'),
+        Index('ix_emission_statements_period', 'reporting_period_start', 'reporting_period_end'),
+    )
     
     emission_statement_pk = Column(String, primary_key=True)
     emission_activity_id = Column(String, nullable=False)
@@ -26,6 +43,9 @@ class EmissionStatement(Base):
     reporting_period_end = Column(DateTime, nullable=False)
     facility_id = Column(String, ForeignKey('facilities.facility_pk'), nullable=True)
     organization_id = Column(String, ForeignKey('organizations.organization_pk'), nullable=False)
+    # value converted to the canonical unit at ingest; NULL when the unit is not in the registry
+    normalized_value = Column(Float, nullable=True)
+    normalized_unit = Column(String, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
     
@@ -37,6 +57,29 @@ class EmissionStatement(Base):
     def __repr__(self):
         return f"<EmissionStatement(pk={self.emission_statement_pk})>"
 
+class EmissionRollup(Base):
+    """
+    Emission totals per organization, facility, month and unit, kept up to
+    date by the service layer as statements are written.
+    """
+    __tablename__ = "emission_rollups"
+    # The primary key serves per-organization queries; this one period ranges across organizations
+    __table_args__ = (
+        Index('ix_emission_rollups_month', 'month', 'organization_id'),
+    )
+
+    organization_id = Column(String, primary_key=True)
+    # '' for statements without a facility, so the key has no NULLs
+    facility_key = Column(String, primary_key=True, default='')
+    month = Column(DateTime, primary_key=True)
+    unit = Column(String, primary_key=True)
+    total = Column(Float, nullable=False, default=0.0)
+    statement_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<EmissionRollup(org={self.organization_id}, facility={self.facility_key}, month={self.month}, unit={self.unit})>"
+
 class EmissionReport(Base):
     __tablename__ = "emission_reports"
     
@@ -61,12 +104,17 @@ class EmissionReport(Base):
 emission_report_statements = Table(
     'emission_report_statements',
     Base.metadata,
-    Column('emission_report_id', String, ForeignKey('emission_reports.emission_report_pk')),
-    Column('emission_statement_id', String, ForeignKey('emission_statements.emission_statement_pk'))
+    Column('emission_report_id', String, ForeignKey('emission_reports.emission_report_pk'), primary_key=True),
+    Column('emission_statement_id', String, ForeignKey('emission_statements.emission_statement_pk'), primary_key=True),
+    Index('ix_emission_report_statements_emission_statement_id', 'emission_statement_id')
 )
 
 class Organization(Base):
     __tablename__ = "organizations"
+    # Children of a parent, used by the recursive subtree query
+    __table_args__ = (
+        Index('ix_organizations_parent_organization_id', 'parent_organization_id'),
+    )
     
     organization_pk = Column(String, primary_key=True)
     name = Column(String, nullable=False)
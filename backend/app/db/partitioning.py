@@ -0,0 +1,155 @@
+"""
+Maintenance of the range partitions of emission_statements on PostgreSQL.
+
+Migration 0006 partitions the table by reporting_period_start, yearly or
+monthly, with a default partition for periods that have no partition of their
+own. Partitions for coming periods are created ahead of time with
+``ensure_partitions`` (for example from a scheduled job), and old periods can
+be detached and archived with ``detach_partition``.
+
+Usage (from the backend directory):
+
+    python -m app.db.partitioning list
+    python -m app.db.partitioning ensure --ahead 2
+    python -m app.db.partitioning detach emission_statements_y2019
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import argparse
+import os
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+PARTITIONED_TABLE = "emission_statements"
+DEFAULT_PARTITION = "emission_statements_default"
+PARTITION_INTERVAL = os.getenv("EMISSION_STATEMENT_PARTITION_INTERVAL", "year")
+
+def partition_range(value: datetime, interval: str = PARTITION_INTERVAL) -> Tuple[datetime, datetime]:
+    """
+    Bounds ``[start, end)`` of the partition that holds ``value``.
+    """
+    if interval == "month":
+        start = datetime(value.year, value.month, 1)
+        return start, datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+    if interval == "year":
+        start = datetime(value.year, 1, 1)
+        return start, datetime(start.year + 1, 1, 1)
+    raise ValueError(f"Unsupported partition interval: {interval}")
+
+def partition_name(start: datetime, interval: str = PARTITION_INTERVAL) -> str:
+    if interval == "month":
+        return f"{PARTITIONED_TABLE}_m{start:%Y%m}"
+    return f"{PARTITIONED_TABLE}_y{start:%Y}"
+
+def is_partitioned(conn: Connection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"
+    ), {"table": PARTITIONED_TABLE}).scalar()
+
+def list_partitions(conn: Connection) -> List[Dict[str, str]]:
+    """
+    Attached partitions with their bounds, e.g. ``FOR VALUES FROM ('2024-01-01 00:00:00') TO (...)``.
+    """
+    rows = conn.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+    ), {"table": PARTITIONED_TABLE})
+    return [{"name": name, "bounds": bounds} for name, bounds in rows]
+
+def create_partition(conn: Connection, value: datetime, interval: str = PARTITION_INTERVAL) -> Optional[str]:
+    """
+    Create the partition holding ``value`` if it does not exist yet.
+
+    Rows for the new range that already landed in the default partition are
+    moved into it, in the caller's transaction: PostgreSQL refuses to add a
+    range the default partition has rows for, so the rows are copied into a
+    standalone table, deleted from the default partition and the table is
+    then attached. Returns the name of the new partition, or None if it
+    already existed.
+    """
+    start, end = partition_range(value, interval)
+    name = partition_name(start, interval)
+    if conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar():
+        return None
+
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    in_range = f"reporting_period_start >= '{start.isoformat()}' AND reporting_period_start < '{end.isoformat()}'"
+    stray = conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})")).scalar()
+    if not stray:
+        conn.execute(text(f"CREATE TABLE {name} PARTITION OF {PARTITIONED_TABLE} {bounds}"))
+        return name
+
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARTITIONED_TABLE} INCLUDING DEFAULTS)"))
+    conn.execute(text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"))
+    # The key trigger drops the keys of the deleted rows; they are put back
+    # after the attach, and the report link foreign key is only checked at commit
+    conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"))
+    conn.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} ATTACH PARTITION {name} {bounds}"))
+    conn.execute(text(
+        f"INSERT INTO emission_statement_keys SELECT emission_statement_pk, reporting_period_start FROM {name}"
+    ))
+    return name
+
+def ensure_partitions(conn: Connection, ahead: int = 1, interval: str = PARTITION_INTERVAL, now: Optional[datetime] = None) -> List[str]:
+    """
+    Make sure partitions exist from the current interval through ``ahead`` intervals after it.
+    """
+    start, _ = partition_range(now or datetime.utcnow(), interval)
+    created = []
+    for _ in range(ahead + 1):
+        name = create_partition(conn, start, interval)
+        if name is not None:
+            created.append(name)
+        _, start = partition_range(start, interval)
+    return created
+
+def detach_partition(conn: Connection, name: str, concurrently: bool = False) -> None:
+    """
+    Detach a partition so its rows leave emission_statements but stay in a standalone table.
+
+    The table can then be dumped and dropped, or attached again later. With
+    ``concurrently`` the detach does not block queries on emission_statements,
+    but must run outside a transaction block (autocommit). The rows' keys stay
+    in emission_statement_keys, so report links keep their targets and the
+    keys cannot be reused; the emission rollups keep the detached totals until
+    they are reconciled.
+    """
+    if name == DEFAULT_PARTITION or not name.startswith(f"{PARTITIONED_TABLE}_"):
+        raise ValueError(f"Not a period partition of {PARTITIONED_TABLE}: {name}")
+    conn.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {name}{' CONCURRENTLY' if concurrently else ''}"))
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from app.db.database import engine
+
+    parser = argparse.ArgumentParser(description="Manage the partitions of emission_statements")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List the attached partitions")
+    ensure = commands.add_parser("ensure", help="Create partitions for the current and coming periods")
+    ensure.add_argument("--ahead", type=int, default=1, help="Number of periods after the current one")
+    detach = commands.add_parser("detach", help="Detach a partition for archiving")
+    detach.add_argument("name")
+    detach.add_argument("--concurrently", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "detach" and args.concurrently:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            detach_partition(conn, args.name, concurrently=True)
+        return
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            parser.error(f"{PARTITIONED_TABLE} is not partitioned; run the alembic migrations on PostgreSQL first")
+        if args.command == "list":
+            for partition in list_partitions(conn):
+                print(f"{partition['name']}: {partition['bounds']}")
+        elif args.command == "ensure":
+            for name in ensure_partitions(conn, ahead=args.ahead):
+                print(f"created {name}")
+        else:
+            detach_partition(conn, args.name)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import Any, Dict
+import threading
+import time
+
+class PoolMetrics:
+    """
+    Thread-safe counters describing how connections are checked out of a pool.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._record_wait(wait_seconds)
+
+    def record_failure(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkout_failures += 1
+            self._record_wait(wait_seconds)
+
+    def _record_wait(self, wait_seconds: float) -> None:
+        self.total_wait_seconds += wait_seconds
+        if wait_seconds > self.max_wait_seconds:
+            self.max_wait_seconds = wait_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.checkout_failures
+            return {
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "total_wait_seconds": self.total_wait_seconds,
+                "avg_wait_seconds": self.total_wait_seconds / attempts if attempts else 0.0,
+                "max_wait_seconds": self.max_wait_seconds,
+            }
+
+class _InstrumentedPoolMixin:
+    """
+    Records how long callers wait for a connection and how often a checkout
+    fails: a pool timeout, or whatever the driver raises when a new
+    connection cannot be opened (at this level that is the raw DBAPI error,
+    not yet wrapped by SQLAlchemy).
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record_failure(time.perf_counter() - start)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # The engine recreates its pool after a disconnect; keep the counters
+        # so a failover does not wipe the numbers we are trying to observe.
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """
+    QueuePool with checkout metrics, used by the synchronous engines.
+    """
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool with checkout metrics, used by the asyncio engines.
+    """
+
+def get_pool_stats(engine) -> Dict[str, Any]:
+    """
+    Return current utilisation and checkout statistics for an engine's pool.
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
@@ -0,0 +1,62 @@
+from fastapi import Request
+import os
+import time
+
+from app.db import database
+
+# After a client writes, its reads go to the primary for this many seconds so
+# it sees its own changes even if the replica is lagging behind
+READ_YOUR_WRITES_WINDOW_SECONDS = int(os.getenv("READ_YOUR_WRITES_WINDOW_SECONDS", "10"))
+PRIMARY_STICKY_COOKIE = "of_primary_until"
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+def use_replica(request: Request) -> bool:
+    """
+    Decide whether a read-only request may be served from the read replica.
+    """
+    if not database.DATABASE_REPLICA_URL:
+        return False
+    sticky_until = request.cookies.get(PRIMARY_STICKY_COOKIE)
+    if sticky_until:
+        try:
+            if float(sticky_until) > time.time():
+                return False
+        except ValueError:
+            pass
+    return True
+
+async def primary_stickiness_middleware(request: Request, call_next):
+    """
+    Mark clients that just wrote so their next reads stick to the primary.
+    """
+    response = await call_next(request)
+    if request.method in WRITE_METHODS and response.status_code < 400 and READ_YOUR_WRITES_WINDOW_SECONDS > 0:
+        response.set_cookie(
+            PRIMARY_STICKY_COOKIE,
+            str(time.time() + READ_YOUR_WRITES_WINDOW_SECONDS),
+            max_age=READ_YOUR_WRITES_WINDOW_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+# Dependency to get an async DB session for read-only routes
+async def get_async_read_db(request: Request):
+    session_factory = database.AsyncReplicaSessionLocal if use_replica(request) else database.AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+def report_read_session_factory(request: Request):
+    """
+    Session factory for read-only exports: the replica, or the report pool of the primary.
+    """
+    return database.ReplicaSessionLocal if use_replica(request) else database.ReportSessionLocal
+
+# Dependency to get a report-pool DB session for read-only exports
+def get_report_read_db(request: Request):
+    db = report_read_session_factory(request)()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,6 +1,14 @@
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.api import organizations, facilities, emission_reports, emission_statements, csrd_reports, excel_export
+from app.api import water_activity_types, environmental_product_declarations, emissions
+from app.db.database import get_database_pool_stats
+from app.db.routing import primary_stickiness_middleware
+from app.services.bulkhead import BulkheadFullError, heavy_bulkhead
+from app.services.emission_cache import emission_cache
+from app.services.export_jobs import export_jobs
+from app.services.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
 
 app = FastAPI(
     title="OpenFootprint API",
@@ -15,8 +23,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Route a client's reads to the primary for a short window after it writes
+app.middleware("http")(primary_stickiness_middleware)
+
+@app.exception_handler(BulkheadFullError)
+async def bulkhead_full_handler(request: Request, exc: BulkheadFullError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
 # Include all API routers
 app.include_router(organizations.router)
 app.include_router(facilities.router)
@@ -24,6 +48,9 @@ app.include_router(emission_reports.router)
 app.include_router(emission_statements.router)
 app.include_router(csrd_reports.router)
 app.include_router(excel_export.router)
+app.include_router(water_activity_types.router)
+app.include_router(environmental_product_declarations.router)
+app.include_router(emissions.router)
 
 @app.get("/")
 async def root():
@@ -32,3 +59,19 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/db-pool")
+async def database_pool_stats():
+    return get_database_pool_stats()
+
+@app.get("/health/bulkheads")
+async def bulkhead_stats():
+    return {"heavy": heavy_bulkhead.stats()}
+
+@app.get("/health/emission-cache")
+async def emission_cache_stats():
+    return emission_cache.stats()
+
+@app.get("/health/export-jobs")
+async def export_job_stats():
+    return export_jobs.stats()
@@ -0,0 +1,62 @@
+from pydantic import BaseModel, Field, ValidationError
+from typing import Optional, List
+
+class BulkRowError(BaseModel):
+    """
+    A row of a bulk request that was not written, and why.
+    """
+    index: int = Field(..., description="Zero-based position of the row in the request or file")
+    key: Optional[str] = Field(None, description="Primary key of the row, if it could be read")
+    message: str = Field(..., description="Validation or database error for the row")
+
+    @classmethod
+    def from_validation_error(cls, index: int, key: Optional[str], exc: ValidationError) -> "BulkRowError":
+        message = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+        )
+        return cls(index=index, key=key, message=message)
+
+class BulkInsertResult(BaseModel):
+    """
+    Outcome of a bulk insert. Rows listed in errors were skipped; all other rows were written.
+    """
+    received: int = Field(..., description="Number of rows in the request")
+    inserted: int = Field(..., description="Number of rows written to the database")
+    failed: int = Field(..., description="Number of rows rejected")
+    errors: List[BulkRowError] = Field(default_factory=list, description="Per-row errors")
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "received": 3,
+                "inserted": 2,
+                "failed": 1,
+                "errors": [
+                    {
+                        "index": 1,
+                        "key": "namespace:transactional-data--EmissionStatement:12346",
+                        "message": "value: Field required"
+                    }
+                ]
+            }
+        }
+
+class BulkUploadResult(BulkInsertResult):
+    """
+    Outcome of a streamed file upload.
+    """
+    chunks: int = Field(0, description="Number of chunks committed")
+    bytes_received: int = Field(0, description="Size of the uploaded body in bytes")
+    errors_truncated: bool = Field(False, description="True if more rows failed than are listed in errors")
+    error: Optional[str] = Field(None, description="Why parsing stopped before the end of the upload, if it did")
+
+class BulkUpsertResult(BaseModel):
+    """
+    Outcome of a batch upsert. Rows listed in errors were skipped.
+    """
+    received: int = Field(..., description="Number of rows in the request")
+    inserted: int = Field(..., description="Number of new rows")
+    updated: int = Field(..., description="Number of existing rows whose values changed")
+    unchanged: int = Field(..., description="Number of existing rows that already had the same values")
+    failed: int = Field(..., description="Number of rows rejected")
+    errors: List[BulkRowError] = Field(default_factory=list, description="Per-row errors")
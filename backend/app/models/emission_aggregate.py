@@ -0,0 +1,108 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from enum import Enum
+
+class AggregateDimension(str, Enum):
+    ORGANIZATION = "organization"
+    FACILITY = "facility"
+    ACTIVITY = "activity"
+    UNIT = "unit"
+    PERIOD = "period"
+
+class TimeBucket(str, Enum):
+    DAY = "day"
+    MONTH = "month"
+    QUARTER = "quarter"
+    YEAR = "year"
+
+class TrendComparison(str, Enum):
+    PREVIOUS = "previous"
+    YEAR = "year"
+
+class EmissionAggregate(BaseModel):
+    """
+    Total of the emission statements in one group. Dimensions that were not
+    grouped on are null.
+    """
+    organization_id: Optional[str] = Field(None, description="Organization of the group")
+    facility_id: Optional[str] = Field(None, description="Facility of the group")
+    emission_activity_id: Optional[str] = Field(None, description="Emission activity of the group")
+    period_start: Optional[datetime] = Field(None, description="Start of the time bucket, by reporting period start")
+    unit: str = Field(..., description="Unit of the total")
+    total: float = Field(..., description="Sum of the statement values")
+    statement_count: int = Field(..., description="Number of statements in the group")
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "organization_id": "namespace:master-data--Organization:67890",
+                "facility_id": None,
+                "emission_activity_id": None,
+                "period_start": "2024-01-01T00:00:00Z",
+                "unit": "kg CO2e",
+                "total": 125040.5,
+                "statement_count": 311
+            }
+        }
+
+class EmissionTrendPoint(BaseModel):
+    period_start: datetime = Field(..., description="Start of the time bucket")
+    total: float = Field(..., description="Sum of the statement values in the bucket; 0 when there are none")
+    statement_count: int = Field(..., description="Number of statements in the bucket")
+    change: Optional[float] = Field(None, description="Total minus the total of the compared bucket; null when that bucket is outside the range")
+    change_percent: Optional[float] = Field(None, description="Change as a percentage of the compared total; null when that total is 0 or unknown")
+
+class EmissionTrendSeries(BaseModel):
+    """
+    Totals of one group over consecutive time buckets, each compared with the
+    previous bucket or the same bucket a year earlier.
+    """
+    organization_id: Optional[str] = Field(None, description="Organization of the series")
+    facility_id: Optional[str] = Field(None, description="Facility of the series")
+    emission_activity_id: Optional[str] = Field(None, description="Emission activity of the series")
+    unit: str = Field(..., description="Unit of the totals")
+    points: List[EmissionTrendPoint] = Field(..., description="One point per bucket, oldest first")
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "organization_id": "namespace:master-data--Organization:67890",
+                "facility_id": None,
+                "emission_activity_id": None,
+                "unit": "kg CO2e",
+                "points": [
+                    {"period_start": "2023-01-01T00:00:00Z", "total": 120000.0, "statement_count": 290, "change": None, "change_percent": None},
+                    {"period_start": "2024-01-01T00:00:00Z", "total": 108000.0, "statement_count": 311, "change": -12000.0, "change_percent": -10.0}
+                ]
+            }
+        }
+
+class EmissionTopGroup(BaseModel):
+    key: Optional[str] = Field(None, description="Facility or emission activity; null for statements without a facility")
+    total: float = Field(..., description="Sum of the statement values of the group")
+    statement_count: int = Field(..., description="Number of statements in the group")
+    share: Optional[float] = Field(None, description="Total as a fraction of the total of all groups")
+    cumulative_share: Optional[float] = Field(None, description="Share of this group and all larger ones; null unless requested")
+
+class EmissionTopEmitters(BaseModel):
+    """
+    The largest groups by total, largest first, for Pareto charts.
+    """
+    dimension: AggregateDimension = Field(..., description="What the groups are: facility or activity")
+    unit: str = Field(..., description="Unit of the totals")
+    total: float = Field(..., description="Total of all groups, including those beyond the limit")
+    groups: List[EmissionTopGroup] = Field(..., description="The groups, largest first")
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "dimension": "facility",
+                "unit": "kg CO2e",
+                "total": 200000.0,
+                "groups": [
+                    {"key": "namespace:master-data--Facility:12345", "total": 120000.0, "statement_count": 290, "share": 0.6, "cumulative_share": 0.6},
+                    {"key": "namespace:master-data--Facility:23456", "total": 50000.0, "statement_count": 41, "share": 0.25, "cumulative_share": 0.85}
+                ]
+            }
+        }
@@ -38,3 +38,41 @@ class EmissionReport(EmissionReportBase):
                 "updated_at": "2025-04-01T01:00:00Z"
             }
         }
+
+class EmissionReportBreakdown(BaseModel):
+    key: Optional[str] = Field(None, description="Facility, activity or unit of the group; null for statements without a facility")
+    unit: str = Field(..., description="Unit of the total")
+    total: float = Field(..., description="Sum of the statement values")
+    statement_count: int = Field(..., description="Number of statements in the group")
+
+class EmissionReportSummary(BaseModel):
+    """
+    Totals of the emission statements linked to a report.
+
+    Totals are split by unit so values in different units are not added up;
+    with normalization, statements in known units are totalled in kg CO2e.
+    """
+    emission_report_pk: str = Field(..., description="Primary key of the Emission Report")
+    statement_count: int = Field(..., description="Number of statements in the report")
+    totals: List[EmissionReportBreakdown] = Field(default_factory=list, description="Report total per unit")
+    by_facility: List[EmissionReportBreakdown] = Field(default_factory=list, description="Totals per facility and unit")
+    by_activity: List[EmissionReportBreakdown] = Field(default_factory=list, description="Totals per emission activity and unit")
+    by_unit: List[EmissionReportBreakdown] = Field(default_factory=list, description="Totals per unit as recorded, before normalization")
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "emission_report_pk": "namespace:transactional-data--EmissionReport:12345",
+                "statement_count": 3,
+                "totals": [{"key": None, "unit": "kg CO2e", "total": 3500.0, "statement_count": 3}],
+                "by_facility": [
+                    {"key": "namespace:master-data--Facility:1", "unit": "kg CO2e", "total": 3000.0, "statement_count": 2},
+                    {"key": None, "unit": "kg CO2e", "total": 500.0, "statement_count": 1}
+                ],
+                "by_activity": [{"key": "namespace:reference-data--EmissionActivity:electricity", "unit": "kg CO2e", "total": 3500.0, "statement_count": 3}],
+                "by_unit": [
+                    {"key": "kg CO2e", "unit": "kg CO2e", "total": 500.0, "statement_count": 1},
+                    {"key": "t CO2e", "unit": "t CO2e", "total": 3.0, "statement_count": 2}
+                ]
+            }
+        }
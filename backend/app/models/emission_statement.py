@@ -22,6 +22,8 @@ class EmissionStatementCreate(EmissionStatementBase):
 
 class EmissionStatement(EmissionStatementBase):
     emission_statement_pk: str = Field(..., description="Primary key of the Emission Statement")
+    normalized_value: Optional[float] = Field(None, description="The value converted to the canonical unit, if the unit is known")
+    normalized_unit: Optional[str] = Field(None, description="The canonical unit of normalized_value")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
     
@@ -38,6 +40,8 @@ class EmissionStatement(EmissionStatementBase):
                 "reporting_period_end": "2024-01-31T23:59:59Z",
                 "facility_id": "namespace:master-data--Facility:12345",
                 "organization_id": "namespace:master-data--Organization:67890",
+                "normalized_value": 1250.5,
+                "normalized_unit": "kg CO2e",
                 "created_at": "2025-04-01T00:00:00Z",
                 "updated_at": "2025-04-01T01:00:00Z"
             }
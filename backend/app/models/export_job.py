@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+
+class ExcelExport(str, Enum):
+    ORGANIZATIONS = "organizations"
+    FACILITIES = "facilities"
+    EMISSION_REPORTS = "emission-reports"
+    CSRD_REPORTS = "csrd-reports"
+    COMPREHENSIVE_REPORT = "comprehensive-report"
+
+class ExportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class ExportJob(BaseModel):
+    """
+    An export running in the background. Poll it until it has succeeded, then download the file.
+    """
+    job_id: str = Field(..., description="ID of the job")
+    export: str = Field(..., description="What is exported, e.g. comprehensive-report")
+    status: ExportJobStatus = Field(..., description="queued, running, succeeded or failed")
+    progress: float = Field(..., description="Fraction of the work done, from 0 to 1")
+    filename: str = Field(..., description="File name of the download")
+    error: Optional[str] = Field(None, description="Why the job failed")
+    created_at: datetime = Field(..., description="When the job was submitted")
+    finished_at: Optional[datetime] = Field(None, description="When the job succeeded or failed")
+    expires_at: Optional[datetime] = Field(None, description="When the job and its file are removed")
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "job_id": "5f0c8e4a9b7d4c1e8f2a3b6c7d8e9f01",
+                "export": "comprehensive-report",
+                "status": "running",
+                "progress": 0.5,
+                "filename": "openfootprint_comprehensive_report.xlsx",
+                "error": None,
+                "created_at": "2025-06-20T09:00:00Z",
+                "finished_at": None,
+                "expires_at": None
+            }
+        }
@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import asyncio
+import functools
+import os
+import threading
+import time
+
+class BulkheadFullError(Exception):
+    """
+    Raised when a bulkhead has no free worker and its queue is full.
+    """
+    def __init__(self, name: str, retry_after: int = 5):
+        super().__init__(f"Bulkhead '{name}' is saturated, retry later")
+        self.name = name
+        self.retry_after = retry_after
+
+class Bulkhead:
+    """
+    A bounded thread pool that isolates expensive work from the rest of the API.
+
+    At most ``max_concurrent`` calls run at once and at most ``max_queue`` more
+    wait for a worker; anything beyond that is rejected with BulkheadFullError
+    instead of piling up behind the running jobs.
+    """
+    def __init__(self, name: str, max_concurrent: int, max_queue: int):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix=f"bulkhead-{name}")
+        self._lock = threading.Lock()
+        self._admitted = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_queue_wait_seconds = 0.0
+        self._max_queue_wait_seconds = 0.0
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._admitted >= self.max_concurrent + self.max_queue:
+                self._rejected += 1
+                raise BulkheadFullError(self.name)
+            self._admitted += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._admitted -= 1
+
+    def _call(self, submitted_at: float, func: Callable[..., Any]) -> Any:
+        waited = time.perf_counter() - submitted_at
+        with self._lock:
+            self._active += 1
+            self._total_queue_wait_seconds += waited
+            self._max_queue_wait_seconds = max(self._max_queue_wait_seconds, waited)
+        try:
+            result = func()
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._admitted -= 1
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs):
+        """
+        Submit a call to the bulkhead and return a concurrent.futures.Future.
+        """
+        self._admit()
+        try:
+            future = self._executor.submit(self._call, time.perf_counter(), functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        # A call cancelled before it started never reaches _call
+        future.add_done_callback(lambda f: self._release() if f.cancelled() else None)
+        return future
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking call inside the bulkhead and await its result.
+        """
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self._completed + self._failed + self._active
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._admitted - self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_queue_wait_seconds": self._total_queue_wait_seconds / started if started else 0.0,
+                "max_queue_wait_seconds": self._max_queue_wait_seconds,
+            }
+
+# Shared bulkhead for Excel exports and CSRD report generation/validation
+HEAVY_MAX_CONCURRENCY = int(os.getenv("HEAVY_MAX_CONCURRENCY", "2"))
+HEAVY_MAX_QUEUE = int(os.getenv("HEAVY_MAX_QUEUE", "8"))
+
+heavy_bulkhead = Bulkhead("heavy", max_concurrent=HEAVY_MAX_CONCURRENCY, max_queue=HEAVY_MAX_QUEUE)
@@ -0,0 +1,281 @@
+from typing import Any, Dict, List
+import csv
+import io
+
+from sqlalchemy import insert, literal_column, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.models import EmissionReport as DBEmissionReport, emission_report_statements
+from app.models.bulk import BulkInsertResult, BulkRowError
+from app.services import emission_service
+from app.services.emission_cache import emission_cache
+from app.services.units import unit_registry
+
+COPY_CHUNK_SIZE = 50000
+
+STATEMENT_COLUMNS = [
+    "emission_statement_pk",
+    "emission_activity_id",
+    "emission_calculation_model_id",
+    "value",
+    "unit",
+    "reporting_period_start",
+    "reporting_period_end",
+    "facility_id",
+    "organization_id",
+]
+
+# Statement columns plus the optional report each statement belongs to
+STAGING_COLUMNS = STATEMENT_COLUMNS + ["emission_report_id"]
+
+REQUIRED_COLUMNS = [
+    "emission_statement_pk",
+    "emission_activity_id",
+    "value",
+    "unit",
+    "reporting_period_start",
+    "reporting_period_end",
+    "organization_id",
+]
+
+_CREATE_STAGING = f"""
+CREATE TEMP TABLE IF NOT EXISTS emission_statements_staging (
+    row_index integer NOT NULL,
+    {", ".join(f"{column} text" for column in STAGING_COLUMNS)},
+    error text
+) ON COMMIT DELETE ROWS
+"""
+
+_CREATE_CASTS = [
+    """
+    CREATE OR REPLACE FUNCTION pg_temp.try_float(v text) RETURNS double precision
+    LANGUAGE plpgsql IMMUTABLE AS $$
+    BEGIN RETURN v::double precision; EXCEPTION WHEN others THEN RETURN NULL; END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION pg_temp.try_timestamp(v text) RETURNS timestamp
+    LANGUAGE plpgsql IMMUTABLE AS $$
+    BEGIN RETURN v::timestamp; EXCEPTION WHEN others THEN RETURN NULL; END $$
+    """,
+]
+
+# Applied in order; each only looks at rows that are still valid
+_MISSING = " OR ".join(f"{column} IS NULL" for column in REQUIRED_COLUMNS)
+_MISSING_NAMES = ", ".join(f"CASE WHEN {column} IS NULL THEN '{column}' END" for column in REQUIRED_COLUMNS)
+_VALIDATIONS = [
+    f"""
+    UPDATE emission_statements_staging SET error = 'Missing required field: ' || concat_ws(', ', {_MISSING_NAMES})
+    WHERE {_MISSING}
+    """,
+    """
+    UPDATE emission_statements_staging SET error = 'value: Input should be a valid number'
+    WHERE error IS NULL AND pg_temp.try_float(value) IS NULL
+    """,
+    """
+    UPDATE emission_statements_staging SET error = 'reporting_period_start: Input should be a valid datetime'
+    WHERE error IS NULL AND pg_temp.try_timestamp(reporting_period_start) IS NULL
+    """,
+    """
+    UPDATE emission_statements_staging SET error = 'reporting_period_end: Input should be a valid datetime'
+    WHERE error IS NULL AND pg_temp.try_timestamp(reporting_period_end) IS NULL
+    """,
+    """
+    UPDATE emission_statements_staging s SET error = 'Duplicate emission_statement_pk in request'
+    FROM emission_statements_staging d
+    WHERE s.error IS NULL AND d.error IS NULL
+      AND d.emission_statement_pk = s.emission_statement_pk AND d.row_index < s.row_index
+    """,
+    """
+    UPDATE emission_statements_staging s SET error = 'emission_statement_pk already exists'
+    WHERE s.error IS NULL
+      AND EXISTS (SELECT 1 FROM emission_statements e WHERE e.emission_statement_pk = s.emission_statement_pk)
+    """,
+    """
+    UPDATE emission_statements_staging s SET error = 'Unknown organization_id'
+    WHERE s.error IS NULL
+      AND NOT EXISTS (SELECT 1 FROM organizations o WHERE o.organization_pk = s.organization_id)
+    """,
+    """
+    UPDATE emission_statements_staging s SET error = 'Unknown facility_id'
+    WHERE s.error IS NULL AND s.facility_id IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM facilities f WHERE f.facility_pk = s.facility_id)
+    """,
+    """
+    UPDATE emission_statements_staging s SET error = 'Unknown emission_report_id'
+    WHERE s.error IS NULL AND s.emission_report_id IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM emission_reports r WHERE r.emission_report_pk = s.emission_report_id)
+    """,
+]
+
+def _normalized_columns_sql() -> str:
+    """
+    SQL for normalized_value and normalized_unit computed from the staging row with the unit registry.
+    """
+    unit = literal_column("unit")
+    factor = unit_registry.sql_factor(unit)
+    canonical_unit = unit_registry.sql_canonical_unit(unit)
+    compile_kwargs = {"literal_binds": True}
+    dialect = postgresql.dialect()
+    return (
+        f"pg_temp.try_float(value) * ({factor.compile(dialect=dialect, compile_kwargs=compile_kwargs)}), "
+        f"{canonical_unit.compile(dialect=dialect, compile_kwargs=compile_kwargs)}"
+    )
+
+if emission_service.STORE_NORMALIZED_VALUES:
+    _MERGE_COLUMNS = STATEMENT_COLUMNS + ["normalized_value", "normalized_unit"]
+    _NORMALIZED_SELECT = ",\n       " + _normalized_columns_sql()
+else:
+    _MERGE_COLUMNS = STATEMENT_COLUMNS
+    _NORMALIZED_SELECT = ""
+
+_MERGE_STATEMENTS = f"""
+INSERT INTO emission_statements ({", ".join(_MERGE_COLUMNS)})
+SELECT emission_statement_pk, emission_activity_id, emission_calculation_model_id,
+       pg_temp.try_float(value), unit,
+       pg_temp.try_timestamp(reporting_period_start), pg_temp.try_timestamp(reporting_period_end),
+       facility_id, organization_id{_NORMALIZED_SELECT}
+FROM emission_statements_staging
+WHERE error IS NULL
+"""
+
+_MERGE_REPORT_LINKS = """
+INSERT INTO emission_report_statements (emission_report_id, emission_statement_id)
+SELECT DISTINCT emission_report_id, emission_statement_pk
+FROM emission_statements_staging
+WHERE error IS NULL AND emission_report_id IS NOT NULL
+"""
+
+_MERGE_ROLLUPS = """
+INSERT INTO emission_rollups (organization_id, facility_key, month, unit, total, statement_count)
+SELECT organization_id, COALESCE(facility_id, ''), date_trunc('month', pg_temp.try_timestamp(reporting_period_start)),
+       unit, SUM(pg_temp.try_float(value)), COUNT(*)
+FROM emission_statements_staging
+WHERE error IS NULL
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (organization_id, facility_key, month, unit) DO UPDATE
+SET total = emission_rollups.total + EXCLUDED.total,
+    statement_count = emission_rollups.statement_count + EXCLUDED.statement_count,
+    updated_at = now()
+"""
+
+_ERRORS = """
+SELECT row_index, emission_statement_pk, error
+FROM emission_statements_staging
+WHERE error IS NOT NULL
+ORDER BY row_index
+"""
+
+def _copy_value(value: Any):
+    if value is None or value == "":
+        return None
+    return str(value)
+
+def staging_csv(rows: List[Dict[str, Any]]) -> io.StringIO:
+    """
+    Render rows as CSV in staging column order for COPY, preceded by their position.
+
+    Missing and empty values are written as unquoted empty fields, which COPY loads as NULL.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            row = {}
+        writer.writerow([index] + [_copy_value(row.get(column)) for column in STAGING_COLUMNS])
+    buffer.seek(0)
+    return buffer
+
+def _copy_chunk(db: Session, rows: List[Dict[str, Any]]) -> BulkInsertResult:
+    db.execute(text(_CREATE_STAGING))
+    for statement in _CREATE_CASTS:
+        db.execute(text(statement))
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY emission_statements_staging (row_index, {', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            staging_csv(rows)
+        )
+    finally:
+        cursor.close()
+    # Temporary tables are never auto-analyzed; without statistics the checks below get nested-loop plans
+    db.execute(text("ANALYZE emission_statements_staging"))
+
+    for statement in _VALIDATIONS:
+        db.execute(text(statement))
+    inserted = db.execute(text(_MERGE_STATEMENTS)).rowcount
+    db.execute(text(_MERGE_REPORT_LINKS))
+    db.execute(text(_MERGE_ROLLUPS))
+    errors = [
+        BulkRowError(index=row.row_index, key=row.emission_statement_pk, message=row.error)
+        for row in db.execute(text(_ERRORS))
+    ]
+    db.commit()
+    emission_cache.invalidate(row.get("organization_id") for row in rows if isinstance(row, dict))
+    return BulkInsertResult(received=len(rows), inserted=inserted, failed=len(errors), errors=errors)
+
+def _insert_chunk(db: Session, rows: List[Dict[str, Any]], chunk_size: int) -> BulkInsertResult:
+    """
+    Batched INSERT path: checks report references, then hands the rows to the bulk insert.
+    """
+    report_ids = {
+        row.get("emission_report_id") for row in rows
+        if isinstance(row, dict) and row.get("emission_report_id")
+    }
+    known_reports = set()
+    if report_ids:
+        known_reports = set(db.scalars(
+            select(DBEmissionReport.emission_report_pk).where(DBEmissionReport.emission_report_pk.in_(report_ids))
+        ))
+
+    errors = []
+    accepted = []
+    indexes = []
+    for index, row in enumerate(rows):
+        report_id = row.get("emission_report_id") if isinstance(row, dict) else None
+        if report_id and report_id not in known_reports:
+            errors.append(BulkRowError(index=index, key=row.get("emission_statement_pk"), message="Unknown emission_report_id"))
+            continue
+        accepted.append(row)
+        indexes.append(index)
+
+    result = emission_service.bulk_create_emission_statements(db, accepted, chunk_size=chunk_size)
+    for error in result.errors:
+        error.index = indexes[error.index]
+    failed = {error.index for error in result.errors}
+    links = [
+        {"emission_report_id": row["emission_report_id"], "emission_statement_id": row["emission_statement_pk"]}
+        for index, row in zip(indexes, accepted)
+        if index not in failed and row.get("emission_report_id")
+    ]
+    if links:
+        db.execute(insert(emission_report_statements), links)
+        db.commit()
+
+    errors = sorted(errors + result.errors, key=lambda error: error.index)
+    return BulkInsertResult(received=len(rows), inserted=result.inserted, failed=len(errors), errors=errors)
+
+def copy_emission_statements(db: Session, rows: List[Dict[str, Any]], chunk_size: int = COPY_CHUNK_SIZE) -> BulkInsertResult:
+    """
+    Import emission statements through a PostgreSQL COPY into a staging table.
+
+    Rows are streamed into a temporary staging table with ``COPY FROM STDIN``,
+    checked there with set-based UPDATEs (required fields, numbers and dates,
+    duplicates, existing keys, unknown organizations, facilities and reports)
+    and merged into emission_statements, emission_report_statements and the
+    emission_rollups totals with INSERT ... SELECT, all in one transaction.
+    Rows may carry an optional ``emission_report_id`` to link the statement
+    to an existing report.
+
+    On other databases, or if a concurrent writer makes the merge fail, the
+    rows go through the batched INSERT path instead.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return _insert_chunk(db, rows, chunk_size=min(chunk_size, emission_service.BULK_CHUNK_SIZE))
+    try:
+        return _copy_chunk(db, rows)
+    except IntegrityError:
+        db.rollback()
+        return _insert_chunk(db, rows, chunk_size=emission_service.BULK_CHUNK_SIZE)
@@ -1,3 +1,5 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 import json
@@ -5,13 +7,41 @@ from datetime import datetime
 
 from app.db.csrd_models import CSRDReport as DBCSRDReport
 from app.models.csrd_report import CSRDReportCreate, CSRDReport
+from app.services.pagination import apply_keyset
+
+def _emission_report_ids(csrd_report: CSRDReportCreate) -> List[str]:
+    # Convert emission_report_ids to a list if it's not already
+    emission_report_ids = csrd_report.emission_report_ids
+    if isinstance(emission_report_ids, str):
+        emission_report_ids = [emission_report_ids]
+    return emission_report_ids
+
+def _to_db_csrd_report(csrd_report: CSRDReportCreate) -> DBCSRDReport:
+    return DBCSRDReport(
+        csrd_report_pk=csrd_report.csrd_report_pk,
+        title=csrd_report.title,
+        description=csrd_report.description,
+        reporting_period_start=csrd_report.reporting_period_start,
+        reporting_period_end=csrd_report.reporting_period_end,
+        organization_id=csrd_report.organization_id,
+        report_type=csrd_report.report_type,
+        status=csrd_report.status,
+        version=csrd_report.version,
+        prepared_by=csrd_report.prepared_by,
+        approved_by=csrd_report.approved_by,
+        esrs_compliance={},  # Initialize with empty JSON
+        materiality_assessment={},
+        double_materiality={},
+        sustainability_targets={},
+        value_chain_assessment={}
+    )
 
 class CSRDReportService:
-    def get_csrd_reports(self, db: Session, skip: int = 0, limit: int = 100) -> List[DBCSRDReport]:
+    def get_csrd_reports(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBCSRDReport]:
         """
         Retrieve a list of CSRD reports from the database.
         """
-        return db.query(DBCSRDReport).offset(skip).limit(limit).all()
+        return apply_keyset(db.query(DBCSRDReport), DBCSRDReport.csrd_report_pk, skip, limit, cursor).all()
 
     def get_csrd_report(self, db: Session, csrd_report_pk: str) -> Optional[DBCSRDReport]:
         """
@@ -23,30 +53,10 @@ class CSRDReportService:
         """
         Create a new CSRD report in the database.
         """
-        # Convert emission_report_ids to a list if it's not already
-        emission_report_ids = csrd_report.emission_report_ids
-        if isinstance(emission_report_ids, str):
-            emission_report_ids = [emission_report_ids]
+        emission_report_ids = _emission_report_ids(csrd_report)
         
         # Create the CSRD report
-        db_csrd_report = DBCSRDReport(
-            csrd_report_pk=csrd_report.csrd_report_pk,
-            title=csrd_report.title,
-            description=csrd_report.description,
-            reporting_period_start=csrd_report.reporting_period_start,
-            reporting_period_end=csrd_report.reporting_period_end,
-            organization_id=csrd_report.organization_id,
-            report_type=csrd_report.report_type,
-            status=csrd_report.status,
-            version=csrd_report.version,
-            prepared_by=csrd_report.prepared_by,
-            approved_by=csrd_report.approved_by,
-            esrs_compliance={},  # Initialize with empty JSON
-            materiality_assessment={},
-            double_materiality={},
-            sustainability_targets={},
-            value_chain_assessment={}
-        )
+        db_csrd_report = _to_db_csrd_report(csrd_report)
         
         db.add(db_csrd_report)
         db.commit()
@@ -134,11 +144,11 @@ class CSRDReportService:
         return validation_results
 
 # For backward compatibility, keep the function versions
-def get_csrd_reports(db: Session, skip: int = 0, limit: int = 100) -> List[DBCSRDReport]:
+def get_csrd_reports(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBCSRDReport]:
     """
     Retrieve a list of CSRD reports from the database.
     """
-    return CSRDReportService().get_csrd_reports(db, skip, limit)
+    return CSRDReportService().get_csrd_reports(db, skip, limit, cursor)
 
 def get_csrd_report(db: Session, csrd_report_pk: str) -> Optional[DBCSRDReport]:
     """
@@ -163,3 +173,34 @@ def validate_csrd_report(db: Session, csrd_report_pk: str) -> Dict[str, Any]:
     Validate a CSRD report against ESRS requirements.
     """
     return CSRDReportService().validate_csrd_report(db, csrd_report_pk)
+
+# Async versions used by the API routers
+async def get_csrd_reports_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBCSRDReport]:
+    """
+    Retrieve a list of CSRD reports from the database.
+    """
+    result = await db.execute(apply_keyset(select(DBCSRDReport), DBCSRDReport.csrd_report_pk, skip, limit, cursor))
+    return list(result.scalars().all())
+
+async def get_csrd_report_async(db: AsyncSession, csrd_report_pk: str) -> Optional[DBCSRDReport]:
+    """
+    Retrieve a specific CSRD report by its primary key.
+    """
+    return await db.get(DBCSRDReport, csrd_report_pk)
+
+async def create_csrd_report_async(db: AsyncSession, csrd_report: CSRDReportCreate) -> DBCSRDReport:
+    """
+    Create a new CSRD report in the database.
+    """
+    from app.db.models import EmissionReport
+    db_csrd_report = _to_db_csrd_report(csrd_report)
+    emission_report_ids = _emission_report_ids(csrd_report)
+    if emission_report_ids:
+        result = await db.execute(
+            select(EmissionReport).where(EmissionReport.emission_report_pk.in_(emission_report_ids))
+        )
+        db_csrd_report.emission_reports.extend(result.scalars().all())
+    db.add(db_csrd_report)
+    await db.commit()
+    await db.refresh(db_csrd_report)
+    return db_csrd_report
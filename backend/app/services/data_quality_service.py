@@ -1,14 +1,27 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.db.models import DataQuality as DBDataQuality
 from app.models.data_quality import DataQualityCreate, DataQuality
+from app.services.pagination import apply_keyset
 
-def get_data_quality_entries(db: Session, skip: int = 0, limit: int = 100) -> List[DBDataQuality]:
+def _to_db_data_quality(data_quality: DataQualityCreate) -> DBDataQuality:
+    return DBDataQuality(
+        entity_id=data_quality.entity_id,
+        quality_score=data_quality.quality_score,
+        verification_status=data_quality.verification_status,
+        verification_date=data_quality.verification_date,
+        verified_by=data_quality.verified_by,
+        notes=data_quality.notes
+    )
+
+def get_data_quality_entries(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBDataQuality]:
     """
     Retrieve a list of data quality entries from the database.
     """
-    return db.query(DBDataQuality).offset(skip).limit(limit).all()
+    return apply_keyset(db.query(DBDataQuality), DBDataQuality.entity_id, skip, limit, cursor).all()
 
 def get_data_quality(db: Session, entity_id: str) -> Optional[DBDataQuality]:
     """
@@ -20,15 +33,32 @@ def create_data_quality(db: Session, data_quality: DataQualityCreate) -> DBDataQ
     """
     Create a new data quality entry in the database.
     """
-    db_data_quality = DBDataQuality(
-        entity_id=data_quality.entity_id,
-        quality_score=data_quality.quality_score,
-        verification_status=data_quality.verification_status,
-        verification_date=data_quality.verification_date,
-        verified_by=data_quality.verified_by,
-        notes=data_quality.notes
-    )
+    db_data_quality = _to_db_data_quality(data_quality)
     db.add(db_data_quality)
     db.commit()
     db.refresh(db_data_quality)
     return db_data_quality
+
+# Async versions used by the API routers
+async def get_data_quality_entries_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBDataQuality]:
+    """
+    Retrieve a list of data quality entries from the database.
+    """
+    result = await db.execute(apply_keyset(select(DBDataQuality), DBDataQuality.entity_id, skip, limit, cursor))
+    return list(result.scalars().all())
+
+async def get_data_quality_async(db: AsyncSession, entity_id: str) -> Optional[DBDataQuality]:
+    """
+    Retrieve a specific data quality entry by its entity ID.
+    """
+    return await db.get(DBDataQuality, entity_id)
+
+async def create_data_quality_async(db: AsyncSession, data_quality: DataQualityCreate) -> DBDataQuality:
+    """
+    Create a new data quality entry in the database.
+    """
+    db_data_quality = _to_db_data_quality(data_quality)
+    db.add(db_data_quality)
+    await db.commit()
+    await db.refresh(db_data_quality)
+    return db_data_quality
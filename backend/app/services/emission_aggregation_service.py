@@ -0,0 +1,382 @@
+from datetime import datetime, time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import Integer, cast, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import EmissionRollup as DBEmissionRollup, EmissionStatement as DBEmissionStatement
+from app.models.emission_aggregate import AggregateDimension, TimeBucket
+from app.services.emission_cache import emission_cache
+from app.services.organization_service import organization_subtree
+from app.services.prorating import prorate
+from app.services.units import unit_registry
+
+DIMENSION_COLUMNS = {
+    AggregateDimension.ORGANIZATION: ("organization_id", DBEmissionStatement.organization_id),
+    AggregateDimension.FACILITY: ("facility_id", DBEmissionStatement.facility_id),
+    AggregateDimension.ACTIVITY: ("emission_activity_id", DBEmissionStatement.emission_activity_id),
+    AggregateDimension.UNIT: ("unit", DBEmissionStatement.unit),
+}
+
+_SQLITE_BUCKET_FORMATS = {
+    TimeBucket.DAY: "%Y-%m-%d 00:00:00",
+    TimeBucket.MONTH: "%Y-%m-01 00:00:00",
+    TimeBucket.YEAR: "%Y-01-01 00:00:00",
+}
+
+def _constant(value: str):
+    return literal_column(f"'{value}'")
+
+def period_bucket(dialect: str, bucket: TimeBucket, column=DBEmissionStatement.reporting_period_start):
+    """
+    SQL expression truncating a timestamp column to the start of its day, month, quarter or year.
+    """
+    bucket = TimeBucket(bucket)
+    # Constants are inlined rather than bound so the expression in GROUP BY is
+    # textually identical to the one in the select list
+    if dialect == "postgresql":
+        return func.date_trunc(_constant(bucket.value), column)
+    if dialect == "sqlite":
+        if bucket == TimeBucket.QUARTER:
+            first_month = (cast(func.strftime(_constant("%m"), column), Integer) - 1) // 3 * 3 + 1
+            return func.strftime(_constant("%Y"), column).concat(func.printf(_constant("-%02d-01 00:00:00"), first_month))
+        return func.strftime(_constant(_SQLITE_BUCKET_FORMATS[bucket]), column)
+    raise NotImplementedError(f"Time buckets are not supported on {dialect}")
+
+def statement_filters(
+    organization_id: Optional[str] = None,
+    facility_id: Optional[str] = None,
+    emission_activity_id: Optional[str] = None,
+    unit: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    organization_subtree_of: Optional[str] = None
+) -> List[Any]:
+    """
+    WHERE clauses for the common emission statement filters. ``start`` is
+    inclusive and ``end`` exclusive, both on reporting_period_start.
+    ``organization_subtree_of`` keeps statements of an organization and all
+    of its descendants.
+    """
+    clauses = []
+    if organization_id is not None:
+        clauses.append(DBEmissionStatement.organization_id == organization_id)
+    if organization_subtree_of is not None:
+        subtree = organization_subtree(organization_subtree_of)
+        clauses.append(DBEmissionStatement.organization_id.in_(select(subtree.c.organization_pk)))
+    if facility_id is not None:
+        clauses.append(DBEmissionStatement.facility_id == facility_id)
+    if emission_activity_id is not None:
+        clauses.append(DBEmissionStatement.emission_activity_id == emission_activity_id)
+    if unit is not None:
+        clauses.append(DBEmissionStatement.unit == unit)
+    if start is not None:
+        clauses.append(DBEmissionStatement.reporting_period_start >= start)
+    if end is not None:
+        clauses.append(DBEmissionStatement.reporting_period_start < end)
+    return clauses
+
+def _month_aligned(value: Optional[datetime]) -> bool:
+    return value is None or (value.day == 1 and value.time() == time(0))
+
+def rollup_compatible(group_by: Sequence[AggregateDimension], bucket: TimeBucket = TimeBucket.MONTH, **filters) -> bool:
+    """
+    Whether a query can be answered from emission_rollups instead of emission_statements.
+
+    The rollups keep organization, facility, month and unit, so activity
+    grouping or filtering, daily buckets and period bounds that do not fall
+    on a month start need the statements.
+    """
+    group_by = {AggregateDimension(dimension) for dimension in group_by}
+    if AggregateDimension.ACTIVITY in group_by or filters.get("emission_activity_id") is not None:
+        return False
+    if AggregateDimension.PERIOD in group_by and TimeBucket(bucket) == TimeBucket.DAY:
+        return False
+    return _month_aligned(filters.get("start")) and _month_aligned(filters.get("end"))
+
+def rollup_aggregate_statement(dialect: str, group_by: Sequence[AggregateDimension], bucket: TimeBucket = TimeBucket.MONTH, **filters):
+    """
+    The aggregation query over emission_rollups; same result columns as over the statements.
+    """
+    group_by = {AggregateDimension(dimension) for dimension in group_by}
+    group_by.add(AggregateDimension.UNIT)
+
+    dimension_columns = {
+        AggregateDimension.ORGANIZATION: DBEmissionRollup.organization_id.label("organization_id"),
+        AggregateDimension.FACILITY: func.nullif(DBEmissionRollup.facility_key, "").label("facility_id"),
+        AggregateDimension.UNIT: DBEmissionRollup.unit.label("unit"),
+    }
+    columns = [column for dimension, column in dimension_columns.items() if dimension in group_by]
+    if AggregateDimension.PERIOD in group_by:
+        columns.append(period_bucket(dialect, bucket, DBEmissionRollup.month).label("period_start"))
+
+    clauses = []
+    if filters.get("organization_id") is not None:
+        clauses.append(DBEmissionRollup.organization_id == filters["organization_id"])
+    if filters.get("organization_subtree_of") is not None:
+        subtree = organization_subtree(filters["organization_subtree_of"])
+        clauses.append(DBEmissionRollup.organization_id.in_(select(subtree.c.organization_pk)))
+    if filters.get("facility_id") is not None:
+        clauses.append(DBEmissionRollup.facility_key == filters["facility_id"])
+    if filters.get("unit") is not None:
+        clauses.append(DBEmissionRollup.unit == filters["unit"])
+    if filters.get("start") is not None:
+        clauses.append(DBEmissionRollup.month >= filters["start"])
+    if filters.get("end") is not None:
+        clauses.append(DBEmissionRollup.month < filters["end"])
+
+    return (
+        select(
+            *columns,
+            func.sum(DBEmissionRollup.total).label("total"),
+            func.sum(DBEmissionRollup.statement_count).label("statement_count")
+        )
+        .where(*clauses)
+        .group_by(*columns)
+        .order_by(*columns)
+    )
+
+def aggregate_statement(
+    dialect: str,
+    group_by: Sequence[AggregateDimension],
+    bucket: TimeBucket = TimeBucket.MONTH,
+    normalize: bool = False,
+    use_rollups: bool = True,
+    **filters
+):
+    """
+    Build the GROUP BY query behind the aggregation endpoint.
+
+    Statements are always grouped by unit as well, so values in different
+    units are never added together. Queries the rollups can answer read
+    emission_rollups; the rest read emission_statements, where ``normalize``
+    uses the stored normalized value and unit where a statement has them.
+    """
+    if use_rollups and rollup_compatible(group_by, bucket, **filters):
+        return rollup_aggregate_statement(dialect, group_by, bucket, **filters)
+
+    group_by = {AggregateDimension(dimension) for dimension in group_by}
+    group_by.add(AggregateDimension.UNIT)
+
+    value = DBEmissionStatement.value
+    dimension_columns = dict(DIMENSION_COLUMNS)
+    if normalize:
+        value = func.coalesce(DBEmissionStatement.normalized_value, DBEmissionStatement.value)
+        dimension_columns[AggregateDimension.UNIT] = (
+            "unit", func.coalesce(DBEmissionStatement.normalized_unit, DBEmissionStatement.unit)
+        )
+
+    columns = []
+    for dimension, (name, column) in dimension_columns.items():
+        if dimension in group_by:
+            columns.append(column.label(name))
+    if AggregateDimension.PERIOD in group_by:
+        columns.append(period_bucket(dialect, bucket).label("period_start"))
+
+    return (
+        select(
+            *columns,
+            func.sum(value).label("total"),
+            func.count().label("statement_count")
+        )
+        .where(*statement_filters(**filters))
+        .group_by(*columns)
+        .order_by(*columns)
+    )
+
+def normalize_groups(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert aggregated totals still in a known non-canonical unit and merge
+    them into the canonical groups.
+
+    Rollups are kept in the original units, and statements may be stored
+    without a normalized value; the conversion runs once over all groups with
+    the unit registry.
+    """
+    if not rows:
+        return rows
+    converted, canonical = unit_registry.convert_many([row["total"] for row in rows], [row["unit"] for row in rows])
+    merged: Dict[tuple, Dict[str, Any]] = {}
+    for row, total, unit in zip(rows, converted.tolist(), canonical.tolist()):
+        if unit is not None:
+            row = dict(row, total=total, unit=unit)
+        key = tuple(value for name, value in row.items() if name not in ("total", "statement_count"))
+        if key in merged:
+            merged[key]["total"] += row["total"]
+            merged[key]["statement_count"] += row["statement_count"]
+        else:
+            merged[key] = row
+    return sorted(merged.values(), key=_group_sort_key)
+
+def _group_sort_key(row: Dict[str, Any]) -> List[tuple]:
+    return [(value is None, value) for name, value in row.items() if name not in ("total", "statement_count")]
+
+def prorated_statement(group_by: Sequence[AggregateDimension], **filters):
+    """
+    Select the statements to pro-rate with their group columns, value and period.
+
+    ``start`` and ``end`` keep statements whose period overlaps the window,
+    rather than filtering on the period start.
+    """
+    group_by = {AggregateDimension(dimension) for dimension in group_by}
+    start, end = filters.pop("start", None), filters.pop("end", None)
+    clauses = statement_filters(**filters)
+    if start is not None:
+        clauses.append(DBEmissionStatement.reporting_period_end >= start)
+    if end is not None:
+        clauses.append(DBEmissionStatement.reporting_period_start < end)
+
+    columns = [
+        column.label(name) for dimension, (name, column) in DIMENSION_COLUMNS.items()
+        if dimension in group_by and dimension != AggregateDimension.UNIT
+    ]
+    return select(
+        *columns,
+        DBEmissionStatement.unit,
+        DBEmissionStatement.value,
+        DBEmissionStatement.reporting_period_start,
+        DBEmissionStatement.reporting_period_end
+    ).where(*clauses)
+
+def prorate_groups(
+    rows: Sequence[Any],
+    group_by: Sequence[AggregateDimension],
+    bucket: TimeBucket = TimeBucket.MONTH,
+    normalize: bool = False,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Pro-rate the rows of ``prorated_statement`` into time buckets and total them per group.
+
+    ``statement_count`` is the number of statements with a share in the group.
+    """
+    if not rows:
+        return []
+    group_by = {AggregateDimension(dimension) for dimension in group_by}
+    columns = {name: list(column) for name, column in zip(rows[0]._fields, zip(*rows))}
+
+    values = np.asarray(columns["value"], dtype=float)
+    units = np.asarray(columns["unit"], dtype=object)
+    if normalize:
+        converted, canonical = unit_registry.convert_many(values, units)
+        known = canonical != None  # noqa: E711 - elementwise comparison
+        values = np.where(known, converted, values)
+        units = np.where(known, canonical, units)
+    columns["unit"] = units.tolist()
+
+    names = [
+        name for dimension, (name, _) in DIMENSION_COLUMNS.items()
+        if dimension in group_by or dimension == AggregateDimension.UNIT
+    ]
+    groups: Dict[tuple, int] = {}
+    codes = np.fromiter(
+        (groups.setdefault(key, len(groups)) for key in zip(*(columns[name] for name in names))),
+        dtype=np.int64,
+        count=len(rows)
+    )
+
+    pieces, bucket_starts, portions = prorate(
+        columns["reporting_period_start"], columns["reporting_period_end"], values, bucket, start, end
+    )
+    if len(pieces) == 0:
+        return []
+    keys = codes[pieces]
+    if AggregateDimension.PERIOD in group_by:
+        distinct_buckets, bucket_codes = np.unique(bucket_starts, return_inverse=True)
+        keys = keys * len(distinct_buckets) + bucket_codes
+    distinct_keys, inverse = np.unique(keys, return_inverse=True)
+    totals = np.bincount(inverse, weights=portions, minlength=len(distinct_keys))
+    statement_pairs = np.unique(np.stack([inverse, pieces]), axis=1)
+    counts = np.bincount(statement_pairs[0], minlength=len(distinct_keys))
+
+    group_keys = list(groups)
+    result = []
+    for key, total, count in zip(distinct_keys.tolist(), totals.tolist(), counts.tolist()):
+        if AggregateDimension.PERIOD in group_by:
+            key, bucket_code = divmod(key, len(distinct_buckets))
+        row = dict(zip(names, group_keys[key]))
+        if AggregateDimension.PERIOD in group_by:
+            row["period_start"] = distinct_buckets[bucket_code].item()
+        row["total"] = total
+        row["statement_count"] = count
+        result.append(row)
+    return sorted(result, key=_group_sort_key)
+
+def _cacheable(filters: Dict[str, Any]) -> bool:
+    return emission_cache.enabled and filters.get("organization_id") is not None and filters.get("organization_subtree_of") is None
+
+def _cache_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: value for name, value in filters.items() if name not in ("organization_id", "organization_subtree_of")}
+
+def aggregate_emissions(
+    db: Session,
+    group_by: Sequence[AggregateDimension],
+    bucket: TimeBucket = TimeBucket.MONTH,
+    normalize: bool = False,
+    use_rollups: bool = True,
+    **filters
+) -> List[Dict[str, Any]]:
+    """
+    Sum emission statement values per group in the database.
+
+    With the emission cache enabled, queries for a single organization are
+    answered from its cached columns instead.
+    """
+    if _cacheable(filters):
+        columns = emission_cache.get(db, filters["organization_id"])
+        return columns.aggregate(group_by, bucket, normalize, **_cache_filters(filters))
+    statement = aggregate_statement(db.get_bind().dialect.name, group_by, bucket, normalize, use_rollups, **filters)
+    rows = [dict(row._mapping) for row in db.execute(statement)]
+    return normalize_groups(rows) if normalize else rows
+
+def prorate_emissions(
+    db: Session,
+    group_by: Sequence[AggregateDimension],
+    bucket: TimeBucket = TimeBucket.MONTH,
+    normalize: bool = False,
+    **filters
+) -> List[Dict[str, Any]]:
+    """
+    Total emissions per group with each statement split across the time buckets its period covers.
+    """
+    rows = db.execute(prorated_statement(group_by, **filters)).all()
+    return prorate_groups(rows, group_by, bucket, normalize, filters.get("start"), filters.get("end"))
+
+# Async versions used by the API routers
+async def aggregate_emissions_async(
+    db: AsyncSession,
+    group_by: Sequence[AggregateDimension],
+    bucket: TimeBucket = TimeBucket.MONTH,
+    normalize: bool = False,
+    use_rollups: bool = True,
+    **filters
+) -> List[Dict[str, Any]]:
+    """
+    Sum emission statement values per group in the database.
+
+    With the emission cache enabled, queries for a single organization are
+    answered from its cached columns instead.
+    """
+    if _cacheable(filters):
+        columns = await emission_cache.get_async(db, filters["organization_id"])
+        return columns.aggregate(group_by, bucket, normalize, **_cache_filters(filters))
+    statement = aggregate_statement(db.get_bind().dialect.name, group_by, bucket, normalize, use_rollups, **filters)
+    result = await db.execute(statement)
+    rows = [dict(row._mapping) for row in result]
+    return normalize_groups(rows) if normalize else rows
+
+async def prorate_emissions_async(
+    db: AsyncSession,
+    group_by: Sequence[AggregateDimension],
+    bucket: TimeBucket = TimeBucket.MONTH,
+    normalize: bool = False,
+    **filters
+) -> List[Dict[str, Any]]:
+    """
+    Total emissions per group with each statement split across the time buckets its period covers.
+    """
+    result = await db.execute(prorated_statement(group_by, **filters))
+    return prorate_groups(result.all(), group_by, bucket, normalize, filters.get("start"), filters.get("end"))
@@ -0,0 +1,263 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import os
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import EmissionStatement as DBEmissionStatement
+from app.models.emission_aggregate import AggregateDimension, TimeBucket
+from app.services.prorating import bucket_index, bucket_start, to_datetime64
+from app.services.units import unit_registry
+
+# Off by default: every API worker keeps its own copy, so enable it where memory allows
+EMISSION_CACHE_ENABLED = os.getenv("EMISSION_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+EMISSION_CACHE_MAX_BYTES = int(os.getenv("EMISSION_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Writes in other processes are not seen, so entries are also dropped after this many seconds
+EMISSION_CACHE_TTL_SECONDS = float(os.getenv("EMISSION_CACHE_TTL_SECONDS", "300"))
+# With a lagging read replica, entries built this soon after a write may miss it and are not kept
+EMISSION_CACHE_SETTLE_SECONDS = float(os.getenv("EMISSION_CACHE_SETTLE_SECONDS", "0"))
+
+_COLUMNS = (
+    DBEmissionStatement.facility_id,
+    DBEmissionStatement.emission_activity_id,
+    DBEmissionStatement.unit,
+    DBEmissionStatement.value,
+    DBEmissionStatement.normalized_value,
+    DBEmissionStatement.normalized_unit,
+    DBEmissionStatement.reporting_period_start,
+)
+
+def _encode(values: Sequence[Optional[str]]):
+    """
+    Dictionary-encode a string column: returns the distinct values and an int32 code per row.
+    """
+    if len(values) == 0:
+        return [], np.empty(0, dtype=np.int32)
+    distinct, codes = np.unique(np.asarray([value if value is not None else "" for value in values], dtype=object), return_inverse=True)
+    return [value if value != "" else None for value in distinct.tolist()], codes.astype(np.int32)
+
+class OrganizationColumns:
+    """
+    The emission statements of one organization as parallel NumPy arrays.
+
+    String columns are dictionary-encoded; ``normalized_value`` and
+    ``normalized_unit`` fall back to the raw value and unit where the unit is
+    not known, like ``coalesce`` in the SQL aggregation.
+    """
+    def __init__(self, organization_id: str, rows: Sequence[Any]):
+        self.organization_id = organization_id
+        facilities, activities, units, values, normalized_values, normalized_units, starts = (
+            (list(column) for column in zip(*rows)) if rows else ([] for _ in range(7))
+        )
+        self.value = np.asarray(values, dtype=float)
+        converted, canonical = unit_registry.convert_many(self.value, units)
+        stored = np.asarray([value if value is not None else np.nan for value in normalized_values], dtype=float)
+        known = np.asarray([unit is not None for unit in canonical.tolist()], dtype=bool)
+        self.normalized_value = np.where(~np.isnan(stored), stored, np.where(known, converted, self.value))
+        normalized_units = [
+            stored_unit or converted_unit or unit
+            for stored_unit, converted_unit, unit in zip(normalized_units, canonical.tolist(), units)
+        ]
+
+        self.facilities, self.facility = _encode(facilities)
+        self.activities, self.activity = _encode(activities)
+        self.units, self.unit = _encode(units)
+        self.normalized_units, self.normalized_unit = _encode(normalized_units)
+        self.period_start = np.asarray(starts, dtype="datetime64[s]")
+
+        # Arrays plus a rough per-string overhead for the dictionaries
+        arrays = (self.value, self.normalized_value, self.facility, self.activity, self.unit, self.normalized_unit, self.period_start)
+        labels = self.facilities + self.activities + self.units + self.normalized_units
+        self.nbytes = sum(array.nbytes for array in arrays) + sum(len(label or "") + 50 for label in labels)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def _mask(self, facility_id, emission_activity_id, unit, start, end) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        for labels, codes, wanted in (
+            (self.facilities, self.facility, facility_id),
+            (self.activities, self.activity, emission_activity_id),
+            (self.units, self.unit, unit),
+        ):
+            if wanted is not None:
+                mask &= codes == (labels.index(wanted) if wanted in labels else -1)
+        if start is not None:
+            mask &= self.period_start >= to_datetime64(start)
+        if end is not None:
+            mask &= self.period_start < to_datetime64(end)
+        return mask
+
+    def aggregate(
+        self,
+        group_by: Sequence[AggregateDimension],
+        bucket: TimeBucket = TimeBucket.MONTH,
+        normalize: bool = False,
+        facility_id: Optional[str] = None,
+        emission_activity_id: Optional[str] = None,
+        unit: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Same rows as ``aggregate_emissions`` for this organization, computed from the arrays.
+        """
+        group_by = {AggregateDimension(dimension) for dimension in group_by}
+        mask = self._mask(facility_id, emission_activity_id, unit, start, end)
+        values = (self.normalized_value if normalize else self.value)[mask]
+        unit_labels, unit_codes = (self.normalized_units, self.normalized_unit) if normalize else (self.units, self.unit)
+
+        # Combine the codes of the grouped dimensions into one integer key per row
+        dimensions = [
+            ("organization_id", AggregateDimension.ORGANIZATION, [self.organization_id], np.zeros(len(self), dtype=np.int32)),
+            ("facility_id", AggregateDimension.FACILITY, self.facilities, self.facility),
+            ("emission_activity_id", AggregateDimension.ACTIVITY, self.activities, self.activity),
+            ("unit", AggregateDimension.UNIT, unit_labels, unit_codes),
+        ]
+        dimensions = [
+            (name, labels, codes[mask]) for name, dimension, labels, codes in dimensions
+            if dimension in group_by or dimension == AggregateDimension.UNIT
+        ]
+        if AggregateDimension.PERIOD in group_by:
+            buckets, codes = np.unique(bucket_index(self.period_start[mask], bucket), return_inverse=True)
+            dimensions.append(("period_start", [start.item() for start in bucket_start(buckets, bucket)], codes))
+
+        keys = np.zeros(len(values), dtype=np.int64)
+        for _, labels, codes in dimensions:
+            keys = keys * max(len(labels), 1) + codes
+        distinct_keys, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse, weights=values, minlength=len(distinct_keys))
+        counts = np.bincount(inverse, minlength=len(distinct_keys))
+
+        rows = []
+        for key, total, count in zip(distinct_keys.tolist(), totals.tolist(), counts.tolist()):
+            row = {}
+            for name, labels, _ in reversed(dimensions):
+                key, code = divmod(key, max(len(labels), 1))
+                row[name] = labels[code]
+            row = {name: row[name] for name, _, _ in dimensions}
+            row["total"] = total
+            row["statement_count"] = count
+            rows.append(row)
+        return sorted(
+            rows,
+            key=lambda row: [(value is None, value) for name, value in row.items() if name not in ("total", "statement_count")]
+        )
+
+class EmissionCache:
+    """
+    In-process LRU cache of ``OrganizationColumns``, bounded by total array size.
+
+    Entries are dropped when the organization's statements are written
+    through the service layer, after ``ttl_seconds``, and least recently used
+    first when the cache would grow beyond ``max_bytes``. An entry built while
+    a write to the same organization was in flight, or within
+    ``settle_seconds`` of one, is not stored.
+    """
+    def __init__(
+        self,
+        max_bytes: int = EMISSION_CACHE_MAX_BYTES,
+        ttl_seconds: float = EMISSION_CACHE_TTL_SECONDS,
+        settle_seconds: float = EMISSION_CACHE_SETTLE_SECONDS,
+        enabled: bool = EMISSION_CACHE_ENABLED
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.settle_seconds = settle_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._invalidated_at: Dict[str, float] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _lookup(self, organization_id: str) -> Optional[OrganizationColumns]:
+        with self._lock:
+            entry = self._entries.get(organization_id)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+                self._entries.move_to_end(organization_id)
+                self._hits += 1
+                return entry[0]
+            if entry is not None:
+                self._drop(organization_id)
+            self._misses += 1
+            return None
+
+    def _version(self, organization_id: str) -> tuple:
+        with self._lock:
+            return self._generation, self._versions.get(organization_id, 0)
+
+    def _store(self, columns: OrganizationColumns, version: tuple) -> None:
+        with self._lock:
+            if (self._generation, self._versions.get(columns.organization_id, 0)) != version or columns.nbytes > self.max_bytes:
+                return
+            if time.monotonic() - self._invalidated_at.get(columns.organization_id, float("-inf")) < self.settle_seconds:
+                return
+            self._drop(columns.organization_id)
+            while self._entries and self._bytes + columns.nbytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self._evictions += 1
+            self._entries[columns.organization_id] = (columns, time.monotonic())
+            self._bytes += columns.nbytes
+
+    def _drop(self, organization_id: str) -> None:
+        entry = self._entries.pop(organization_id, None)
+        if entry is not None:
+            self._bytes -= entry[0].nbytes
+
+    def get(self, db: Session, organization_id: str) -> OrganizationColumns:
+        columns = self._lookup(organization_id)
+        if columns is None:
+            version = self._version(organization_id)
+            rows = db.execute(select(*_COLUMNS).where(DBEmissionStatement.organization_id == organization_id)).all()
+            columns = OrganizationColumns(organization_id, rows)
+            self._store(columns, version)
+        return columns
+
+    async def get_async(self, db: AsyncSession, organization_id: str) -> OrganizationColumns:
+        columns = self._lookup(organization_id)
+        if columns is None:
+            version = self._version(organization_id)
+            result = await db.execute(select(*_COLUMNS).where(DBEmissionStatement.organization_id == organization_id))
+            columns = OrganizationColumns(organization_id, result.all())
+            self._store(columns, version)
+        return columns
+
+    def invalidate(self, organization_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Drop the given organizations, or everything when ``organization_ids`` is None.
+        """
+        with self._lock:
+            if organization_ids is None:
+                self._generation += 1
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for organization_id in set(organization_ids):
+                self._versions[organization_id] = self._versions.get(organization_id, 0) + 1
+                self._invalidated_at[organization_id] = time.monotonic()
+                self._drop(organization_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+emission_cache = EmissionCache()
@@ -0,0 +1,149 @@
+from typing import Any, Dict
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import EmissionRollup as DBEmissionRollup, EmissionStatement as DBEmissionStatement
+from app.models.emission_aggregate import AggregateDimension, TimeBucket
+from app.services.emission_aggregation_service import rollup_compatible, statement_filters
+from app.services.organization_service import organization_subtree
+from app.services.units import CANONICAL_EMISSION_UNIT, unit_registry
+
+RANKED_DIMENSIONS = {
+    AggregateDimension.FACILITY: DBEmissionStatement.facility_id,
+    AggregateDimension.ACTIVITY: DBEmissionStatement.emission_activity_id,
+}
+
+def _rollup_source(unit: str, normalize: bool, **filters):
+    """
+    Per-facility values from emission_rollups: (key, value, statement count, unit, WHERE clauses).
+    """
+    value, value_unit = DBEmissionRollup.total, DBEmissionRollup.unit
+    if normalize:
+        # Rollups are kept per recorded unit; convert them with the registry in SQL
+        value = DBEmissionRollup.total * func.coalesce(unit_registry.sql_factor(DBEmissionRollup.unit), 1.0)
+        value_unit = func.coalesce(unit_registry.sql_canonical_unit(DBEmissionRollup.unit), DBEmissionRollup.unit)
+
+    clauses = [value_unit == unit]
+    if filters.get("organization_id") is not None:
+        clauses.append(DBEmissionRollup.organization_id == filters["organization_id"])
+    if filters.get("organization_subtree_of") is not None:
+        subtree = organization_subtree(filters["organization_subtree_of"])
+        clauses.append(DBEmissionRollup.organization_id.in_(select(subtree.c.organization_pk)))
+    if filters.get("facility_id") is not None:
+        clauses.append(DBEmissionRollup.facility_key == filters["facility_id"])
+    if filters.get("start") is not None:
+        clauses.append(DBEmissionRollup.month >= filters["start"])
+    if filters.get("end") is not None:
+        clauses.append(DBEmissionRollup.month < filters["end"])
+    return func.nullif(DBEmissionRollup.facility_key, ""), value, func.sum(DBEmissionRollup.statement_count), clauses
+
+def _statement_source(dimension: AggregateDimension, unit: str, normalize: bool, **filters):
+    """
+    Per-statement values from emission_statements: (key, value, statement count, unit, WHERE clauses).
+    """
+    value, value_unit = DBEmissionStatement.value, DBEmissionStatement.unit
+    if normalize:
+        value = func.coalesce(
+            DBEmissionStatement.normalized_value,
+            DBEmissionStatement.value * func.coalesce(unit_registry.sql_factor(DBEmissionStatement.unit), 1.0)
+        )
+        value_unit = func.coalesce(
+            DBEmissionStatement.normalized_unit,
+            unit_registry.sql_canonical_unit(DBEmissionStatement.unit),
+            DBEmissionStatement.unit
+        )
+    clauses = statement_filters(**filters) + [value_unit == unit]
+    return RANKED_DIMENSIONS[dimension], value, func.count(), clauses
+
+def top_emitters_statement(
+    dimension: AggregateDimension,
+    limit: int = 20,
+    unit: str = CANONICAL_EMISSION_UNIT,
+    normalize: bool = True,
+    use_rollups: bool = True,
+    **filters
+):
+    """
+    The ``limit`` largest groups by total, with the total of all groups and the running total.
+
+    Both totals are window functions over the grouped rows, evaluated before
+    the LIMIT, so shares come out of the same query. Facility rankings that
+    the rollups can answer read emission_rollups, whose size depends on
+    facilities and months rather than on the number of statements; the rest
+    read emission_statements through the (organization_id,
+    reporting_period_start) index, which on PostgreSQL carries the ranked
+    columns so the scan does not visit the table.
+    """
+    dimension = AggregateDimension(dimension)
+    if dimension not in RANKED_DIMENSIONS:
+        raise ValueError(f"Cannot rank by {dimension.value}; use facility or activity")
+    if use_rollups and dimension == AggregateDimension.FACILITY and rollup_compatible([dimension], TimeBucket.MONTH, **filters):
+        key, value, count, clauses = _rollup_source(unit, normalize, **filters)
+    else:
+        key, value, count, clauses = _statement_source(dimension, unit, normalize, **filters)
+
+    total = func.sum(value)
+    return (
+        select(
+            key.label("key"),
+            total.label("total"),
+            count.label("statement_count"),
+            func.sum(total).over().label("grand_total"),
+            func.sum(total).over(order_by=[total.desc(), key], rows=(None, 0)).label("running_total")
+        )
+        .where(and_(*clauses))
+        .group_by(key)
+        .order_by(total.desc(), key)
+        .limit(limit)
+    )
+
+def build_top_emitters(rows, dimension: AggregateDimension, unit: str, cumulative_share: bool = True) -> Dict[str, Any]:
+    """
+    Shape the ranked rows, with each group's share of the total of all groups.
+    """
+    grand_total = rows[0].grand_total if rows else 0.0
+    groups = []
+    for row in rows:
+        share = row.total / grand_total if grand_total else None
+        groups.append({
+            "key": row.key,
+            "total": row.total,
+            "statement_count": row.statement_count,
+            "share": share,
+            "cumulative_share": (row.running_total / grand_total if grand_total else None) if cumulative_share else None,
+        })
+    return {"dimension": AggregateDimension(dimension).value, "unit": unit, "total": grand_total, "groups": groups}
+
+def get_top_emitters(
+    db: Session,
+    dimension: AggregateDimension,
+    limit: int = 20,
+    unit: str = CANONICAL_EMISSION_UNIT,
+    normalize: bool = True,
+    cumulative_share: bool = True,
+    **filters
+) -> Dict[str, Any]:
+    """
+    The facilities or activities with the largest emissions in ``unit``, largest first.
+    """
+    statement = top_emitters_statement(dimension, limit, unit, normalize, **filters)
+    return build_top_emitters(db.execute(statement).all(), dimension, unit, cumulative_share)
+
+# Async version used by the API routers
+async def get_top_emitters_async(
+    db: AsyncSession,
+    dimension: AggregateDimension,
+    limit: int = 20,
+    unit: str = CANONICAL_EMISSION_UNIT,
+    normalize: bool = True,
+    cumulative_share: bool = True,
+    **filters
+) -> Dict[str, Any]:
+    """
+    The facilities or activities with the largest emissions in ``unit``, largest first.
+    """
+    statement = top_emitters_statement(dimension, limit, unit, normalize, **filters)
+    result = await db.execute(statement)
+    return build_top_emitters(result.all(), dimension, unit, cumulative_share)
@@ -1,15 +1,107 @@
+from sqlalchemy import String, cast, func, literal_column, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from app.db.models import EmissionReport as DBEmissionReport
+from app.db.models import EmissionReport as DBEmissionReport, EmissionStatement as DBEmissionStatement, emission_report_statements
 from app.models.emission_report import EmissionReportCreate, EmissionReport
+from app.services.emission_aggregation_service import normalize_groups
+from app.services.pagination import apply_keyset
+
+SUMMARY_SECTIONS = {"total": "totals", "facility": "by_facility", "activity": "by_activity", "unit": "by_unit"}
+
+def _to_db_emission_report(emission_report: EmissionReportCreate) -> DBEmissionReport:
+    return DBEmissionReport(
+        emission_report_pk=emission_report.emission_report_pk,
+        description=emission_report.description,
+        report_period_start=emission_report.report_period_start,
+        report_period_end=emission_report.report_period_end,
+        organization_id=emission_report.organization_id,
+        report_type=emission_report.report_type,
+        status=emission_report.status
+    )
+
+def report_summary_statement(emission_report_pk: str, normalize: bool = True):
+    """
+    One query for all sections of a report summary.
+
+    The report's statements are joined once in a CTE and aggregated per
+    section, and the sections are combined with UNION ALL; each result row is
+    tagged with its section in ``dimension``.
+    """
+    value, unit = DBEmissionStatement.value, DBEmissionStatement.unit
+    if normalize:
+        value = func.coalesce(DBEmissionStatement.normalized_value, DBEmissionStatement.value)
+        unit = func.coalesce(DBEmissionStatement.normalized_unit, DBEmissionStatement.unit)
+    rows = (
+        select(
+            DBEmissionStatement.facility_id,
+            DBEmissionStatement.emission_activity_id,
+            value.label("value"),
+            unit.label("unit"),
+            DBEmissionStatement.value.label("recorded_value"),
+            DBEmissionStatement.unit.label("recorded_unit")
+        )
+        .join(emission_report_statements, emission_report_statements.c.emission_statement_id == DBEmissionStatement.emission_statement_pk)
+        .where(emission_report_statements.c.emission_report_id == emission_report_pk)
+        .cte("report_statements")
+    )
+
+    def section(dimension: str, key, unit, value):
+        # Constants are inlined: bound parameters in a UNION select list have no type on PostgreSQL
+        return (
+            select(
+                literal_column(f"'{dimension}'").label("dimension"),
+                key.label("key"),
+                unit.label("unit"),
+                func.sum(value).label("total"),
+                func.count().label("statement_count")
+            )
+            .select_from(rows)
+            .group_by(key, unit)
+        )
+
+    return union_all(
+        section("total", cast(null(), String), rows.c.unit, rows.c.value),
+        section("facility", rows.c.facility_id, rows.c.unit, rows.c.value),
+        section("activity", rows.c.emission_activity_id, rows.c.unit, rows.c.value),
+        section("unit", rows.c.recorded_unit, rows.c.recorded_unit, rows.c.recorded_value),
+    )
+
+def build_report_summary(emission_report_pk: str, rows: Sequence[Any], normalize: bool = False) -> Dict[str, Any]:
+    """
+    Shape the summary rows into sections.
+
+    With ``normalize``, groups still in a known non-canonical unit (stored
+    without a normalized value, e.g. not yet backfilled) are converted with
+    the unit registry and merged, as in the aggregation endpoint. The
+    by-unit section always keeps the recorded units.
+    """
+    groups = [
+        {"dimension": row.dimension, "key": row.key, "unit": row.unit, "total": row.total, "statement_count": row.statement_count}
+        for row in rows
+    ]
+    if normalize:
+        by_unit = [group for group in groups if group["dimension"] == "unit"]
+        groups = normalize_groups([group for group in groups if group["dimension"] != "unit"]) + by_unit
+
+    summary = {"emission_report_pk": emission_report_pk, "statement_count": 0}
+    summary.update({name: [] for name in SUMMARY_SECTIONS.values()})
+    for group in groups:
+        dimension = group.pop("dimension")
+        summary[SUMMARY_SECTIONS[dimension]].append(group)
+        if dimension == "unit":
+            summary["statement_count"] += group["statement_count"]
+    for name in SUMMARY_SECTIONS.values():
+        summary[name].sort(key=lambda group: (group["key"] is None, group["key"] or "", group["unit"]))
+    return summary
 
 class EmissionReportService:
-    def get_emission_reports(self, db: Session, skip: int = 0, limit: int = 100) -> List[DBEmissionReport]:
+    def get_emission_reports(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBEmissionReport]:
         """
         Retrieve a list of emission reports from the database.
         """
-        return db.query(DBEmissionReport).offset(skip).limit(limit).all()
+        return apply_keyset(db.query(DBEmissionReport), DBEmissionReport.emission_report_pk, skip, limit, cursor).all()
 
     def get_emission_report(self, db: Session, emission_report_pk: str) -> Optional[DBEmissionReport]:
         """
@@ -21,26 +113,25 @@ class EmissionReportService:
         """
         Create a new emission report in the database.
         """
-        db_emission_report = DBEmissionReport(
-            emission_report_pk=emission_report.emission_report_pk,
-            description=emission_report.description,
-            report_period_start=emission_report.report_period_start,
-            report_period_end=emission_report.report_period_end,
-            organization_id=emission_report.organization_id,
-            report_type=emission_report.report_type,
-            status=emission_report.status
-        )
+        db_emission_report = _to_db_emission_report(emission_report)
         db.add(db_emission_report)
         db.commit()
         db.refresh(db_emission_report)
         return db_emission_report
 
+    def get_emission_report_summary(self, db: Session, emission_report_pk: str, normalize: bool = True) -> Dict[str, Any]:
+        """
+        Totals of the statements linked to a report, by facility, activity and unit, in one query.
+        """
+        rows = db.execute(report_summary_statement(emission_report_pk, normalize)).all()
+        return build_report_summary(emission_report_pk, rows, normalize)
+
 # For backward compatibility, keep the function versions
-def get_emission_reports(db: Session, skip: int = 0, limit: int = 100) -> List[DBEmissionReport]:
+def get_emission_reports(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBEmissionReport]:
     """
     Retrieve a list of emission reports from the database.
     """
-    return EmissionReportService().get_emission_reports(db, skip, limit)
+    return EmissionReportService().get_emission_reports(db, skip, limit, cursor)
 
 def get_emission_report(db: Session, emission_report_pk: str) -> Optional[DBEmissionReport]:
     """
@@ -53,3 +144,40 @@ def create_emission_report(db: Session, emission_report: EmissionReportCreate) -
     Create a new emission report in the database.
     """
     return EmissionReportService().create_emission_report(db, emission_report)
+
+def get_emission_report_summary(db: Session, emission_report_pk: str, normalize: bool = True) -> Dict[str, Any]:
+    """
+    Totals of the statements linked to a report, by facility, activity and unit, in one query.
+    """
+    return EmissionReportService().get_emission_report_summary(db, emission_report_pk, normalize)
+
+# Async versions used by the API routers
+async def get_emission_reports_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBEmissionReport]:
+    """
+    Retrieve a list of emission reports from the database.
+    """
+    result = await db.execute(apply_keyset(select(DBEmissionReport), DBEmissionReport.emission_report_pk, skip, limit, cursor))
+    return list(result.scalars().all())
+
+async def get_emission_report_async(db: AsyncSession, emission_report_pk: str) -> Optional[DBEmissionReport]:
+    """
+    Retrieve a specific emission report by its primary key.
+    """
+    return await db.get(DBEmissionReport, emission_report_pk)
+
+async def create_emission_report_async(db: AsyncSession, emission_report: EmissionReportCreate) -> DBEmissionReport:
+    """
+    Create a new emission report in the database.
+    """
+    db_emission_report = _to_db_emission_report(emission_report)
+    db.add(db_emission_report)
+    await db.commit()
+    await db.refresh(db_emission_report)
+    return db_emission_report
+
+async def get_emission_report_summary_async(db: AsyncSession, emission_report_pk: str, normalize: bool = True) -> Dict[str, Any]:
+    """
+    Totals of the statements linked to a report, by facility, activity and unit, in one query.
+    """
+    result = await db.execute(report_summary_statement(emission_report_pk, normalize))
+    return build_report_summary(emission_report_pk, result.all(), normalize)
@@ -0,0 +1,178 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import math
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import EmissionRollup as DBEmissionRollup, EmissionStatement as DBEmissionStatement
+from app.models.emission_aggregate import TimeBucket
+from app.services.emission_aggregation_service import period_bucket
+
+RollupKey = Tuple[str, str, datetime, str]
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+def _as_datetime(value: Any) -> datetime:
+    # SQLite returns bucketed timestamps as text
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+def rollup_deltas(statements: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Sum newly written statements into one increment per rollup key.
+    """
+    deltas: Dict[RollupKey, Dict[str, Any]] = {}
+    for statement in statements:
+        key = (
+            statement["organization_id"],
+            statement.get("facility_id") or "",
+            month_start(statement["reporting_period_start"]),
+            statement["unit"],
+        )
+        delta = deltas.get(key)
+        if delta is None:
+            deltas[key] = delta = {
+                "organization_id": key[0],
+                "facility_key": key[1],
+                "month": key[2],
+                "unit": key[3],
+                "total": 0.0,
+                "statement_count": 0,
+            }
+        delta["total"] += statement["value"]
+        delta["statement_count"] += 1
+    return list(deltas.values())
+
+def rollup_increment_statement(dialect: str, deltas: List[Dict[str, Any]]):
+    """
+    INSERT ... ON CONFLICT DO UPDATE adding the deltas to the existing rollup rows.
+    """
+    table = DBEmissionRollup.__table__
+    statement = _DIALECT_INSERTS[dialect](table).values(deltas)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.organization_id, table.c.facility_key, table.c.month, table.c.unit],
+        set_={
+            "total": table.c.total + statement.excluded.total,
+            "statement_count": table.c.statement_count + statement.excluded.statement_count,
+            "updated_at": func.now(),
+        }
+    )
+
+def apply_rollup_deltas(db: Session, statements: Iterable[Dict[str, Any]]) -> None:
+    """
+    Add newly written statements to the rollups in the caller's transaction.
+    """
+    deltas = rollup_deltas(statements)
+    if deltas:
+        db.execute(rollup_increment_statement(db.get_bind().dialect.name, deltas))
+
+async def apply_rollup_deltas_async(db: AsyncSession, statements: Iterable[Dict[str, Any]]) -> None:
+    """
+    Add newly written statements to the rollups in the caller's transaction.
+    """
+    deltas = rollup_deltas(statements)
+    if deltas:
+        await db.execute(rollup_increment_statement(db.get_bind().dialect.name, deltas))
+
+def _expected_rollups(db: Session, organization_id: Optional[str]) -> Dict[RollupKey, Tuple[float, int]]:
+    facility_key = func.coalesce(DBEmissionStatement.facility_id, "")
+    month = period_bucket(db.get_bind().dialect.name, TimeBucket.MONTH)
+    statement = (
+        select(
+            DBEmissionStatement.organization_id,
+            facility_key,
+            month,
+            DBEmissionStatement.unit,
+            func.sum(DBEmissionStatement.value),
+            func.count()
+        )
+        .group_by(DBEmissionStatement.organization_id, facility_key, month, DBEmissionStatement.unit)
+    )
+    if organization_id is not None:
+        statement = statement.where(DBEmissionStatement.organization_id == organization_id)
+    return {
+        (org, facility, _as_datetime(bucket), unit): (total, count)
+        for org, facility, bucket, unit, total, count in db.execute(statement)
+    }
+
+def _stored_rollups(db: Session, organization_id: Optional[str]) -> Dict[RollupKey, Tuple[float, int]]:
+    statement = select(
+        DBEmissionRollup.organization_id,
+        DBEmissionRollup.facility_key,
+        DBEmissionRollup.month,
+        DBEmissionRollup.unit,
+        DBEmissionRollup.total,
+        DBEmissionRollup.statement_count
+    )
+    if organization_id is not None:
+        statement = statement.where(DBEmissionRollup.organization_id == organization_id)
+    return {
+        (org, facility, month, unit): (total, count)
+        for org, facility, month, unit, total, count in db.execute(statement)
+    }
+
+def reconcile_emission_rollups(db: Session, organization_id: Optional[str] = None) -> Dict[str, int]:
+    """
+    Compare the rollups with totals recomputed from emission_statements and repair any drift.
+
+    Drift comes from writes that bypass the service layer (manual SQL, restores,
+    deletes). Missing and stale rows are overwritten with the recomputed totals
+    and rows with no statements left are deleted, in one transaction. Limit the
+    check to one organization with ``organization_id``.
+    """
+    expected = _expected_rollups(db, organization_id)
+    stored = _stored_rollups(db, organization_id)
+
+    missing = [key for key in expected if key not in stored]
+    stale = [
+        key for key, (total, count) in expected.items()
+        if key in stored and (stored[key][1] != count or not math.isclose(stored[key][0], total, rel_tol=1e-9, abs_tol=1e-9))
+    ]
+    extra = [key for key in stored if key not in expected]
+
+    repairs = [
+        {
+            "organization_id": key[0],
+            "facility_key": key[1],
+            "month": key[2],
+            "unit": key[3],
+            "total": expected[key][0],
+            "statement_count": expected[key][1],
+        }
+        for key in missing + stale
+    ]
+    if repairs:
+        table = DBEmissionRollup.__table__
+        statement = _DIALECT_INSERTS[db.get_bind().dialect.name](table)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.organization_id, table.c.facility_key, table.c.month, table.c.unit],
+            set_={
+                "total": statement.excluded.total,
+                "statement_count": statement.excluded.statement_count,
+                "updated_at": func.now(),
+            }
+        ), repairs)
+    if extra:
+        db.execute(delete(DBEmissionRollup).where(
+            tuple_(
+                DBEmissionRollup.organization_id,
+                DBEmissionRollup.facility_key,
+                DBEmissionRollup.month,
+                DBEmissionRollup.unit
+            ).in_(extra)
+        ))
+    db.commit()
+    return {
+        "checked": len(expected),
+        "missing": len(missing),
+        "stale": len(stale),
+        "extra": len(extra),
+    }
@@ -1,14 +1,54 @@
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
+import os
+
+import numpy as np
 
 from app.db.models import EmissionStatement as DBEmissionStatement
-from app.models.emission_statement import EmissionStatement
+from app.models.bulk import BulkInsertResult, BulkRowError
+from app.models.emission_statement import EmissionStatementCreate
+from app.services.emission_cache import emission_cache
+from app.services.emission_rollup_service import apply_rollup_deltas, apply_rollup_deltas_async
+from app.services.pagination import apply_keyset
+from app.services.units import unit_registry
+
+BULK_CHUNK_SIZE = 1000
+NORMALIZE_BATCH_SIZE = 10000
+
+# Store the value in the canonical unit next to the original at ingest
+STORE_NORMALIZED_VALUES = os.getenv("STORE_NORMALIZED_VALUES", "true").lower() in ("1", "true", "yes", "on")
+
+def _to_db_emission_statement(emission_statement: EmissionStatementCreate) -> DBEmissionStatement:
+    values = emission_statement.model_dump()
+    if STORE_NORMALIZED_VALUES:
+        values["normalized_value"], values["normalized_unit"] = unit_registry.convert(values["value"], values["unit"])
+    return DBEmissionStatement(**values)
+
+def add_normalized_values(rows: List[Dict[str, Any]]) -> None:
+    """
+    Set normalized_value and normalized_unit on a batch of statement dicts in place.
 
-def get_emission_statements(db: Session, skip: int = 0, limit: int = 100) -> List[DBEmissionStatement]:
+    The conversion runs once over the whole batch; rows with an unknown unit get None.
+    """
+    if not rows:
+        return
+    normalized, canonical = unit_registry.convert_many(
+        [row["value"] for row in rows], [row["unit"] for row in rows]
+    )
+    known = ~np.isnan(normalized)
+    for row, value, unit, is_known in zip(rows, normalized.tolist(), canonical.tolist(), known.tolist()):
+        row["normalized_value"] = value if is_known else None
+        row["normalized_unit"] = unit if is_known else None
+
+def get_emission_statements(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBEmissionStatement]:
     """
     Retrieve a list of emission statements from the database.
     """
-    return db.query(DBEmissionStatement).offset(skip).limit(limit).all()
+    return apply_keyset(db.query(DBEmissionStatement), DBEmissionStatement.emission_statement_pk, skip, limit, cursor).all()
 
 def get_emission_statement(db: Session, emission_statement_pk: str) -> Optional[DBEmissionStatement]:
     """
@@ -16,16 +56,157 @@ def get_emission_statement(db: Session, emission_statement_pk: str) -> Optional[
     """
     return db.query(DBEmissionStatement).filter(DBEmissionStatement.emission_statement_pk == emission_statement_pk).first()
 
-def create_emission_statement(db: Session, emission_statement: EmissionStatement) -> DBEmissionStatement:
+def create_emission_statement(db: Session, emission_statement: EmissionStatementCreate) -> DBEmissionStatement:
     """
     Create a new emission statement in the database.
     """
-    db_emission_statement = DBEmissionStatement(
-        emission_statement_pk=emission_statement.emission_statement_pk,
-        emission_activity_id=emission_statement.emission_activity_id,
-        emission_calculation_model_id=emission_statement.emission_calculation_model_id
-    )
+    db_emission_statement = _to_db_emission_statement(emission_statement)
     db.add(db_emission_statement)
+    apply_rollup_deltas(db, [emission_statement.model_dump()])
     db.commit()
+    emission_cache.invalidate([emission_statement.organization_id])
     db.refresh(db_emission_statement)
     return db_emission_statement
+
+def validate_emission_statements(rows: List[Dict[str, Any]], offset: int = 0):
+    """
+    Validate raw rows against EmissionStatementCreate.
+
+    Returns the valid rows as column dicts, each paired with its position
+    (counted from ``offset``), and one error per invalid row. A primary key that
+    appears more than once is accepted the first time only.
+    """
+    valid = []
+    errors = []
+    seen = set()
+    for index, row in enumerate(rows, start=offset):
+        key = row.get("emission_statement_pk") if isinstance(row, dict) else None
+        try:
+            statement = EmissionStatementCreate.model_validate(row)
+        except ValidationError as exc:
+            errors.append(BulkRowError.from_validation_error(index, key, exc))
+            continue
+        if statement.emission_statement_pk in seen:
+            errors.append(BulkRowError(index=index, key=key, message="Duplicate emission_statement_pk in request"))
+            continue
+        seen.add(statement.emission_statement_pk)
+        valid.append((index, statement.model_dump()))
+    return valid, errors
+
+def _insert_chunk(db: Session, chunk) -> List[BulkRowError]:
+    """
+    Insert one chunk of validated rows, add them to the rollups and commit.
+
+    The chunk goes in as a single multi-row INSERT inside a savepoint. If the
+    database rejects it (an existing key, an unknown organization or facility),
+    the savepoint is rolled back and the rows are retried one at a time so only
+    the offending rows are reported.
+    """
+    errors = []
+    inserted = [values for _, values in chunk]
+    if STORE_NORMALIZED_VALUES:
+        add_normalized_values([values for _, values in chunk])
+    try:
+        with db.begin_nested():
+            db.execute(insert(DBEmissionStatement), [values for _, values in chunk])
+    except (IntegrityError, DataError):
+        inserted = []
+        for index, values in chunk:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(DBEmissionStatement), [values])
+                inserted.append(values)
+            except (IntegrityError, DataError) as exc:
+                errors.append(BulkRowError(
+                    index=index,
+                    key=values["emission_statement_pk"],
+                    message=str(exc.orig).strip()
+                ))
+    apply_rollup_deltas(db, inserted)
+    db.commit()
+    emission_cache.invalidate(values["organization_id"] for values in inserted)
+    return errors
+
+def bulk_create_emission_statements(db: Session, rows: List[Dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE, offset: int = 0) -> BulkInsertResult:
+    """
+    Validate and insert many emission statements.
+
+    Rows are written in chunks of ``chunk_size``, one transaction per chunk.
+    Invalid rows are reported in the result and never abort the rest of the
+    batch; a chunk that has been committed stays committed.
+    """
+    valid, errors = validate_emission_statements(rows, offset=offset)
+    for start in range(0, len(valid), chunk_size):
+        errors.extend(_insert_chunk(db, valid[start:start + chunk_size]))
+    errors.sort(key=lambda error: error.index)
+    return BulkInsertResult(
+        received=len(rows),
+        inserted=len(rows) - len(errors),
+        failed=len(errors),
+        errors=errors
+    )
+
+def backfill_normalized_values(db: Session, batch_size: int = NORMALIZE_BATCH_SIZE) -> int:
+    """
+    Fill in normalized values for statements stored without one, for example
+    after a unit has been added to the registry. Returns the number of rows updated.
+
+    Statements are read in primary key order, converted a batch at a time and
+    written back with one executemany UPDATE per batch.
+    """
+    updated = 0
+    last_key = None
+    while True:
+        statement = (
+            select(DBEmissionStatement.emission_statement_pk, DBEmissionStatement.value, DBEmissionStatement.unit)
+            .where(DBEmissionStatement.normalized_value.is_(None))
+            .order_by(DBEmissionStatement.emission_statement_pk)
+            .limit(batch_size)
+        )
+        if last_key is not None:
+            statement = statement.where(DBEmissionStatement.emission_statement_pk > last_key)
+        rows = [dict(row._mapping) for row in db.execute(statement)]
+        if not rows:
+            if updated:
+                emission_cache.invalidate()
+            return updated
+        last_key = rows[-1]["emission_statement_pk"]
+        add_normalized_values(rows)
+        changes = [
+            {
+                "emission_statement_pk": row["emission_statement_pk"],
+                "normalized_value": row["normalized_value"],
+                "normalized_unit": row["normalized_unit"],
+            }
+            for row in rows if row["normalized_value"] is not None
+        ]
+        if changes:
+            db.execute(update(DBEmissionStatement), changes)
+            db.commit()
+            updated += len(changes)
+
+# Async versions used by the API routers
+async def get_emission_statements_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBEmissionStatement]:
+    """
+    Retrieve a list of emission statements from the database.
+    """
+    result = await db.execute(apply_keyset(select(DBEmissionStatement), DBEmissionStatement.emission_statement_pk, skip, limit, cursor))
+    return list(result.scalars().all())
+
+async def get_emission_statement_async(db: AsyncSession, emission_statement_pk: str) -> Optional[DBEmissionStatement]:
+    """
+    Retrieve a specific emission statement by its primary key.
+    """
+    return await db.get(DBEmissionStatement, emission_statement_pk)
+
+async def create_emission_statement_async(db: AsyncSession, emission_statement: EmissionStatementCreate) -> DBEmissionStatement:
+    """
+    Create a new emission statement in the database.
+    """
+    db_emission_statement = _to_db_emission_statement(emission_statement)
+    db.add(db_emission_statement)
+    await apply_rollup_deltas_async(db, [emission_statement.model_dump()])
+    await db.commit()
+    emission_cache.invalidate([emission_statement.organization_id])
+    await db.refresh(db_emission_statement)
+    return db_emission_statement
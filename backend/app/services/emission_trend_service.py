@@ -0,0 +1,174 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+import os
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.emission_aggregate import AggregateDimension, TimeBucket, TrendComparison
+from app.services.emission_aggregation_service import aggregate_emissions, aggregate_emissions_async, prorate_emissions, prorate_emissions_async
+from app.services.prorating import SECOND, bucket_index, bucket_start, to_datetime64
+
+SERIES_DIMENSIONS = {
+    AggregateDimension.ORGANIZATION: "organization_id",
+    AggregateDimension.FACILITY: "facility_id",
+    AggregateDimension.ACTIVITY: "emission_activity_id",
+}
+
+# Most buckets one series may span; every series of a response has them all
+MAX_TREND_BUCKETS = int(os.getenv("MAX_TREND_BUCKETS", "1000"))
+
+# Buckets between a bucket and the same bucket a year earlier
+YEAR_LAGS = {
+    TimeBucket.MONTH: 12,
+    TimeBucket.QUARTER: 4,
+    TimeBucket.YEAR: 1,
+}
+
+def _series_group_by(group_by: Sequence[AggregateDimension]) -> List[AggregateDimension]:
+    dimensions = {AggregateDimension(dimension) for dimension in group_by}
+    return [dimension for dimension in SERIES_DIMENSIONS if dimension in dimensions] + [AggregateDimension.PERIOD]
+
+def comparison_lag(bucket: TimeBucket, compare: TrendComparison) -> int:
+    """
+    How many buckets back each bucket is compared with.
+    """
+    if TrendComparison(compare) == TrendComparison.PREVIOUS:
+        return 1
+    if TimeBucket(bucket) not in YEAR_LAGS:
+        raise ValueError("Year-over-year comparison needs month, quarter or year buckets")
+    return YEAR_LAGS[TimeBucket(bucket)]
+
+class TooManyBucketsError(ValueError):
+    """
+    Raised when a series would span more than MAX_TREND_BUCKETS buckets.
+    """
+    def __init__(self, bucket: TimeBucket, count: int):
+        super().__init__(
+            f"The series would span {count} {TimeBucket(bucket).value} buckets; "
+            f"at most {MAX_TREND_BUCKETS} are allowed, use larger buckets or a shorter range"
+        )
+
+def _check_bucket_count(bucket: TimeBucket, count: int) -> None:
+    if count > MAX_TREND_BUCKETS:
+        raise TooManyBucketsError(bucket, count)
+
+def check_window(bucket: TimeBucket, start: Optional[datetime] = None, end: Optional[datetime] = None) -> None:
+    """
+    Raise TooManyBucketsError if ``start`` to ``end`` spans more than MAX_TREND_BUCKETS buckets.
+    """
+    if start is not None and end is not None:
+        first = bucket_index(to_datetime64(start), bucket)
+        last = bucket_index(to_datetime64(end) - SECOND, bucket)
+        _check_bucket_count(bucket, int(last - first + 1))
+
+def build_trends(
+    rows: Sequence[Dict[str, Any]],
+    group_by: Sequence[AggregateDimension],
+    bucket: TimeBucket = TimeBucket.YEAR,
+    compare: TrendComparison = TrendComparison.PREVIOUS,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Turn aggregated rows grouped by period into one series per group with period-over-period changes.
+
+    The rows are scattered into a (series x bucket) matrix, with zeros for
+    buckets without statements, and the changes come from comparing the
+    matrix with a copy shifted by the comparison lag. The buckets run from
+    ``start`` to ``end`` when given, otherwise from the first to the last
+    bucket with data; more than MAX_TREND_BUCKETS raise TooManyBucketsError.
+    """
+    lag = comparison_lag(bucket, compare)
+    if not rows:
+        return []
+    names = [SERIES_DIMENSIONS[dimension] for dimension in _series_group_by(group_by)[:-1]] + ["unit"]
+
+    series: Dict[tuple, int] = {}
+    codes = np.fromiter(
+        (series.setdefault(tuple(row[name] for name in names), len(series)) for row in rows),
+        dtype=np.int64,
+        count=len(rows)
+    )
+    periods = bucket_index(np.asarray([row["period_start"] for row in rows], dtype="datetime64[s]"), bucket)
+    first = bucket_index(to_datetime64(start), bucket) if start is not None else periods.min()
+    last = bucket_index(to_datetime64(end) - SECOND, bucket) if end is not None else periods.max()
+    _check_bucket_count(bucket, int(last - first + 1))
+    columns = np.arange(first, last + 1)
+    inside = (periods >= first) & (periods <= last)
+
+    totals = np.zeros((len(series), len(columns)))
+    counts = np.zeros((len(series), len(columns)), dtype=np.int64)
+    np.add.at(totals, (codes[inside], periods[inside] - first), [row["total"] for row, keep in zip(rows, inside) if keep])
+    np.add.at(counts, (codes[inside], periods[inside] - first), [row["statement_count"] for row, keep in zip(rows, inside) if keep])
+
+    compared = np.full(totals.shape, np.nan)
+    compared[:, lag:] = totals[:, :-lag]
+    change = totals - compared
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_percent = np.where(compared != 0, change / np.abs(compared) * 100.0, np.nan)
+
+    period_starts = [value.item() for value in bucket_start(columns, bucket)]
+    nullable = lambda matrix: np.where(np.isnan(matrix), None, matrix).tolist()
+    change, change_percent = nullable(change), nullable(change_percent)
+    totals, counts = totals.tolist(), counts.tolist()
+
+    result = []
+    for key, index in series.items():
+        item = dict(zip(names, key))
+        item["points"] = [
+            {
+                "period_start": period_start,
+                "total": totals[index][column],
+                "statement_count": counts[index][column],
+                "change": change[index][column],
+                "change_percent": change_percent[index][column],
+            }
+            for column, period_start in enumerate(period_starts)
+        ]
+        result.append(item)
+    return sorted(result, key=lambda item: [(item[name] is None, item[name]) for name in names])
+
+def get_emission_trends(
+    db: Session,
+    group_by: Sequence[AggregateDimension],
+    bucket: TimeBucket = TimeBucket.YEAR,
+    compare: TrendComparison = TrendComparison.PREVIOUS,
+    normalize: bool = True,
+    prorate: bool = False,
+    **filters
+) -> List[Dict[str, Any]]:
+    """
+    Series of emission totals per group over time with period-over-period changes.
+
+    The totals come from a single aggregation (served by the rollups or the
+    period indexes where possible) and the comparison is one pass over them.
+    """
+    comparison_lag(bucket, compare)
+    check_window(bucket, filters.get("start"), filters.get("end"))
+    aggregate = prorate_emissions if prorate else aggregate_emissions
+    rows = aggregate(db, _series_group_by(group_by), bucket, normalize, **filters)
+    return build_trends(rows, group_by, bucket, compare, filters.get("start"), filters.get("end"))
+
+# Async version used by the API routers
+async def get_emission_trends_async(
+    db: AsyncSession,
+    group_by: Sequence[AggregateDimension],
+    bucket: TimeBucket = TimeBucket.YEAR,
+    compare: TrendComparison = TrendComparison.PREVIOUS,
+    normalize: bool = True,
+    prorate: bool = False,
+    **filters
+) -> List[Dict[str, Any]]:
+    """
+    Series of emission totals per group over time with period-over-period changes.
+
+    The totals come from a single aggregation (served by the rollups or the
+    period indexes where possible) and the comparison is one pass over them.
+    """
+    comparison_lag(bucket, compare)
+    check_window(bucket, filters.get("start"), filters.get("end"))
+    aggregate = prorate_emissions_async if prorate else aggregate_emissions_async
+    rows = await aggregate(db, _series_group_by(group_by), bucket, normalize, **filters)
+    return build_trends(rows, group_by, bucket, compare, filters.get("start"), filters.get("end"))
@@ -1,14 +1,29 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from app.db.models import EnvironmentalProductDeclaration as DBEnvironmentalProductDeclaration
 from app.models.environmental_product_declaration import EnvironmentalProductDeclarationCreate, EnvironmentalProductDeclaration
+from app.models.bulk import BulkUpsertResult
+from app.services.pagination import apply_keyset
+from app.services.upsert import upsert_rows
 
-def get_environmental_product_declarations(db: Session, skip: int = 0, limit: int = 100) -> List[DBEnvironmentalProductDeclaration]:
+def _to_db_environmental_product_declaration(epd: EnvironmentalProductDeclarationCreate) -> DBEnvironmentalProductDeclaration:
+    return DBEnvironmentalProductDeclaration(
+        environmental_product_declaration_pk=epd.environmental_product_declaration_pk,
+        description=epd.description,
+        product_name=epd.product_name,
+        organization_id=epd.organization_id,
+        valid_from=epd.valid_from,
+        valid_to=epd.valid_to
+    )
+
+def get_environmental_product_declarations(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBEnvironmentalProductDeclaration]:
     """
     Retrieve a list of environmental product declarations from the database.
     """
-    return db.query(DBEnvironmentalProductDeclaration).offset(skip).limit(limit).all()
+    return apply_keyset(db.query(DBEnvironmentalProductDeclaration), DBEnvironmentalProductDeclaration.environmental_product_declaration_pk, skip, limit, cursor).all()
 
 def get_environmental_product_declaration(db: Session, environmental_product_declaration_pk: str) -> Optional[DBEnvironmentalProductDeclaration]:
     """
@@ -22,15 +37,38 @@ def create_environmental_product_declaration(db: Session, epd: EnvironmentalProd
     """
     Create a new environmental product declaration in the database.
     """
-    db_epd = DBEnvironmentalProductDeclaration(
-        environmental_product_declaration_pk=epd.environmental_product_declaration_pk,
-        description=epd.description,
-        product_name=epd.product_name,
-        organization_id=epd.organization_id,
-        valid_from=epd.valid_from,
-        valid_to=epd.valid_to
-    )
+    db_epd = _to_db_environmental_product_declaration(epd)
     db.add(db_epd)
     db.commit()
     db.refresh(db_epd)
     return db_epd
+
+def upsert_environmental_product_declarations(db: Session, rows: List[Dict[str, Any]]) -> BulkUpsertResult:
+    """
+    Insert new environmental product declarations and update changed ones, keyed by environmental_product_declaration_pk.
+    """
+    return upsert_rows(db, DBEnvironmentalProductDeclaration, EnvironmentalProductDeclarationCreate, "environmental_product_declaration_pk", rows)
+
+# Async versions used by the API routers
+async def get_environmental_product_declarations_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBEnvironmentalProductDeclaration]:
+    """
+    Retrieve a list of environmental product declarations from the database.
+    """
+    result = await db.execute(apply_keyset(select(DBEnvironmentalProductDeclaration), DBEnvironmentalProductDeclaration.environmental_product_declaration_pk, skip, limit, cursor))
+    return list(result.scalars().all())
+
+async def get_environmental_product_declaration_async(db: AsyncSession, environmental_product_declaration_pk: str) -> Optional[DBEnvironmentalProductDeclaration]:
+    """
+    Retrieve a specific environmental product declaration by its primary key.
+    """
+    return await db.get(DBEnvironmentalProductDeclaration, environmental_product_declaration_pk)
+
+async def create_environmental_product_declaration_async(db: AsyncSession, epd: EnvironmentalProductDeclarationCreate) -> DBEnvironmentalProductDeclaration:
+    """
+    Create a new environmental product declaration in the database.
+    """
+    db_epd = _to_db_environmental_product_declaration(epd)
+    db.add(db_epd)
+    await db.commit()
+    await db.refresh(db_epd)
+    return db_epd
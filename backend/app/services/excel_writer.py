@@ -0,0 +1,292 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from enum import Enum
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+import json
+import os
+import queue
+import tempfile
+import threading
+import weakref
+
+import xlsxwriter
+from fastapi.responses import StreamingResponse
+from sqlalchemy.pool import QueuePool
+
+EXCEL_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Workbooks up to this size stay in memory; larger ones spill to a temporary file
+EXCEL_SPOOL_BYTES = int(os.getenv("EXCEL_EXPORT_SPOOL_BYTES", str(8 * 1024 * 1024)))
+EXCEL_CHUNK_BYTES = 64 * 1024
+# Sheets of one workbook fetched at the same time, each with its own session.
+# Sheet sessions of all workbooks together never take more connections than
+# the pool holds; sheets beyond that wait for a connection in order
+EXCEL_SHEET_WORKERS = int(os.getenv("EXCEL_SHEET_WORKERS", "4"))
+# Rows per fetch from the server-side cursor, and chunks a sheet may fetch ahead of the writer
+EXCEL_EXPORT_CHUNK_ROWS = int(os.getenv("EXCEL_EXPORT_CHUNK_ROWS", "5000"))
+EXCEL_PREFETCH_CHUNKS = int(os.getenv("EXCEL_PREFETCH_CHUNKS", "4"))
+
+HEADER_FORMAT = {
+    'bold': True,
+    'text_wrap': True,
+    'valign': 'top',
+    'fg_color': '#D7E4BC',
+    'border': 1
+}
+COLUMN_WIDTH = 20
+# Rows an xlsx worksheet can hold, header included; longer sheets continue on "<name> (2)", ...
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_SHEET_NAME = 31
+
+Column = Tuple[str, Callable[[Any], Any]]
+
+class ExcelSheet(NamedTuple):
+    """
+    One worksheet: its name, (header, getter) pairs and the items to write, one per row.
+    """
+    name: str
+    columns: Sequence[Column]
+    rows: Iterable[Any]
+
+class SheetSource(NamedTuple):
+    """
+    A worksheet to be fetched: its name, (header, getter) pairs and a query for its items given a session.
+    """
+    name: str
+    columns: Sequence[Column]
+    fetch: Callable[[Any], Iterable[Any]]
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if isinstance(value, (str, int, float, bool, datetime, date)) or value is None:
+        return value
+    return str(value)
+
+def row_chunks(rows: Iterable[Any], size: Optional[int] = None) -> Iterator[Sequence[Any]]:
+    """
+    Split rows into lists of ``size``; SQLAlchemy results are read with ``partitions``.
+    """
+    size = size or EXCEL_EXPORT_CHUNK_ROWS
+    if hasattr(rows, "partitions"):
+        yield from rows.partitions(size)
+        return
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+_DONE = object()
+
+_connection_slots: "weakref.WeakKeyDictionary[Any, threading.BoundedSemaphore]" = weakref.WeakKeyDictionary()
+_connection_slots_lock = threading.Lock()
+
+def _connection_limit(session_factory: Callable[[], Any]) -> Optional[threading.BoundedSemaphore]:
+    """
+    One slot per connection of the session factory's pool, shared by every workbook reading through it.
+
+    None when the pool has no fixed size (in-memory SQLite, unlimited overflow) or the factory is not a sessionmaker.
+    """
+    bind = getattr(session_factory, "kw", {}).get("bind")
+    pool = getattr(bind, "pool", None)
+    if not isinstance(pool, QueuePool) or pool._max_overflow < 0:
+        return None
+    with _connection_slots_lock:
+        slots = _connection_slots.get(bind)
+        if slots is None:
+            slots = _connection_slots[bind] = threading.BoundedSemaphore(max(1, pool.size() + pool._max_overflow))
+        return slots
+
+class _SheetFetch:
+    """
+    Fetches one sheet in a worker thread and hands its rows to the writer in chunks.
+
+    The chunks go through a bounded queue, so a sheet the writer has not
+    reached yet stops fetching after EXCEL_PREFETCH_CHUNKS chunks instead of
+    buffering its whole table. A fetch error is passed on to the writer.
+    """
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        source: SheetSource,
+        stopped: threading.Event,
+        slots: Optional[threading.BoundedSemaphore] = None,
+        previous: Optional["_SheetFetch"] = None
+    ):
+        self.session_factory = session_factory
+        self.source = source
+        self.stopped = stopped
+        self.slots = slots
+        self.previous = previous
+        self.connected = threading.Event()
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=EXCEL_PREFETCH_CHUNKS)
+
+    def _put(self, item: Any) -> bool:
+        # Give up once the writer has stopped, so the thread and its connection are released
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _wait(self, acquire: Callable[[float], bool]) -> bool:
+        while not acquire(0.1):
+            if self.stopped.is_set():
+                return False
+        return True
+
+    def _connect(self) -> bool:
+        # Sheets take their slots in order: a sheet ahead of the writer may
+        # block on its full queue while holding a connection, but the sheet
+        # the writer is on always got its connection before it
+        if self.previous is not None and not self._wait(self.previous.connected.wait):
+            return False
+        return self._wait(lambda timeout: self.slots.acquire(timeout=timeout))
+
+    def run(self) -> None:
+        if self.slots is not None and not self._connect():
+            self.connected.set()
+            return
+        try:
+            self.connected.set()
+            db = self.session_factory()
+            try:
+                for chunk in row_chunks(self.source.fetch(db)):
+                    cells: List[tuple] = [tuple(_cell(getter(item)) for _, getter in self.source.columns) for item in chunk]
+                    if not self._put(cells):
+                        return
+                self._put(_DONE)
+            except Exception as e:
+                self._put(e)
+            finally:
+                db.close()
+        finally:
+            if self.slots is not None:
+                self.slots.release()
+
+    def rows(self) -> Iterator[tuple]:
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield from item
+
+def fetch_sheets(session_factory: Callable[[], Any], sources: Sequence[SheetSource]) -> Iterator[ExcelSheet]:
+    """
+    Fetch and convert the sheets concurrently, yielding each in order for the writer.
+
+    Every sheet is queried and turned into cell values in a thread of its
+    own with a session of its own, so a workbook takes about as long as its
+    slowest sheet rather than the sum of all. Rows arrive in chunks while
+    they are fetched, and the writer starts on the first sheet while the
+    others are still loading. If the caller stops early or a fetch fails,
+    the remaining fetches stop and close their sessions. Sheets wait for a
+    free connection of the session factory's pool rather than time out on it.
+    """
+    stopped = threading.Event()
+    slots = _connection_limit(session_factory)
+    fetches: List[_SheetFetch] = []
+    for source in sources:
+        fetches.append(_SheetFetch(session_factory, source, stopped, slots, fetches[-1] if fetches else None))
+    # A pool per workbook: sheets are consumed in submission order, so a sheet
+    # waiting for a worker never waits behind another workbook's blocked fetches
+    executor = ThreadPoolExecutor(max_workers=max(1, min(len(sources), EXCEL_SHEET_WORKERS)), thread_name_prefix="excel-sheet")
+    try:
+        for fetch in fetches:
+            executor.submit(fetch.run)
+        for fetch in fetches:
+            columns = [(header, itemgetter(index)) for index, (header, _) in enumerate(fetch.source.columns)]
+            yield ExcelSheet(fetch.source.name, columns, fetch.rows())
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _add_worksheet(workbook, name: str, part: int, columns: Sequence[Column], header_format):
+    if part > 1:
+        suffix = f" ({part})"
+        name = name[:EXCEL_MAX_SHEET_NAME - len(suffix)] + suffix
+    worksheet = workbook.add_worksheet(name)
+    worksheet.set_column(0, len(columns) - 1, COLUMN_WIDTH)
+    worksheet.write_row(0, 0, [header for header, _ in columns], header_format)
+    return worksheet
+
+def write_sheets(output, sheets: Iterable[ExcelSheet], on_sheet: Optional[Callable[[int], None]] = None) -> None:
+    """
+    Write the sheets as a workbook to ``output``, a path or a writable binary file.
+
+    The workbook is written in xlsxwriter's constant-memory mode: each row is
+    flushed to the worksheet's temporary file as soon as the next one starts,
+    so the rows are never held as a whole, and the items are read from
+    ``rows`` as they are written. A sheet with more rows than a worksheet
+    holds continues on further worksheets named "<name> (2)", "<name> (3)"
+    and so on, each with the header. ``on_sheet`` is called with the number
+    of sheets written after each one.
+    """
+    workbook = xlsxwriter.Workbook(output, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+        'remove_timezone': True,
+    })
+    header_format = workbook.add_format(HEADER_FORMAT)
+    for done, sheet in enumerate(sheets, start=1):
+        part = 1
+        worksheet = _add_worksheet(workbook, sheet.name, part, sheet.columns, header_format)
+        row_num = 0
+        for item in sheet.rows:
+            row_num += 1
+            if row_num >= EXCEL_MAX_ROWS:
+                part += 1
+                worksheet = _add_worksheet(workbook, sheet.name, part, sheet.columns, header_format)
+                row_num = 1
+            worksheet.write_row(row_num, 0, [_cell(getter(item)) for _, getter in sheet.columns])
+        if on_sheet is not None:
+            on_sheet(done)
+    workbook.close()
+
+def write_workbook(sheets: Iterable[ExcelSheet]) -> tempfile.SpooledTemporaryFile:
+    """
+    Write the sheets into a new per-call buffer and return it, positioned at the start.
+
+    The caller owns the returned buffer.
+    """
+    output = tempfile.SpooledTemporaryFile(max_size=EXCEL_SPOOL_BYTES)
+    try:
+        write_sheets(output, sheets)
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    return output
+
+def iter_buffer(output, chunk_size: int = EXCEL_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Yield the buffer in chunks and close it once it has been read or the client goes away.
+    """
+    try:
+        while True:
+            chunk = output.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        output.close()
+
+def excel_response(output, filename: str) -> StreamingResponse:
+    """
+    Stream a buffer from ``write_workbook`` as a downloadable attachment.
+    """
+    return StreamingResponse(
+        iter_buffer(output),
+        media_type=EXCEL_MEDIA_TYPE,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
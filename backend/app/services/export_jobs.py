@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+from app.models.export_job import ExportJobStatus
+from app.services.bulkhead import Bulkhead, heavy_bulkhead
+
+logger = logging.getLogger(__name__)
+
+# Finished files are kept on local disk, so every API worker only knows its own jobs
+EXPORT_JOB_DIR = os.getenv("EXPORT_JOB_DIR", os.path.join(tempfile.gettempdir(), "openfootprint-exports"))
+# Finished jobs and their files are removed this many seconds after they finish
+EXPORT_JOB_TTL_SECONDS = float(os.getenv("EXPORT_JOB_TTL_SECONDS", "3600"))
+
+# build(path, report_progress) writes the file to path and reports progress from 0 to 1
+ExportBuilder = Callable[[str, Callable[[float], None]], Any]
+
+def _remove(path: str) -> bool:
+    # Another worker sharing the directory may have removed it first
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+class ExportJobEntry:
+    """
+    One background export and the file it produced.
+    """
+    def __init__(self, key: str, export: str, filename: str, directory: str):
+        self.job_id = uuid.uuid4().hex
+        self.key = key
+        self.export = export
+        self.filename = filename
+        self.path = os.path.join(directory, f"{self.job_id}{os.path.splitext(filename)[1]}")
+        self.status = ExportJobStatus.QUEUED
+        self.progress = 0.0
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.expires_at: Optional[datetime] = None
+        self._expires = float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "export": self.export,
+            "status": self.status,
+            "progress": self.progress,
+            "filename": self.filename,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "expires_at": self.expires_at,
+        }
+
+class ExportJobManager:
+    """
+    Runs exports in the background through a bulkhead and keeps their files for a while.
+
+    A request for an export that is already queued or running with the same
+    key attaches to that job instead of starting another. Finished jobs are
+    removed with their files ``ttl_seconds`` after they finish; expired jobs
+    are swept whenever jobs are submitted or looked up, and files left over
+    by an earlier process once they are older than the TTL.
+    """
+    def __init__(self, directory: str, ttl_seconds: float, bulkhead: Bulkhead):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.bulkhead = bulkhead
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, ExportJobEntry] = {}
+        self._in_flight: Dict[str, ExportJobEntry] = {}
+        self._attached = 0
+
+    def submit(self, key: str, export: str, filename: str, build: ExportBuilder) -> ExportJobEntry:
+        """
+        Start an export, or return the queued or running job for the same key.
+
+        Raises BulkheadFullError when the bulkhead cannot take another job.
+        """
+        self.cleanup()
+        with self._lock:
+            job = self._in_flight.get(key)
+            if job is not None:
+                self._attached += 1
+                return job
+            os.makedirs(self.directory, exist_ok=True)
+            job = ExportJobEntry(key, export, filename, self.directory)
+            self.bulkhead.submit(self._run, job, build)
+            self._jobs[job.job_id] = job
+            self._in_flight[key] = job
+        return job
+
+    def _run(self, job: ExportJobEntry, build: ExportBuilder) -> None:
+        job.status = ExportJobStatus.RUNNING
+        partial = f"{job.path}.part"
+
+        def report_progress(progress: float) -> None:
+            job.progress = min(max(progress, 0.0), 1.0)
+
+        try:
+            build(partial, report_progress)
+            os.replace(partial, job.path)
+        except Exception as e:
+            logger.exception("Export job %s (%s) failed", job.job_id, job.export)
+            _remove(partial)
+            self._finish(job, ExportJobStatus.FAILED, error=str(e))
+            return
+        job.progress = 1.0
+        self._finish(job, ExportJobStatus.SUCCEEDED)
+
+    def _finish(self, job: ExportJobEntry, status: ExportJobStatus, error: Optional[str] = None) -> None:
+        with self._lock:
+            job.error = error
+            job.finished_at = datetime.utcnow()
+            job.expires_at = job.finished_at + timedelta(seconds=self.ttl_seconds)
+            job._expires = time.monotonic() + self.ttl_seconds
+            job.status = status
+            if self._in_flight.get(job.key) is job:
+                del self._in_flight[job.key]
+
+    def get(self, job_id: str) -> Optional[ExportJobEntry]:
+        self.cleanup()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cleanup(self) -> int:
+        """
+        Remove expired jobs and their files, and stale files of earlier processes. Returns the number of files removed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [job for job in self._jobs.values() if job._expires <= now]
+            for job in expired:
+                del self._jobs[job.job_id]
+            known = set(self._jobs)
+        removed = sum(_remove(job.path) for job in expired if job.status == ExportJobStatus.SUCCEEDED)
+        if os.path.isdir(self.directory):
+            cutoff = time.time() - self.ttl_seconds
+            for entry in os.scandir(self.directory):
+                # Files are named after their job: <job_id>.xlsx, or <job_id>.xlsx.part while written
+                if entry.is_file() and entry.name.split(".")[0] not in known and entry.stat().st_mtime < cutoff:
+                    removed += _remove(entry.path)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                "jobs": len(statuses),
+                "queued": statuses.count(ExportJobStatus.QUEUED),
+                "running": statuses.count(ExportJobStatus.RUNNING),
+                "succeeded": statuses.count(ExportJobStatus.SUCCEEDED),
+                "failed": statuses.count(ExportJobStatus.FAILED),
+                "attached": self._attached,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+export_jobs = ExportJobManager(EXPORT_JOB_DIR, EXPORT_JOB_TTL_SECONDS, heavy_bulkhead)
@@ -1,15 +1,32 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from app.db.models import Facility as DBFacility
 from app.models.facility import FacilityCreate, Facility
+from app.models.bulk import BulkUpsertResult
+from app.services.pagination import apply_keyset
+from app.services.upsert import upsert_rows
+
+def _to_db_facility(facility: FacilityCreate) -> DBFacility:
+    return DBFacility(
+        facility_pk=facility.facility_pk,
+        name=facility.name,
+        description=facility.description,
+        address=facility.address,
+        city=facility.city,
+        country=facility.country,
+        latitude=facility.latitude,
+        longitude=facility.longitude
+    )
 
 class FacilityService:
-    def get_facilities(self, db: Session, skip: int = 0, limit: int = 100) -> List[DBFacility]:
+    def get_facilities(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBFacility]:
         """
         Retrieve a list of facilities from the database.
         """
-        return db.query(DBFacility).offset(skip).limit(limit).all()
+        return apply_keyset(db.query(DBFacility), DBFacility.facility_pk, skip, limit, cursor).all()
 
     def get_facility(self, db: Session, facility_pk: str) -> Optional[DBFacility]:
         """
@@ -21,27 +38,24 @@ class FacilityService:
         """
         Create a new facility in the database.
         """
-        db_facility = DBFacility(
-            facility_pk=facility.facility_pk,
-            name=facility.name,
-            description=facility.description,
-            address=facility.address,
-            city=facility.city,
-            country=facility.country,
-            latitude=facility.latitude,
-            longitude=facility.longitude
-        )
+        db_facility = _to_db_facility(facility)
         db.add(db_facility)
         db.commit()
         db.refresh(db_facility)
         return db_facility
 
+    def upsert_facilities(self, db: Session, rows: List[Dict[str, Any]]) -> BulkUpsertResult:
+        """
+        Insert new facilities and update changed ones, keyed by facility_pk.
+        """
+        return upsert_rows(db, DBFacility, FacilityCreate, "facility_pk", rows)
+
 # For backward compatibility, keep the function versions
-def get_facilities(db: Session, skip: int = 0, limit: int = 100) -> List[DBFacility]:
+def get_facilities(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBFacility]:
     """
     Retrieve a list of facilities from the database.
     """
-    return FacilityService().get_facilities(db, skip, limit)
+    return FacilityService().get_facilities(db, skip, limit, cursor)
 
 def get_facility(db: Session, facility_pk: str) -> Optional[DBFacility]:
     """
@@ -54,3 +68,33 @@ def create_facility(db: Session, facility: FacilityCreate) -> DBFacility:
     Create a new facility in the database.
     """
     return FacilityService().create_facility(db, facility)
+
+def upsert_facilities(db: Session, rows: List[Dict[str, Any]]) -> BulkUpsertResult:
+    """
+    Insert new facilities and update changed ones, keyed by facility_pk.
+    """
+    return FacilityService().upsert_facilities(db, rows)
+
+# Async versions used by the API routers
+async def get_facilities_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBFacility]:
+    """
+    Retrieve a list of facilities from the database.
+    """
+    result = await db.execute(apply_keyset(select(DBFacility), DBFacility.facility_pk, skip, limit, cursor))
+    return list(result.scalars().all())
+
+async def get_facility_async(db: AsyncSession, facility_pk: str) -> Optional[DBFacility]:
+    """
+    Retrieve a specific facility by its primary key.
+    """
+    return await db.get(DBFacility, facility_pk)
+
+async def create_facility_async(db: AsyncSession, facility: FacilityCreate) -> DBFacility:
+    """
+    Create a new facility in the database.
+    """
+    db_facility = _to_db_facility(facility)
+    db.add(db_facility)
+    await db.commit()
+    await db.refresh(db_facility)
+    return db_facility
@@ -1,15 +1,52 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+from typing import Any, Dict, List, Optional
 
 from app.db.models import Organization as DBOrganization
 from app.models.organization import OrganizationCreate, Organization
+from app.models.bulk import BulkUpsertResult
+from app.services.pagination import apply_keyset
+from app.services.upsert import upsert_rows
+
+def _to_db_organization(organization: OrganizationCreate) -> DBOrganization:
+    return DBOrganization(
+        organization_pk=organization.organization_pk,
+        name=organization.name,
+        description=organization.description,
+        parent_organization_id=organization.parent_organization_id
+    )
+
+def organization_subtree(organization_pk: str):
+    """
+    Recursive CTE of the primary keys of an organization and all its descendants.
+
+    UNION rather than UNION ALL, so a cycle in parent_organization_id cannot
+    make the recursion run forever.
+    """
+    subtree = (
+        select(DBOrganization.organization_pk)
+        .where(DBOrganization.organization_pk == organization_pk)
+        .cte("organization_subtree", recursive=True)
+    )
+    child = aliased(DBOrganization)
+    return subtree.union(
+        select(child.organization_pk).where(child.parent_organization_id == subtree.c.organization_pk)
+    )
+
+def _descendants_query(statement, organization_pk: str):
+    subtree = organization_subtree(organization_pk)
+    return statement.where(
+        DBOrganization.organization_pk.in_(select(subtree.c.organization_pk)),
+        DBOrganization.organization_pk != organization_pk
+    )
 
 class OrganizationService:
-    def get_organizations(self, db: Session, skip: int = 0, limit: int = 100) -> List[DBOrganization]:
+    def get_organizations(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBOrganization]:
         """
         Retrieve a list of organizations from the database.
         """
-        return db.query(DBOrganization).offset(skip).limit(limit).all()
+        return apply_keyset(db.query(DBOrganization), DBOrganization.organization_pk, skip, limit, cursor).all()
 
     def get_organization(self, db: Session, organization_pk: str) -> Optional[DBOrganization]:
         """
@@ -17,27 +54,35 @@ class OrganizationService:
         """
         return db.query(DBOrganization).filter(DBOrganization.organization_pk == organization_pk).first()
 
+    def get_organization_descendants(self, db: Session, organization_pk: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBOrganization]:
+        """
+        Retrieve all direct and indirect subsidiaries of an organization in one query.
+        """
+        query = _descendants_query(db.query(DBOrganization), organization_pk)
+        return apply_keyset(query, DBOrganization.organization_pk, skip, limit, cursor).all()
+
     def create_organization(self, db: Session, organization: OrganizationCreate) -> DBOrganization:
         """
         Create a new organization in the database.
         """
-        db_organization = DBOrganization(
-            organization_pk=organization.organization_pk,
-            name=organization.name,
-            description=organization.description,
-            parent_organization_id=organization.parent_organization_id
-        )
+        db_organization = _to_db_organization(organization)
         db.add(db_organization)
         db.commit()
         db.refresh(db_organization)
         return db_organization
 
+    def upsert_organizations(self, db: Session, rows: List[Dict[str, Any]]) -> BulkUpsertResult:
+        """
+        Insert new organizations and update changed ones, keyed by organization_pk.
+        """
+        return upsert_rows(db, DBOrganization, OrganizationCreate, "organization_pk", rows)
+
 # For backward compatibility, keep the function versions
-def get_organizations(db: Session, skip: int = 0, limit: int = 100) -> List[DBOrganization]:
+def get_organizations(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBOrganization]:
     """
     Retrieve a list of organizations from the database.
     """
-    return OrganizationService().get_organizations(db, skip, limit)
+    return OrganizationService().get_organizations(db, skip, limit, cursor)
 
 def get_organization(db: Session, organization_pk: str) -> Optional[DBOrganization]:
     """
@@ -45,8 +90,52 @@ def get_organization(db: Session, organization_pk: str) -> Optional[DBOrganizati
     """
     return OrganizationService().get_organization(db, organization_pk)
 
+def get_organization_descendants(db: Session, organization_pk: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBOrganization]:
+    """
+    Retrieve all direct and indirect subsidiaries of an organization in one query.
+    """
+    return OrganizationService().get_organization_descendants(db, organization_pk, skip, limit, cursor)
+
 def create_organization(db: Session, organization: OrganizationCreate) -> DBOrganization:
     """
     Create a new organization in the database.
     """
     return OrganizationService().create_organization(db, organization)
+
+def upsert_organizations(db: Session, rows: List[Dict[str, Any]]) -> BulkUpsertResult:
+    """
+    Insert new organizations and update changed ones, keyed by organization_pk.
+    """
+    return OrganizationService().upsert_organizations(db, rows)
+
+# Async versions used by the API routers
+async def get_organizations_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBOrganization]:
+    """
+    Retrieve a list of organizations from the database.
+    """
+    result = await db.execute(apply_keyset(select(DBOrganization), DBOrganization.organization_pk, skip, limit, cursor))
+    return list(result.scalars().all())
+
+async def get_organization_async(db: AsyncSession, organization_pk: str) -> Optional[DBOrganization]:
+    """
+    Retrieve a specific organization by its primary key.
+    """
+    return await db.get(DBOrganization, organization_pk)
+
+async def get_organization_descendants_async(db: AsyncSession, organization_pk: str, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBOrganization]:
+    """
+    Retrieve all direct and indirect subsidiaries of an organization in one query.
+    """
+    statement = _descendants_query(select(DBOrganization), organization_pk)
+    result = await db.execute(apply_keyset(statement, DBOrganization.organization_pk, skip, limit, cursor))
+    return list(result.scalars().all())
+
+async def create_organization_async(db: AsyncSession, organization: OrganizationCreate) -> DBOrganization:
+    """
+    Create a new organization in the database.
+    """
+    db_organization = _to_db_organization(organization)
+    db.add(db_organization)
+    await db.commit()
+    await db.refresh(db_organization)
+    return db_organization
@@ -0,0 +1,65 @@
+from typing import Any, Optional, Sequence
+import base64
+import binascii
+import json
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+    def __init__(self):
+        super().__init__("Invalid pagination cursor")
+
+def encode_cursor(key: Any) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+    """
+    payload = json.dumps({"k": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Any:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    The keys paged on are all strings; a cursor holding anything else is
+    rejected here rather than failing in the database.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key = payload["k"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise InvalidCursorError()
+    if not isinstance(key, str):
+        raise InvalidCursorError()
+    return key
+
+def apply_keyset(statement, key_column, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    """
+    Order a Query or Select by a unique key and start it after the cursor.
+
+    With a cursor the database seeks straight to the next key through the
+    primary key index, so every page costs the same. ``skip`` is still applied
+    afterwards for callers that page by offset.
+    """
+    if cursor is not None:
+        statement = statement.where(key_column > decode_cursor(cursor))
+    return statement.order_by(key_column).offset(skip).limit(limit)
+
+def next_cursor(items: Sequence[Any], key_attr: str, limit: int) -> Optional[str]:
+    """
+    Return the cursor for the page after ``items``, or None if this was the last page.
+    """
+    if limit <= 0 or len(items) < limit:
+        return None
+    return encode_cursor(getattr(items[-1], key_attr))
+
+def set_next_cursor(response, items: Sequence[Any], key_attr: str, limit: int) -> None:
+    """
+    Expose the next-page cursor of a list response in the X-Next-Cursor header.
+    """
+    cursor = next_cursor(items, key_attr, limit)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.emission_aggregate import TimeBucket
+
+SECOND = np.timedelta64(1, "s")
+
+def to_datetime64(value: datetime) -> np.datetime64:
+    # numpy has no time zones; aware values are compared in UTC like the stored timestamps
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "s")
+
+def bucket_index(times: np.ndarray, bucket: TimeBucket) -> np.ndarray:
+    """
+    Ordinal of the calendar bucket containing each timestamp, counted from 1970.
+    """
+    bucket = TimeBucket(bucket)
+    if bucket == TimeBucket.DAY:
+        return times.astype("datetime64[D]").astype(np.int64)
+    if bucket == TimeBucket.MONTH:
+        return times.astype("datetime64[M]").astype(np.int64)
+    if bucket == TimeBucket.QUARTER:
+        return times.astype("datetime64[M]").astype(np.int64) // 3
+    return times.astype("datetime64[Y]").astype(np.int64)
+
+def bucket_start(index: np.ndarray, bucket: TimeBucket) -> np.ndarray:
+    """
+    Start of each bucket ordinal returned by ``bucket_index``.
+    """
+    bucket = TimeBucket(bucket)
+    if bucket == TimeBucket.DAY:
+        return index.astype("datetime64[D]").astype("datetime64[s]")
+    if bucket == TimeBucket.MONTH:
+        return index.astype("datetime64[M]").astype("datetime64[s]")
+    if bucket == TimeBucket.QUARTER:
+        return (index * 3).astype("datetime64[M]").astype("datetime64[s]")
+    return index.astype("datetime64[Y]").astype("datetime64[s]")
+
+def prorate(
+    starts: Sequence[datetime],
+    ends: Sequence[datetime],
+    values: Sequence[float],
+    bucket: TimeBucket,
+    window_start: Optional[datetime] = None,
+    window_end: Optional[datetime] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split values over the calendar buckets their periods overlap, in proportion to time.
+
+    Periods are closed at one-second resolution, so a statement ending at
+    23:59:59 on the last day of a month ends exactly on the month boundary,
+    and a statement with equal start and end falls in a single bucket.
+
+    Returns three parallel arrays with one entry per (statement, bucket)
+    piece: the index of the statement, the start of the bucket and the
+    portion of the value. Only the part of each period inside
+    ``[window_start, window_end)`` is kept; portions stay fractions of the
+    whole period, so a statement half inside the window contributes half its
+    value. The whole batch is expanded and weighted with array operations.
+    """
+    starts = np.asarray(starts, dtype="datetime64[s]")
+    ends = np.asarray(ends, dtype="datetime64[s]")
+    values = np.asarray(values, dtype=float)
+
+    stops = np.maximum(ends, starts) + SECOND
+    durations = (stops - starts).astype(float)
+    lo = starts if window_start is None else np.maximum(starts, to_datetime64(window_start))
+    hi = stops if window_end is None else np.minimum(stops, to_datetime64(window_end))
+
+    keep = np.flatnonzero(lo < hi)
+    lo, hi = lo[keep], hi[keep]
+    first = bucket_index(lo, bucket)
+    counts = bucket_index(hi - SECOND, bucket) - first + 1
+
+    # One piece per bucket each period touches: repeat the statement and step through its buckets
+    rows = np.repeat(keep, counts)
+    steps = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    index = np.repeat(first, counts) + steps
+    starts_of_buckets = bucket_start(index, bucket)
+
+    piece_lo = np.maximum(np.repeat(lo, counts), starts_of_buckets)
+    piece_hi = np.minimum(np.repeat(hi, counts), bucket_start(index + 1, bucket))
+    portions = values[rows] * (piece_hi - piece_lo).astype(float) / durations[rows]
+    return rows, starts_of_buckets, portions
@@ -0,0 +1,179 @@
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+import codecs
+import csv
+import json
+
+from starlette.concurrency import run_in_threadpool
+
+from app.models.bulk import BulkInsertResult, BulkRowError, BulkUploadResult
+
+UPLOAD_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/x-jsonlines": "ndjson",
+}
+
+MAX_REPORTED_ERRORS = 1000
+MAX_RECORD_CHARS = 1024 * 1024
+
+class UploadFormatError(ValueError):
+    """
+    Raised when an upload cannot be parsed any further.
+    """
+
+def upload_format(content_type: Optional[str], requested: Optional[str] = None) -> Optional[str]:
+    """
+    Resolve the upload format from an explicit ``format`` parameter or the Content-Type header.
+    """
+    if requested:
+        return requested.lower() if requested.lower() in ("csv", "ndjson") else None
+    if not content_type:
+        return None
+    return UPLOAD_FORMATS.get(content_type.split(";")[0].strip().lower())
+
+async def iter_lines(chunks: AsyncIterator[bytes], counter: Optional[Dict[str, int]] = None) -> AsyncIterator[str]:
+    """
+    Split a stream of UTF-8 byte chunks into lines, keeping line endings.
+
+    Only the current partial line is held in memory.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        if counter is not None:
+            counter["bytes"] = counter.get("bytes", 0) + len(chunk)
+        try:
+            pending += decoder.decode(chunk)
+        except UnicodeDecodeError as exc:
+            raise UploadFormatError(f"Upload is not valid UTF-8: {exc}")
+        lines = pending.split("\n")
+        pending = lines.pop()
+        if len(pending) > MAX_RECORD_CHARS:
+            raise UploadFormatError(f"Line longer than {MAX_RECORD_CHARS} characters")
+        for line in lines:
+            yield line + "\n"
+    try:
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise UploadFormatError(f"Upload is not valid UTF-8: {exc}")
+    if pending:
+        yield pending
+
+async def parse_csv(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Parse CSV lines into ``(index, row, error)`` tuples.
+
+    The first record is the header. Empty cells become None so optional
+    columns can be left blank. Quoted fields may span lines.
+    """
+    header = None
+    index = 0
+    pending = ""
+    async for line in lines:
+        pending += line
+        # An odd number of quotes means a quoted field continues on the next line
+        if pending.count('"') % 2:
+            if len(pending) > MAX_RECORD_CHARS:
+                raise UploadFormatError(f"Unterminated quoted field at row {index}")
+            continue
+        text, pending = pending, ""
+        if not text.strip():
+            continue
+        try:
+            record = next(csv.reader([text]))
+        except csv.Error as exc:
+            if header is None:
+                raise UploadFormatError(f"Invalid CSV header: {exc}")
+            yield index, None, f"Invalid CSV: {exc}"
+            index += 1
+            continue
+        if header is None:
+            header = [name.strip() for name in record]
+            continue
+        if len(record) != len(header):
+            yield index, None, f"Expected {len(header)} columns, got {len(record)}"
+        else:
+            yield index, {name: (value if value != "" else None) for name, value in zip(header, record)}, None
+        index += 1
+    if pending.strip():
+        yield index, None, "Invalid CSV: unterminated quoted field"
+
+async def parse_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Parse newline-delimited JSON into ``(index, row, error)`` tuples, skipping blank lines.
+    """
+    index = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield index, json.loads(line), None
+        except ValueError as exc:
+            yield index, None, f"Invalid JSON: {exc}"
+        index += 1
+
+PARSERS = {
+    "csv": parse_csv,
+    "ndjson": parse_ndjson,
+}
+
+async def ingest_stream(
+    db,
+    chunks: AsyncIterator[bytes],
+    format: str,
+    write_chunk: Callable[..., BulkInsertResult],
+    chunk_size: int = 1000,
+    max_errors: int = MAX_REPORTED_ERRORS
+) -> BulkUploadResult:
+    """
+    Parse an uploaded file as it arrives and write it in chunks.
+
+    ``write_chunk(db, rows, chunk_size=...)`` validates and stores one chunk of
+    rows and runs in the threadpool. The next part of the body is not read
+    until the chunk is written, so memory is bounded by ``chunk_size`` rows
+    however large the file is. At most ``max_errors`` row errors are kept;
+    ``failed`` still counts every rejected row. If the body stops being
+    parseable, the chunks written so far are kept and the reason is returned
+    in ``error``.
+    """
+    counter = {"bytes": 0}
+    result = BulkUploadResult(received=0, inserted=0, failed=0, chunks=0)
+    rows: List[Dict[str, Any]] = []
+    indexes: List[int] = []
+
+    def add_errors(errors: List[BulkRowError]) -> None:
+        result.failed += len(errors)
+        room = max_errors - len(result.errors)
+        result.errors.extend(errors[:max(room, 0)])
+        result.errors_truncated = result.errors_truncated or len(errors) > room
+
+    async def flush() -> None:
+        chunk_result = await run_in_threadpool(write_chunk, db, rows, chunk_size=chunk_size)
+        for error in chunk_result.errors:
+            error.index = indexes[error.index]
+        result.inserted += chunk_result.inserted
+        result.chunks += 1
+        add_errors(chunk_result.errors)
+        rows.clear()
+        indexes.clear()
+
+    try:
+        async for index, row, error in PARSERS[format](iter_lines(chunks, counter)):
+            result.received += 1
+            if error is not None:
+                add_errors([BulkRowError(index=index, message=error)])
+                continue
+            rows.append(row)
+            indexes.append(index)
+            if len(rows) >= chunk_size:
+                await flush()
+    except UploadFormatError as exc:
+        result.error = str(exc)
+    if rows:
+        await flush()
+
+    result.bytes_received = counter["bytes"]
+    return result
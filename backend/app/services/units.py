@@ -0,0 +1,141 @@
+from typing import Dict, Optional, Sequence, Tuple
+import re
+
+import numpy as np
+from sqlalchemy import case, func
+
+CANONICAL_EMISSION_UNIT = "kg CO2e"
+
+# Factor to the canonical unit, keyed by the spelling used in source data
+EMISSION_UNIT_FACTORS = {
+    "mg CO2e": 1e-6,
+    "g CO2e": 1e-3,
+    "kg CO2e": 1.0,
+    "t CO2e": 1e3,
+    "tonne CO2e": 1e3,
+    "tonnes CO2e": 1e3,
+    "metric ton CO2e": 1e3,
+    "kt CO2e": 1e6,
+    "Mt CO2e": 1e9,
+    "Gt CO2e": 1e12,
+    "lb CO2e": 0.45359237,
+    "short ton CO2e": 907.18474,
+    "long ton CO2e": 1016.0469088,
+}
+
+def unit_key(unit: str) -> str:
+    """
+    Normalize the spelling of a unit so "kg CO2e", "kgCO2e" and "kg CO2-eq" match.
+
+    Case is kept because it is significant for prefixes (mt is not Mt).
+    """
+    key = re.sub(r"\s+", "", unit.strip())
+    return re.sub(r"(?i)co2[-_]?(e|eq|equivalent)$", "CO2e", key)
+
+# Every spelling of the CO2e suffix unit_key accepts, upper-cased, longest first
+CO2E_SUFFIXES = sorted(
+    (f"CO2{separator}{suffix}" for separator in ("", "-", "_") for suffix in ("E", "EQ", "EQUIVALENT")),
+    key=len, reverse=True
+)
+
+def sql_unit_key(unit_column):
+    """
+    SQL version of unit_key: strips whitespace and rewrites any CO2e suffix spelling, in any case.
+
+    Only the suffix is compared case-insensitively, like unit_key, so the
+    prefix keeps its case. Uses replace, upper, substr and length only, which
+    behave the same on PostgreSQL and SQLite.
+    """
+    key = unit_column
+    for whitespace in (" ", "\t", "\n", "\r"):
+        key = func.replace(key, whitespace, "")
+    length = func.length(key)
+    return case(
+        *[
+            (
+                func.upper(func.substr(key, length - (len(suffix) - 1))) == suffix,
+                func.substr(key, 1, length - len(suffix)).concat("CO2e")
+            )
+            for suffix in CO2E_SUFFIXES
+        ],
+        else_=key
+    )
+
+class UnitRegistry:
+    """
+    Conversion factors from known units to a canonical unit per dimension.
+    """
+    def __init__(self):
+        self._units: Dict[str, Tuple[float, str]] = {}
+
+    def register(self, unit: str, factor: float, canonical_unit: str) -> None:
+        self._units[unit_key(unit)] = (float(factor), canonical_unit)
+
+    def lookup(self, unit: Optional[str]) -> Optional[Tuple[float, str]]:
+        """
+        Return ``(factor, canonical unit)`` for a unit, or None if it is unknown.
+        """
+        if unit is None:
+            return None
+        return self._units.get(unit_key(unit))
+
+    def convert(self, value: Optional[float], unit: Optional[str]) -> Tuple[Optional[float], Optional[str]]:
+        """
+        Convert a single value; returns ``(None, None)`` for unknown units.
+        """
+        known = self.lookup(unit)
+        if known is None or value is None:
+            return None, None
+        factor, canonical_unit = known
+        return value * factor, canonical_unit
+
+    def convert_many(self, values: Sequence[float], units: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert whole columns of values and units at once.
+
+        Each distinct unit is looked up once; the factors are then broadcast back
+        over the rows with the inverse index from ``np.unique``. Returns a float
+        array of converted values and an object array of canonical units, with
+        NaN and None for rows whose unit is unknown.
+        """
+        values = np.asarray(values, dtype=float)
+        units = np.asarray([unit if unit is not None else "" for unit in units], dtype=object)
+        if len(units) == 0:
+            return np.empty(0, dtype=float), np.empty(0, dtype=object)
+
+        distinct, inverse = np.unique(units, return_inverse=True)
+        factors = np.full(len(distinct), np.nan)
+        canonical = np.full(len(distinct), None, dtype=object)
+        for i, unit in enumerate(distinct):
+            known = self.lookup(unit) if unit else None
+            if known is not None:
+                factors[i], canonical[i] = known
+        return values * factors[inverse], canonical[inverse]
+
+    def sql_factor(self, unit_column):
+        """
+        CASE expression giving the factor for ``unit_column`` in SQL, NULL when unknown.
+        """
+        return case(
+            {key: factor for key, (factor, _) in self._units.items()},
+            value=sql_unit_key(unit_column),
+            else_=None
+        )
+
+    def sql_canonical_unit(self, unit_column):
+        """
+        CASE expression giving the canonical unit for ``unit_column`` in SQL, NULL when unknown.
+        """
+        return case(
+            {key: canonical_unit for key, (_, canonical_unit) in self._units.items()},
+            value=sql_unit_key(unit_column),
+            else_=None
+        )
+
+def default_registry() -> UnitRegistry:
+    registry = UnitRegistry()
+    for unit, factor in EMISSION_UNIT_FACTORS.items():
+        registry.register(unit, factor, CANONICAL_EMISSION_UNIT)
+    return registry
+
+unit_registry = default_registry()
@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Set, Tuple, Type
+import os
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.models.bulk import BulkRowError, BulkUpsertResult
+
+UPSERT_CHUNK_SIZE = 1000
+UPSERT_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "50000"))
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+def _upsert_statement(db: Session, db_model, key: str, values: List[Dict[str, Any]]):
+    """
+    INSERT ... ON CONFLICT (key) DO UPDATE that only touches rows whose values differ.
+
+    Returns the keys of the rows that were inserted or updated; unchanged rows
+    are filtered out by the WHERE clause and not returned.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect not in _DIALECT_INSERTS:
+        raise NotImplementedError(f"Upsert is not supported on {dialect}")
+    table = db_model.__table__
+    statement = _DIALECT_INSERTS[dialect](table).values(values)
+    columns = [column for column in values[0] if column != key]
+    excluded = statement.excluded
+    update = {column: excluded[column] for column in columns}
+    if "updated_at" in table.c:
+        update["updated_at"] = func.now()
+    return statement.on_conflict_do_update(
+        index_elements=[table.c[key]],
+        set_=update,
+        where=or_(*[table.c[column].is_distinct_from(excluded[column]) for column in columns])
+    ).returning(table.c[key])
+
+def _upsert_chunk(db: Session, db_model, key: str, chunk: List[Tuple[int, Dict[str, Any]]]) -> Tuple[Set[str], Set[str], List[BulkRowError]]:
+    """
+    Upsert one chunk in a single statement, falling back to one savepoint per row
+    if the database rejects it. Returns the inserted keys, updated keys and row errors.
+    """
+    key_column = db_model.__table__.c[key]
+    keys = [values[key] for _, values in chunk]
+    existing = set(db.scalars(select(key_column).where(key_column.in_(keys))))
+
+    errors = []
+    written = set()
+    try:
+        with db.begin_nested():
+            written = set(db.scalars(_upsert_statement(db, db_model, key, [values for _, values in chunk])))
+    except (IntegrityError, DataError):
+        for index, values in chunk:
+            try:
+                with db.begin_nested():
+                    written.update(db.scalars(_upsert_statement(db, db_model, key, [values])))
+            except (IntegrityError, DataError) as exc:
+                errors.append(BulkRowError(index=index, key=values[key], message=str(exc.orig).strip()))
+    db.commit()
+    return written - existing, written & existing, errors
+
+def upsert_rows(
+    db: Session,
+    db_model,
+    schema: Type[BaseModel],
+    key: str,
+    rows: List[Dict[str, Any]],
+    chunk_size: int = UPSERT_CHUNK_SIZE
+) -> BulkUpsertResult:
+    """
+    Insert or update rows of a table keyed by its primary key, in chunks.
+
+    Each row is validated against ``schema``. Valid rows are written with one
+    INSERT ... ON CONFLICT DO UPDATE per chunk, and each chunk commits on its
+    own. Rows whose stored values already match are left untouched and
+    counted as unchanged, so sending the same batch again changes nothing.
+    A key that appears more than once is only taken the first time.
+    """
+    valid = []
+    errors = []
+    seen = set()
+    for index, row in enumerate(rows):
+        row_key = row.get(key) if isinstance(row, dict) else None
+        try:
+            values = schema.model_validate(row).model_dump()
+        except ValidationError as exc:
+            errors.append(BulkRowError.from_validation_error(index, row_key, exc))
+            continue
+        if values[key] in seen:
+            errors.append(BulkRowError(index=index, key=row_key, message=f"Duplicate {key} in request"))
+            continue
+        seen.add(values[key])
+        valid.append((index, values))
+
+    inserted = updated = 0
+    for start in range(0, len(valid), chunk_size):
+        chunk_inserted, chunk_updated, chunk_errors = _upsert_chunk(db, db_model, key, valid[start:start + chunk_size])
+        inserted += len(chunk_inserted)
+        updated += len(chunk_updated)
+        errors.extend(chunk_errors)
+
+    errors.sort(key=lambda error: error.index)
+    return BulkUpsertResult(
+        received=len(rows),
+        inserted=inserted,
+        updated=updated,
+        unchanged=len(rows) - len(errors) - inserted - updated,
+        failed=len(errors),
+        errors=errors
+    )
@@ -1,14 +1,26 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from app.db.models import WaterActivityType as DBWaterActivityType
 from app.models.water_activity_type import WaterActivityTypeCreate, WaterActivityType
+from app.models.bulk import BulkUpsertResult
+from app.services.pagination import apply_keyset
+from app.services.upsert import upsert_rows
 
-def get_water_activity_types(db: Session, skip: int = 0, limit: int = 100) -> List[DBWaterActivityType]:
+def _to_db_water_activity_type(water_activity_type: WaterActivityTypeCreate) -> DBWaterActivityType:
+    return DBWaterActivityType(
+        water_activity_type_id=water_activity_type.water_activity_type_id,
+        water_activity_type_name=water_activity_type.water_activity_type_name,
+        description=water_activity_type.description
+    )
+
+def get_water_activity_types(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBWaterActivityType]:
     """
     Retrieve a list of water activity types from the database.
     """
-    return db.query(DBWaterActivityType).offset(skip).limit(limit).all()
+    return apply_keyset(db.query(DBWaterActivityType), DBWaterActivityType.water_activity_type_id, skip, limit, cursor).all()
 
 def get_water_activity_type(db: Session, water_activity_type_id: str) -> Optional[DBWaterActivityType]:
     """
@@ -20,12 +32,38 @@ def create_water_activity_type(db: Session, water_activity_type: WaterActivityTy
     """
     Create a new water activity type in the database.
     """
-    db_water_activity_type = DBWaterActivityType(
-        water_activity_type_id=water_activity_type.water_activity_type_id,
-        water_activity_type_name=water_activity_type.water_activity_type_name,
-        description=water_activity_type.description
-    )
+    db_water_activity_type = _to_db_water_activity_type(water_activity_type)
     db.add(db_water_activity_type)
     db.commit()
     db.refresh(db_water_activity_type)
     return db_water_activity_type
+
+def upsert_water_activity_types(db: Session, rows: List[Dict[str, Any]]) -> BulkUpsertResult:
+    """
+    Insert new water activity types and update changed ones, keyed by water_activity_type_id.
+    """
+    return upsert_rows(db, DBWaterActivityType, WaterActivityTypeCreate, "water_activity_type_id", rows)
+
+# Async versions used by the API routers
+async def get_water_activity_types_async(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[DBWaterActivityType]:
+    """
+    Retrieve a list of water activity types from the database.
+    """
+    result = await db.execute(apply_keyset(select(DBWaterActivityType), DBWaterActivityType.water_activity_type_id, skip, limit, cursor))
+    return list(result.scalars().all())
+
+async def get_water_activity_type_async(db: AsyncSession, water_activity_type_id: str) -> Optional[DBWaterActivityType]:
+    """
+    Retrieve a specific water activity type by its ID.
+    """
+    return await db.get(DBWaterActivityType, water_activity_type_id)
+
+async def create_water_activity_type_async(db: AsyncSession, water_activity_type: WaterActivityTypeCreate) -> DBWaterActivityType:
+    """
+    Create a new water activity type in the database.
+    """
+    db_water_activity_type = _to_db_water_activity_type(water_activity_type)
+    db.add(db_water_activity_type)
+    await db.commit()
+    await db.refresh(db_water_activity_type)
+    return db_water_activity_type
@@ -0,0 +1,72 @@
+import unittest
+import asyncio
+import sys
+import os
+from datetime import datetime
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import database
+from app.db.models import Base
+from app.models.facility import FacilityCreate
+from app.models.organization import OrganizationCreate
+from app.services import facility_service, organization_service
+
+class TestAsyncServices(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+        asyncio.run(self._create_schema())
+
+    async def _create_schema(self):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    def tearDown(self):
+        asyncio.run(self.engine.dispose())
+
+    def test_async_database_url(self):
+        self.assertEqual(
+            database.async_database_url("postgresql://u:p@localhost/db"),
+            "postgresql+asyncpg://u:p@localhost/db"
+        )
+        self.assertEqual(database.async_database_url("sqlite:///./local.db"), "sqlite+aiosqlite:///./local.db")
+
+    def test_organization_round_trip(self):
+        async def scenario():
+            async with self.session_factory() as db:
+                created = await organization_service.create_organization_async(db, OrganizationCreate(
+                    organization_pk="namespace:master-data--Organization:async1",
+                    name="Async Org"
+                ))
+                self.assertIsInstance(created.created_at, datetime)
+
+                fetched = await organization_service.get_organization_async(db, "namespace:master-data--Organization:async1")
+                self.assertEqual(fetched.name, "Async Org")
+
+                missing = await organization_service.get_organization_async(db, "missing")
+                self.assertIsNone(missing)
+
+                listed = await organization_service.get_organizations_async(db, skip=0, limit=10)
+                self.assertEqual(len(listed), 1)
+
+        asyncio.run(scenario())
+
+    def test_facility_list_respects_limit(self):
+        async def scenario():
+            async with self.session_factory() as db:
+                for i in range(3):
+                    await facility_service.create_facility_async(db, FacilityCreate(
+                        facility_pk=f"namespace:master-data--Facility:{i}",
+                        name=f"Facility {i}"
+                    ))
+                listed = await facility_service.get_facilities_async(db, skip=1, limit=1)
+                self.assertEqual(len(listed), 1)
+
+        asyncio.run(scenario())
+
+if __name__ == '__main__':
+    unittest.main()
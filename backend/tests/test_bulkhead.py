@@ -0,0 +1,59 @@
+import unittest
+import asyncio
+import sys
+import os
+import threading
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.bulkhead import Bulkhead, BulkheadFullError
+
+class TestBulkhead(unittest.TestCase):
+    def setUp(self):
+        self.bulkhead = Bulkhead("test", max_concurrent=1, max_queue=1)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def _blocking_job(self):
+        self.release.wait(5)
+        return "done"
+
+    def test_run_returns_result(self):
+        result = asyncio.run(self.bulkhead.run(lambda x, y=0: x + y, 1, y=2))
+        self.assertEqual(result, 3)
+        stats = self.bulkhead.stats()
+        self.assertEqual(stats["completed"], 1)
+        self.assertEqual(stats["active"], 0)
+        self.assertEqual(stats["queued"], 0)
+
+    def test_rejects_when_saturated(self):
+        running = self.bulkhead.submit(self._blocking_job)
+        queued = self.bulkhead.submit(self._blocking_job)
+
+        with self.assertRaises(BulkheadFullError):
+            self.bulkhead.submit(self._blocking_job)
+
+        stats = self.bulkhead.stats()
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["active"] + stats["queued"], 2)
+
+        self.release.set()
+        self.assertEqual(running.result(5), "done")
+        self.assertEqual(queued.result(5), "done")
+
+        # Capacity is available again once the jobs have finished
+        self.assertEqual(self.bulkhead.submit(lambda: "ok").result(5), "ok")
+
+    def test_failures_are_counted_and_propagated(self):
+        def boom():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(self.bulkhead.run(boom))
+        self.assertEqual(self.bulkhead.stats()["failed"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import csv
+import sys
+import os
+from datetime import datetime
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, EmissionReport as DBEmissionReport, emission_report_statements
+from app.services.copy_import import STAGING_COLUMNS, copy_emission_statements, staging_csv
+
+def statement_row(i, **overrides):
+    row = {
+        "emission_statement_pk": f"stmt-{i}",
+        "emission_activity_id": "activity-1",
+        "value": i,
+        "unit": "kg CO2e",
+        "reporting_period_start": "2024-01-01T00:00:00",
+        "reporting_period_end": "2024-01-31T23:59:59",
+        "organization_id": "org-1"
+    }
+    row.update(overrides)
+    return row
+
+class TestCopyImport(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add(DBEmissionReport(
+            emission_report_pk="report-1",
+            report_period_start=datetime(2024, 1, 1),
+            report_period_end=datetime(2024, 12, 31),
+            organization_id="org-1",
+            report_type="GHG",
+            status="Draft"
+        ))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_staging_csv(self):
+        rows = list(csv.reader(staging_csv([statement_row(1, facility_id="", unit='kg "CO2e"'), "not a row"])))
+        self.assertEqual(len(rows), 2)
+        first = dict(zip(["row_index"] + STAGING_COLUMNS, rows[0]))
+        self.assertEqual(first["row_index"], "0")
+        self.assertEqual(first["value"], "1")
+        self.assertEqual(first["unit"], 'kg "CO2e"')
+        self.assertEqual(first["facility_id"], "")
+        self.assertEqual(rows[1], ["1"] + [""] * len(STAGING_COLUMNS))
+
+    def test_falls_back_to_batched_inserts_with_report_links(self):
+        rows = [
+            statement_row(0, emission_report_id="report-1"),
+            statement_row(1, emission_report_id="report-missing"),
+            statement_row(2),
+            statement_row(3, value="n/a", emission_report_id="report-1"),
+            statement_row(4, emission_report_id="report-1"),
+        ]
+        result = copy_emission_statements(self.db, rows)
+
+        self.assertEqual((result.received, result.inserted, result.failed), (5, 3, 2))
+        self.assertEqual([(error.index, error.key) for error in result.errors], [(1, "stmt-1"), (3, "stmt-3")])
+        self.assertEqual(result.errors[0].message, "Unknown emission_report_id")
+        links = self.db.execute(select(emission_report_statements.c.emission_statement_id)).scalars().all()
+        self.assertEqual(sorted(links), ["stmt-0", "stmt-4"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
 import sys
 import os
 import json
@@ -36,32 +37,32 @@ class TestCSRDReportsAPI(unittest.TestCase):
     @patch('app.api.csrd_reports.csrd_report_service')
     def test_get_csrd_reports(self, mock_service):
         # Mock the service response
-        mock_service.get_csrd_reports.return_value = [MagicMock()]
+        mock_service.get_csrd_reports_async = AsyncMock(return_value=[MagicMock()])
         
         # Test the API endpoint
-        with patch('app.api.csrd_reports.get_db', return_value=MagicMock()):
+        with patch('app.api.csrd_reports.get_async_db', return_value=MagicMock()):
             response = self.client.get("/api/csrd-reports/")
         
         # Assert that the response is successful
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called
-        mock_service.get_csrd_reports.assert_called_once()
+        mock_service.get_csrd_reports_async.assert_called_once()
     
     @patch('app.api.csrd_reports.csrd_report_service')
     def test_get_csrd_report(self, mock_service):
         # Mock the service response
-        mock_service.get_csrd_report.return_value = MagicMock()
+        mock_service.get_csrd_report_async = AsyncMock(return_value=MagicMock())
         
         # Test the API endpoint
-        with patch('app.api.csrd_reports.get_db', return_value=MagicMock()):
+        with patch('app.api.csrd_reports.get_async_db', return_value=MagicMock()):
             response = self.client.get(f"/api/csrd-reports/{self.sample_csrd_report['csrd_report_pk']}")
         
         # Assert that the response is successful
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called with the correct parameters
-        mock_service.get_csrd_report.assert_called_once_with(
+        mock_service.get_csrd_report_async.assert_called_once_with(
             MagicMock(), 
             csrd_report_pk=self.sample_csrd_report['csrd_report_pk']
         )
@@ -69,16 +70,16 @@ class TestCSRDReportsAPI(unittest.TestCase):
     @patch('app.api.csrd_reports.csrd_report_service')
     def test_get_csrd_report_not_found(self, mock_service):
         # Mock the service response
-        mock_service.get_csrd_report.return_value = None
+        mock_service.get_csrd_report_async = AsyncMock(return_value=None)
         
         # Test the API endpoint
-        with patch('app.api.csrd_reports.get_db', return_value=MagicMock()):
+        with patch('app.api.csrd_reports.get_async_db', return_value=MagicMock()):
             # This should raise an HTTPException with status code 404
             with self.assertRaises(HTTPException) as context:
-                csrd_reports.get_csrd_report(
+                asyncio.run(csrd_reports.get_csrd_report(
                     self.sample_csrd_report['csrd_report_pk'],
                     MagicMock()
-                )
+                ))
             
             # Assert that the exception has the correct status code
             self.assertEqual(context.exception.status_code, 404)
@@ -86,10 +87,10 @@ class TestCSRDReportsAPI(unittest.TestCase):
     @patch('app.api.csrd_reports.csrd_report_service')
     def test_create_csrd_report(self, mock_service):
         # Mock the service response
-        mock_service.create_csrd_report.return_value = MagicMock()
+        mock_service.create_csrd_report_async = AsyncMock(return_value=MagicMock())
         
         # Test the API endpoint
-        with patch('app.api.csrd_reports.get_db', return_value=MagicMock()):
+        with patch('app.api.csrd_reports.get_async_db', return_value=MagicMock()):
             response = self.client.post(
                 "/api/csrd-reports/",
                 json=self.sample_csrd_report
@@ -99,7 +100,7 @@ class TestCSRDReportsAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called
-        mock_service.create_csrd_report.assert_called_once()
+        mock_service.create_csrd_report_async.assert_called_once()
     
     @patch('app.api.csrd_reports.csrd_report_service')
     def test_generate_csrd_report_document(self, mock_service):
@@ -113,7 +114,7 @@ class TestCSRDReportsAPI(unittest.TestCase):
         }
         
         # Test the API endpoint
-        with patch('app.api.csrd_reports.get_db', return_value=MagicMock()):
+        with patch('app.api.csrd_reports.get_async_db', return_value=MagicMock()):
             response = self.client.get(
                 f"/api/csrd-reports/{self.sample_csrd_report['csrd_report_pk']}/generate?format=pdf"
             )
@@ -139,7 +140,7 @@ class TestCSRDReportsAPI(unittest.TestCase):
         }
         
         # Test the API endpoint
-        with patch('app.api.csrd_reports.get_db', return_value=MagicMock()):
+        with patch('app.api.csrd_reports.get_async_db', return_value=MagicMock()):
             response = self.client.get(
                 f"/api/csrd-reports/{self.sample_csrd_report['csrd_report_pk']}/validate"
             )
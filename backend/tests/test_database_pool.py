@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, exc, text
+
+from app.db import database
+from app.db.pool import InstrumentedQueuePool, get_pool_stats
+
+class TestDatabasePool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(self.tmpdir.name, 'pool.db')}"
+        self.engine = create_engine(
+            url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_engine_options_for_postgres(self):
+        options = database.engine_options("postgresql://user:pw@localhost/db", pool_size=7, max_overflow=3)
+        self.assertIs(options["poolclass"], InstrumentedQueuePool)
+        self.assertEqual(options["pool_size"], 7)
+        self.assertEqual(options["max_overflow"], 3)
+        self.assertIn("pool_pre_ping", options)
+        self.assertIn("pool_recycle", options)
+
+    def test_engine_options_for_sqlite(self):
+        self.assertEqual(database.engine_options("sqlite://"), {})
+
+    def test_checkout_statistics(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            stats = get_pool_stats(self.engine)
+            self.assertEqual(stats["checked_out"], 1)
+        stats = get_pool_stats(self.engine)
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["checkouts"], 1)
+        self.assertEqual(stats["checkout_failures"], 0)
+        self.assertEqual(stats["pool_size"], 1)
+
+    def test_checkout_timeout_is_counted(self):
+        with self.engine.connect():
+            with self.assertRaises(exc.TimeoutError):
+                self.engine.connect()
+        stats = get_pool_stats(self.engine)
+        self.assertEqual(stats["checkout_failures"], 1)
+        self.assertGreater(stats["max_wait_seconds"], 0)
+
+    def test_connection_errors_are_counted(self):
+        class ConnectError(Exception):
+            pass
+
+        def failing_connect():
+            raise ConnectError("could not connect to server")
+
+        pool = InstrumentedQueuePool(failing_connect, pool_size=1, max_overflow=0)
+        with self.assertRaises(ConnectError):
+            pool.connect()
+        self.assertEqual(pool.metrics.checkouts, 0)
+        self.assertEqual(pool.metrics.checkout_failures, 1)
+
+    def test_metrics_survive_pool_recreate(self):
+        with self.engine.connect():
+            pass
+        metrics = self.engine.pool.metrics
+        self.engine.dispose()
+        self.assertIs(self.engine.pool.metrics, metrics)
+
+if __name__ == '__main__':
+    unittest.main()
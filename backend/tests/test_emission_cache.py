@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base
+from app.services import emission_aggregation_service, emission_service
+from app.services.emission_cache import EmissionCache, emission_cache
+
+def statement(pk, organization, facility, activity, value, unit, start):
+    return {
+        "emission_statement_pk": pk,
+        "emission_activity_id": activity,
+        "value": value,
+        "unit": unit,
+        "reporting_period_start": start,
+        "reporting_period_end": start,
+        "facility_id": facility,
+        "organization_id": organization
+    }
+
+ROWS = [
+    statement("s1", "org-1", "fac-1", "act-1", 10.0, "kg CO2e", datetime(2024, 1, 5)),
+    statement("s2", "org-1", "fac-1", "act-2", 5.0, "kg CO2e", datetime(2024, 1, 20)),
+    statement("s3", "org-1", "fac-2", "act-1", 7.5, "kg CO2e", datetime(2024, 2, 1)),
+    statement("s4", "org-1", None, "act-1", 2.0, "t CO2e", datetime(2024, 4, 1)),
+    statement("s5", "org-1", "fac-1", "act-1", 3.0, "furlong", datetime(2024, 5, 2)),
+    statement("s6", "org-2", "fac-3", "act-1", 100.0, "kg CO2e", datetime(2024, 1, 1)),
+]
+
+class TestEmissionCache(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        emission_service.bulk_create_emission_statements(self.db, ROWS)
+        self.cache = EmissionCache(max_bytes=10 ** 6, ttl_seconds=60)
+
+    def tearDown(self):
+        emission_cache.enabled = False
+        emission_cache.invalidate()
+        self.db.close()
+        self.engine.dispose()
+
+    def test_matches_sql_aggregation(self):
+        columns = self.cache.get(self.db, "org-1")
+        queries = [
+            ([], {}),
+            (["facility", "activity"], {}),
+            (["organization"], {"normalize": True}),
+            (["activity"], {"facility_id": "fac-1", "start": datetime(2024, 1, 10), "end": datetime(2024, 6, 1)}),
+            (["unit"], {"unit": "kg CO2e"}),
+        ]
+        # Row order can differ in where NULL groups go, which depends on the database
+        for group_by, filters in queries:
+            self.assertCountEqual(
+                columns.aggregate(group_by, **filters),
+                emission_aggregation_service.aggregate_emissions(self.db, group_by, use_rollups=False, organization_id="org-1", **filters)
+            )
+
+        rows = columns.aggregate(["period"], "quarter", normalize=True)
+        self.assertEqual([(row["period_start"], row["unit"], row["total"]) for row in rows], [
+            (datetime(2024, 4, 1), "furlong", 3.0), (datetime(2024, 1, 1), "kg CO2e", 22.5), (datetime(2024, 4, 1), "kg CO2e", 2000.0),
+        ])
+
+    def test_invalidated_on_write(self):
+        emission_cache.enabled = True
+        emission_cache.invalidate()
+        total = lambda: emission_aggregation_service.aggregate_emissions(self.db, [], organization_id="org-2")[0]["total"]
+        self.assertEqual(total(), 100.0)
+        self.assertEqual(total(), 100.0)
+        self.assertGreaterEqual(emission_cache.stats()["hits"], 1)
+
+        emission_service.bulk_create_emission_statements(self.db, [
+            statement("s7", "org-2", "fac-3", "act-1", 1.0, "kg CO2e", datetime(2024, 3, 1))
+        ])
+        self.assertEqual(total(), 101.0)
+
+    def test_lru_eviction_by_size(self):
+        size = self.cache.get(self.db, "org-1").nbytes
+        cache = EmissionCache(max_bytes=size + 100, ttl_seconds=60)
+        cache.get(self.db, "org-1")
+        cache.get(self.db, "org-2")
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["evictions"]), (1, 1))
+        self.assertLessEqual(stats["bytes"], size + 100)
+
+if __name__ == '__main__':
+    unittest.main()
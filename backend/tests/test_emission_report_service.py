@@ -61,7 +61,7 @@ class TestEmissionReportService(unittest.TestCase):
     def test_get_emission_reports(self):
         # Mock the database query
         mock_reports = [MagicMock(), MagicMock()]
-        self.mock_db.query.return_value.offset.return_value.limit.return_value.all.return_value = mock_reports
+        self.mock_db.query.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_reports
         
         # Call the service method
         result = emission_report_service.get_emission_reports(self.mock_db, skip=0, limit=100)
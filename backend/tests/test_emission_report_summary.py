@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, event, insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, EmissionReport as DBEmissionReport, EmissionStatement as DBEmissionStatement, emission_report_statements
+from app.models.emission_report import EmissionReportSummary
+from app.services import emission_report_service, emission_service
+
+STATEMENTS = [
+    # pk, facility, activity, value, unit
+    ("s1", "fac-1", "electricity", 500.0, "kg CO2e"),
+    ("s2", "fac-1", "heating", 1.5, "t CO2e"),
+    ("s3", None, "electricity", 1.5, "t CO2e"),
+    ("s4", "fac-2", "travel", 2.0, "furlong"),
+    ("s5", "fac-2", "travel", 99.0, "kg CO2e"),
+]
+
+class TestEmissionReportSummary(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        emission_service.bulk_create_emission_statements(self.db, [
+            {
+                "emission_statement_pk": pk,
+                "emission_activity_id": activity,
+                "value": value,
+                "unit": unit,
+                "reporting_period_start": datetime(2024, 1, 1),
+                "reporting_period_end": datetime(2024, 1, 31),
+                "facility_id": facility,
+                "organization_id": "org-1"
+            }
+            for pk, facility, activity, value, unit in STATEMENTS
+        ])
+        self.db.add(DBEmissionReport(
+            emission_report_pk="report-1",
+            report_period_start=datetime(2024, 1, 1),
+            report_period_end=datetime(2024, 12, 31),
+            organization_id="org-1",
+            report_type="GHG",
+            status="Draft"
+        ))
+        # s5 is not part of the report
+        self.db.execute(insert(emission_report_statements), [
+            {"emission_report_id": "report-1", "emission_statement_id": pk} for pk in ("s1", "s2", "s3", "s4")
+        ])
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_summary_in_one_query(self):
+        queries = []
+        event.listen(self.engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+        summary = emission_report_service.get_emission_report_summary(self.db, "report-1")
+        self.assertEqual(len(queries), 1)
+
+        groups = lambda section: [(g["key"], g["unit"], g["total"], g["statement_count"]) for g in summary[section]]
+        self.assertEqual(summary["statement_count"], 4)
+        self.assertEqual(groups("totals"), [(None, "furlong", 2.0, 1), (None, "kg CO2e", 3500.0, 3)])
+        self.assertEqual(groups("by_facility"), [
+            ("fac-1", "kg CO2e", 2000.0, 2), ("fac-2", "furlong", 2.0, 1), (None, "kg CO2e", 1500.0, 1),
+        ])
+        self.assertEqual(groups("by_activity"), [
+            ("electricity", "kg CO2e", 2000.0, 2), ("heating", "kg CO2e", 1500.0, 1), ("travel", "furlong", 2.0, 1),
+        ])
+        self.assertEqual(groups("by_unit"), [
+            ("furlong", "furlong", 2.0, 1), ("kg CO2e", "kg CO2e", 500.0, 1), ("t CO2e", "t CO2e", 3.0, 2),
+        ])
+        EmissionReportSummary(**summary)
+
+    def test_statements_without_normalized_values_are_converted(self):
+        normalized = emission_report_service.get_emission_report_summary(self.db, "report-1")
+        # As left by STORE_NORMALIZED_VALUES=false or rows not yet backfilled
+        self.db.execute(update(DBEmissionStatement).where(DBEmissionStatement.emission_statement_pk.in_(["s2", "s3"])).values(
+            normalized_value=None, normalized_unit=None
+        ))
+        self.db.commit()
+        summary = emission_report_service.get_emission_report_summary(self.db, "report-1")
+        self.assertEqual(summary, normalized)
+        self.assertEqual([(g["unit"], g["total"]) for g in summary["totals"]], [("furlong", 2.0), ("kg CO2e", 3500.0)])
+
+    def test_unnormalized_and_empty(self):
+        summary = emission_report_service.get_emission_report_summary(self.db, "report-1", normalize=False)
+        self.assertEqual([(g["unit"], g["total"]) for g in summary["totals"]], [("furlong", 2.0), ("kg CO2e", 500.0), ("t CO2e", 3.0)])
+
+        summary = emission_report_service.get_emission_report_summary(self.db, "no-such-report")
+        self.assertEqual((summary["statement_count"], summary["totals"]), (0, []))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
 import sys
 import os
 import json
@@ -31,32 +32,32 @@ class TestEmissionReportsAPI(unittest.TestCase):
     @patch('app.api.emission_reports.emission_report_service')
     def test_get_emission_reports(self, mock_service):
         # Mock the service response
-        mock_service.get_emission_reports.return_value = [MagicMock()]
+        mock_service.get_emission_reports_async = AsyncMock(return_value=[MagicMock()])
         
         # Test the API endpoint
-        with patch('app.api.emission_reports.get_db', return_value=MagicMock()):
+        with patch('app.api.emission_reports.get_async_db', return_value=MagicMock()):
             response = self.client.get("/api/emission-reports/")
         
         # Assert that the response is successful
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called
-        mock_service.get_emission_reports.assert_called_once()
+        mock_service.get_emission_reports_async.assert_called_once()
     
     @patch('app.api.emission_reports.emission_report_service')
     def test_get_emission_report(self, mock_service):
         # Mock the service response
-        mock_service.get_emission_report.return_value = MagicMock()
+        mock_service.get_emission_report_async = AsyncMock(return_value=MagicMock())
         
         # Test the API endpoint
-        with patch('app.api.emission_reports.get_db', return_value=MagicMock()):
+        with patch('app.api.emission_reports.get_async_db', return_value=MagicMock()):
             response = self.client.get(f"/api/emission-reports/{self.sample_emission_report['emission_report_pk']}")
         
         # Assert that the response is successful
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called with the correct parameters
-        mock_service.get_emission_report.assert_called_once_with(
+        mock_service.get_emission_report_async.assert_called_once_with(
             MagicMock(), 
             emission_report_pk=self.sample_emission_report['emission_report_pk']
         )
@@ -64,16 +65,16 @@ class TestEmissionReportsAPI(unittest.TestCase):
     @patch('app.api.emission_reports.emission_report_service')
     def test_get_emission_report_not_found(self, mock_service):
         # Mock the service response
-        mock_service.get_emission_report.return_value = None
+        mock_service.get_emission_report_async = AsyncMock(return_value=None)
         
         # Test the API endpoint
-        with patch('app.api.emission_reports.get_db', return_value=MagicMock()):
+        with patch('app.api.emission_reports.get_async_db', return_value=MagicMock()):
             # This should raise an HTTPException with status code 404
             with self.assertRaises(HTTPException) as context:
-                emission_reports.get_emission_report(
+                asyncio.run(emission_reports.get_emission_report(
                     self.sample_emission_report['emission_report_pk'],
                     MagicMock()
-                )
+                ))
             
             # Assert that the exception has the correct status code
             self.assertEqual(context.exception.status_code, 404)
@@ -81,10 +82,10 @@ class TestEmissionReportsAPI(unittest.TestCase):
     @patch('app.api.emission_reports.emission_report_service')
     def test_create_emission_report(self, mock_service):
         # Mock the service response
-        mock_service.create_emission_report.return_value = MagicMock()
+        mock_service.create_emission_report_async = AsyncMock(return_value=MagicMock())
         
         # Test the API endpoint
-        with patch('app.api.emission_reports.get_db', return_value=MagicMock()):
+        with patch('app.api.emission_reports.get_async_db', return_value=MagicMock()):
             response = self.client.post(
                 "/api/emission-reports/",
                 json=self.sample_emission_report
@@ -94,7 +95,7 @@ class TestEmissionReportsAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called
-        mock_service.create_emission_report.assert_called_once()
+        mock_service.create_emission_report_async.assert_called_once()
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, delete, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, EmissionRollup as DBEmissionRollup, EmissionStatement as DBEmissionStatement
+from app.models.emission_statement import EmissionStatementCreate
+from app.services import emission_aggregation_service, emission_service
+from app.services.emission_rollup_service import reconcile_emission_rollups
+
+def statement(pk, organization, facility, value, unit, start):
+    return {
+        "emission_statement_pk": pk,
+        "emission_activity_id": "activity-1",
+        "value": value,
+        "unit": unit,
+        "reporting_period_start": start,
+        "reporting_period_end": start,
+        "facility_id": facility,
+        "organization_id": organization
+    }
+
+ROWS = [
+    statement("s1", "org-1", "fac-1", 10.0, "kg CO2e", datetime(2024, 1, 5)),
+    statement("s2", "org-1", "fac-1", 5.0, "kg CO2e", datetime(2024, 1, 20)),
+    statement("s3", "org-1", None, 2.0, "t CO2e", datetime(2024, 2, 1)),
+    statement("s4", "org-2", "fac-2", 100.0, "kg CO2e", datetime(2024, 4, 30, 23, 0)),
+]
+
+class TestEmissionRollups(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        emission_service.bulk_create_emission_statements(self.db, ROWS, chunk_size=2)
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def rollups(self):
+        return {
+            (r.organization_id, r.facility_key, r.month.strftime("%Y-%m"), r.unit): (r.total, r.statement_count)
+            for r in self.db.scalars(select(DBEmissionRollup))
+        }
+
+    def test_maintained_on_write(self):
+        emission_service.create_emission_statement(self.db, EmissionStatementCreate(
+            **statement("s5", "org-1", "fac-1", 2.5, "kg CO2e", datetime(2024, 1, 31))
+        ))
+        self.assertEqual(self.rollups(), {
+            ("org-1", "fac-1", "2024-01", "kg CO2e"): (17.5, 3),
+            ("org-1", "", "2024-02", "t CO2e"): (2.0, 1),
+            ("org-2", "fac-2", "2024-04", "kg CO2e"): (100.0, 1),
+        })
+
+    def test_rollups_match_statements(self):
+        queries = [
+            ([], {}),
+            (["organization", "facility"], {}),
+            (["period"], {"bucket": "quarter", "start": datetime(2024, 1, 1), "end": datetime(2024, 4, 1)}),
+            (["organization"], {"normalize": True, "facility_id": "fac-1"}),
+        ]
+        for group_by, filters in queries:
+            self.assertTrue(emission_aggregation_service.rollup_compatible(group_by, **filters))
+            self.assertEqual(
+                emission_aggregation_service.aggregate_emissions(self.db, group_by, **filters),
+                emission_aggregation_service.aggregate_emissions(self.db, group_by, use_rollups=False, **filters)
+            )
+        self.assertFalse(emission_aggregation_service.rollup_compatible(["activity"]))
+        self.assertFalse(emission_aggregation_service.rollup_compatible([], start=datetime(2024, 1, 15)))
+        self.assertFalse(emission_aggregation_service.rollup_compatible(["period"], "day"))
+
+    def test_reconcile_repairs_drift(self):
+        expected = self.rollups()
+        self.assertEqual(reconcile_emission_rollups(self.db), {"checked": 3, "missing": 0, "stale": 0, "extra": 0})
+
+        # Writes that bypass the service layer leave the rollups behind
+        self.db.execute(update(DBEmissionStatement).where(DBEmissionStatement.emission_statement_pk == "s1").values(value=20.0))
+        self.db.execute(delete(DBEmissionStatement).where(DBEmissionStatement.emission_statement_pk == "s4"))
+        self.db.execute(delete(DBEmissionRollup).where(DBEmissionRollup.organization_id == "org-1", DBEmissionRollup.unit == "t CO2e"))
+        self.db.commit()
+
+        self.assertEqual(reconcile_emission_rollups(self.db), {"checked": 2, "missing": 1, "stale": 1, "extra": 1})
+        expected[("org-1", "fac-1", "2024-01", "kg CO2e")] = (25.0, 2)
+        del expected[("org-2", "fac-2", "2024-04", "kg CO2e")]
+        self.assertEqual(self.rollups(), expected)
+
+if __name__ == '__main__':
+    unittest.main()
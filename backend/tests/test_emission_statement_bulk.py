@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, EmissionStatement as DBEmissionStatement
+from app.services import emission_service
+
+def statement_row(i, **overrides):
+    row = {
+        "emission_statement_pk": f"namespace:transactional-data--EmissionStatement:{i}",
+        "emission_activity_id": "namespace:master-data--EmissionActivity:1",
+        "value": float(i),
+        "unit": "kg CO2e",
+        "reporting_period_start": "2024-01-01T00:00:00",
+        "reporting_period_end": "2024-01-31T23:59:59",
+        "facility_id": "namespace:master-data--Facility:1",
+        "organization_id": "namespace:master-data--Organization:1"
+    }
+    row.update(overrides)
+    return row
+
+class TestEmissionStatementBulk(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def count(self):
+        return self.db.scalar(select(func.count()).select_from(DBEmissionStatement))
+
+    def test_inserts_all_rows_in_chunks(self):
+        result = emission_service.bulk_create_emission_statements(
+            self.db, [statement_row(i) for i in range(25)], chunk_size=10
+        )
+        self.assertEqual((result.received, result.inserted, result.failed), (25, 25, 0))
+        self.assertEqual(self.count(), 25)
+
+        stored = self.db.get(DBEmissionStatement, "namespace:transactional-data--EmissionStatement:7")
+        self.assertEqual(stored.value, 7.0)
+        self.assertEqual(stored.unit, "kg CO2e")
+        self.assertEqual(stored.reporting_period_start, datetime(2024, 1, 1))
+        self.assertEqual(stored.facility_id, "namespace:master-data--Facility:1")
+        self.assertEqual(stored.organization_id, "namespace:master-data--Organization:1")
+
+    def test_reports_row_errors_without_aborting(self):
+        emission_service.bulk_create_emission_statements(self.db, [statement_row(3)])
+
+        rows = [statement_row(i) for i in range(6)]
+        del rows[1]["value"]
+        rows[4] = statement_row(2)
+        result = emission_service.bulk_create_emission_statements(self.db, rows, chunk_size=3)
+
+        self.assertEqual((result.received, result.inserted, result.failed), (6, 3, 3))
+        self.assertEqual([error.index for error in result.errors], [1, 3, 4])
+        self.assertIn("value", result.errors[0].message)
+        self.assertEqual(result.errors[1].key, "namespace:transactional-data--EmissionStatement:3")
+        self.assertIn("Duplicate", result.errors[2].message)
+        self.assertEqual(self.count(), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, Organization as DBOrganization
+from app.models.emission_aggregate import EmissionTopEmitters
+from app.services import emission_aggregation_service, emission_ranking_service, emission_service
+
+STATEMENTS = [
+    # pk, organization, facility, activity, value, unit, period start
+    ("s1", "org-1", "fac-1", "electricity", 100.0, "kg CO2e", datetime(2024, 1, 1)),
+    ("s2", "org-1", "fac-1", "heating", 0.2, "t CO2e", datetime(2024, 2, 1)),
+    ("s3", "org-2", "fac-2", "electricity", 500.0, "kg CO2e", datetime(2024, 3, 1)),
+    ("s4", "org-2", None, "travel", 50.0, "kg CO2e", datetime(2024, 3, 1)),
+    ("s5", "org-1", "fac-3", "heating", 150.0, "kg CO2e", datetime(2023, 12, 1)),
+    ("s6", "org-1", "fac-3", "heating", 7.0, "kWh", datetime(2024, 4, 1)),
+]
+
+class TestTopEmitters(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add_all([
+            DBOrganization(organization_pk="org-1", name="Parent"),
+            DBOrganization(organization_pk="org-2", name="Subsidiary", parent_organization_id="org-1"),
+        ])
+        self.db.commit()
+        emission_service.bulk_create_emission_statements(self.db, [
+            {
+                "emission_statement_pk": pk,
+                "emission_activity_id": activity,
+                "value": value,
+                "unit": unit,
+                "reporting_period_start": start,
+                "reporting_period_end": start,
+                "facility_id": facility,
+                "organization_id": organization
+            }
+            for pk, organization, facility, activity, value, unit, start in STATEMENTS
+        ])
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def _ranking(self, result):
+        return [(group["key"], group["total"], group["statement_count"]) for group in result["groups"]]
+
+    def test_facilities_in_subtree_with_cumulative_share(self):
+        filters = dict(organization_subtree_of="org-1", start=datetime(2024, 1, 1), end=datetime(2025, 1, 1))
+        result = emission_ranking_service.get_top_emitters(self.db, "facility", limit=2, **filters)
+        EmissionTopEmitters(**result)
+        self.assertEqual(result["total"], 850.0)
+        self.assertEqual(self._ranking(result), [("fac-2", 500.0, 1), ("fac-1", 300.0, 2)])
+        self.assertEqual([group["cumulative_share"] for group in result["groups"]], [500.0 / 850.0, 800.0 / 850.0])
+
+        # The rollups and the statements give the same ranking
+        statement = emission_ranking_service.top_emitters_statement("facility", 2, use_rollups=False, **filters)
+        self.assertEqual([tuple(row[:3]) for row in self.db.execute(statement)], self._ranking(result))
+
+    def test_activities_of_one_organization(self):
+        result = emission_ranking_service.get_top_emitters(self.db, "activity", organization_id="org-1", cumulative_share=False)
+        self.assertEqual(self._ranking(result), [("heating", 350.0, 2), ("electricity", 100.0, 1)])
+        self.assertEqual([group["share"] for group in result["groups"]], [350.0 / 450.0, 100.0 / 450.0])
+        self.assertEqual([group["cumulative_share"] for group in result["groups"]], [None, None])
+
+        kwh = emission_ranking_service.get_top_emitters(self.db, "activity", unit="kWh", organization_id="org-1")
+        self.assertEqual(self._ranking(kwh), [("heating", 7.0, 1)])
+
+    def test_rollups_agree_with_statements_for_any_unit_spelling(self):
+        self.db.add(DBOrganization(organization_pk="org-3", name="Spellings"))
+        self.db.commit()
+        emission_service.bulk_create_emission_statements(self.db, [
+            {
+                "emission_statement_pk": f"spelling-{i}",
+                "emission_activity_id": "heating",
+                "value": value,
+                "unit": unit,
+                "reporting_period_start": datetime(2024, 5, 1),
+                "reporting_period_end": datetime(2024, 5, 31),
+                "facility_id": "fac-1",
+                "organization_id": "org-3"
+            }
+            for i, (value, unit) in enumerate([(1.0, "t co2e")] + [(1.0, "kg CO2e")] * 500)
+        ])
+
+        by_facility = emission_ranking_service.get_top_emitters(self.db, "facility", organization_id="org-3")
+        by_activity = emission_ranking_service.get_top_emitters(self.db, "activity", organization_id="org-3")
+        from_statements = self.db.execute(
+            emission_ranking_service.top_emitters_statement("facility", use_rollups=False, organization_id="org-3")
+        ).all()
+        aggregate = emission_aggregation_service.aggregate_emissions(self.db, [], normalize=True, organization_id="org-3")
+        self.assertEqual(by_facility["total"], 1500.0)
+        self.assertEqual(by_activity["total"], 1500.0)
+        self.assertEqual(self._ranking(by_facility), [tuple(row[:3]) for row in from_statements])
+        self.assertEqual(aggregate[0]["total"], 1500.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+from unittest import mock
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base
+from app.models.emission_aggregate import EmissionTrendSeries
+from app.services import emission_service, emission_trend_service
+
+STATEMENTS = [
+    # pk, facility, value, unit, period start
+    ("s1", "fac-1", 100.0, "kg CO2e", datetime(2022, 3, 1)),
+    ("s2", "fac-1", 0.15, "t CO2e", datetime(2023, 6, 1)),
+    ("s3", "fac-2", 40.0, "kg CO2e", datetime(2022, 1, 1)),
+    ("s4", "fac-2", 50.0, "kg CO2e", datetime(2024, 1, 1)),
+    ("s5", "fac-1", 120.0, "kg CO2e", datetime(2024, 3, 1)),
+]
+
+class TestEmissionTrends(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        emission_service.bulk_create_emission_statements(self.db, [
+            {
+                "emission_statement_pk": pk,
+                "emission_activity_id": "activity-1",
+                "value": value,
+                "unit": unit,
+                "reporting_period_start": start,
+                "reporting_period_end": start,
+                "facility_id": facility,
+                "organization_id": "org-1"
+            }
+            for pk, facility, value, unit, start in STATEMENTS
+        ])
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_yearly_series_per_facility(self):
+        series = emission_trend_service.get_emission_trends(self.db, ["facility"], organization_id="org-1")
+        for item in series:
+            EmissionTrendSeries(**item)
+        points = {
+            item["facility_id"]: [(p["period_start"].year, p["total"], p["change"], p["change_percent"]) for p in item["points"]]
+            for item in series
+        }
+        self.assertEqual(points, {
+            "fac-1": [(2022, 100.0, None, None), (2023, 150.0, 50.0, 50.0), (2024, 120.0, -30.0, -20.0)],
+            "fac-2": [(2022, 40.0, None, None), (2023, 0.0, -40.0, -100.0), (2024, 50.0, 50.0, None)],
+        })
+
+    def test_year_over_year_quarters(self):
+        series = emission_trend_service.get_emission_trends(
+            self.db, [], "quarter", "year", start=datetime(2023, 1, 1), end=datetime(2025, 1, 1)
+        )
+        self.assertEqual(len(series), 1)
+        points = series[0]["points"]
+        self.assertEqual(len(points), 8)
+        # Q1 2024 (170) against Q1 2023 (0); Q2 2024 (0) against Q2 2023 (150)
+        self.assertEqual([(p["total"], p["change"], p["change_percent"]) for p in points[4:6]], [
+            (170.0, 170.0, None), (0.0, -150.0, -100.0),
+        ])
+        self.assertEqual(points[0]["change"], None)
+
+        with self.assertRaises(ValueError):
+            emission_trend_service.get_emission_trends(self.db, [], "day", "year")
+
+    def test_number_of_buckets_is_capped(self):
+        with self.assertRaises(emission_trend_service.TooManyBucketsError):
+            emission_trend_service.get_emission_trends(self.db, [], "day", start=datetime(1900, 1, 1), end=datetime(2100, 1, 1))
+
+        with mock.patch.object(emission_trend_service, "MAX_TREND_BUCKETS", 3):
+            # Without a window the buckets run from the first to the last with data
+            with self.assertRaises(emission_trend_service.TooManyBucketsError):
+                emission_trend_service.get_emission_trends(self.db, ["facility"], "month")
+            series = emission_trend_service.get_emission_trends(self.db, ["facility"], "year")
+            self.assertEqual([len(item["points"]) for item in series], [3, 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+import unittest
+import sys
+import os
+import io
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import datetime
+from enum import Enum
+from types import SimpleNamespace
+from unittest import mock
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.services import excel_writer
+from app.services.excel_writer import ExcelSheet, SheetSource, fetch_sheets, iter_buffer, write_sheets, write_workbook
+
+class Status(str, Enum):
+    DRAFT = "Draft"
+
+COLUMNS = [
+    ("ID", lambda item: item.pk),
+    ("Status", lambda item: item.status),
+    ("Targets", lambda item: item.targets),
+    ("Created At", lambda item: item.created_at),
+]
+
+def _items(count):
+    for i in range(count):
+        yield SimpleNamespace(pk=f"item-{i}", status=Status.DRAFT, targets={"scope": i}, created_at=datetime(2024, 1, 1))
+
+class TestExcelWriter(unittest.TestCase):
+    def _workbook(self, output):
+        data = b"".join(iter_buffer(output))
+        self.assertTrue(output.closed)
+        return zipfile.ZipFile(io.BytesIO(data))
+
+    def test_sheets_are_written_from_iterables(self):
+        cwd = set(os.listdir("."))
+        output = write_workbook([
+            ExcelSheet("Items", COLUMNS, _items(3)),
+            ExcelSheet("Empty", COLUMNS, []),
+        ])
+        self.assertEqual(set(os.listdir(".")), cwd)
+
+        workbook = self._workbook(output)
+        self.assertIn('name="Items"', workbook.read("xl/workbook.xml").decode())
+        self.assertIn('name="Empty"', workbook.read("xl/workbook.xml").decode())
+        items = workbook.read("xl/worksheets/sheet1.xml").decode()
+        # Constant-memory mode writes strings inline rather than into the shared string table
+        self.assertIn("<t>item-2</t>", items)
+        self.assertIn("<t>Draft</t>", items)
+        self.assertIn('<t>{"scope": 2}</t>', items)
+        self.assertIn('<row r="4"', items)
+        self.assertNotIn('<row r="2"', workbook.read("xl/worksheets/sheet2.xml").decode())
+
+    def test_large_workbooks_spill_to_a_temporary_file(self):
+        with mock.patch.object(excel_writer, "EXCEL_SPOOL_BYTES", 1024):
+            output = write_workbook([ExcelSheet("Items", COLUMNS, _items(500))])
+        self.assertTrue(output._rolled)
+        self.assertIn('<row r="501"', self._workbook(output).read("xl/worksheets/sheet1.xml").decode())
+
+    def test_sheets_past_the_row_limit_continue_on_new_worksheets(self):
+        output = io.BytesIO()
+        done = []
+        with mock.patch.object(excel_writer, "EXCEL_MAX_ROWS", 4):
+            write_sheets(output, [ExcelSheet("Items", COLUMNS, _items(7)), ExcelSheet("Empty", COLUMNS, [])], on_sheet=done.append)
+        self.assertEqual(done, [1, 2])
+
+        workbook = zipfile.ZipFile(output)
+        names = workbook.read("xl/workbook.xml").decode()
+        for name in ("Items", "Items (2)", "Items (3)", "Empty"):
+            self.assertIn(f'name="{name}"', names)
+        sheets = [workbook.read(f"xl/worksheets/sheet{i}.xml").decode() for i in range(1, 4)]
+        for sheet, first, last in zip(sheets, (0, 3, 6), (2, 5, 6)):
+            self.assertIn("<t>ID</t>", sheet)
+            self.assertIn(f"<t>item-{first}</t>", sheet)
+            self.assertIn(f"<t>item-{last}</t>", sheet)
+            self.assertNotIn('<row r="5"', sheet)
+        self.assertNotIn("<t>item-3</t>", sheets[0])
+
+class FakeSession:
+    def __init__(self, sessions):
+        self.closed = False
+        sessions.append(self)
+
+    def close(self):
+        self.closed = True
+
+class TestFetchSheets(unittest.TestCase):
+    def test_sheets_are_fetched_concurrently_in_own_sessions(self):
+        sessions = []
+        threads = set()
+
+        def slow_items(count):
+            def fetch(db):
+                threads.add(threading.get_ident())
+                time.sleep(0.3)
+                return list(_items(count))
+            return fetch
+
+        sources = [SheetSource(f"Sheet {i}", COLUMNS, slow_items(i + 1)) for i in range(3)]
+        started = time.perf_counter()
+        output = write_workbook(fetch_sheets(lambda: FakeSession(sessions), sources))
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(len(threads), 3)
+        self.assertTrue(len(sessions) == 3 and all(session.closed for session in sessions))
+        workbook = zipfile.ZipFile(io.BytesIO(b"".join(iter_buffer(output))))
+        self.assertIn('name="Sheet 2"', workbook.read("xl/workbook.xml").decode())
+        self.assertIn('<row r="4"', workbook.read("xl/worksheets/sheet3.xml").decode())
+        self.assertIn("<t>Draft</t>", workbook.read("xl/worksheets/sheet3.xml").decode())
+
+    def test_sheets_ahead_of_the_writer_fetch_a_bounded_number_of_chunks(self):
+        sessions = []
+        pulled = {"count": 0}
+
+        def counted(db):
+            for item in _items(1000):
+                pulled["count"] += 1
+                yield item
+
+        sources = [SheetSource("First", COLUMNS, lambda db: list(_items(1))), SheetSource("Second", COLUMNS, counted)]
+        with mock.patch.object(excel_writer, "EXCEL_EXPORT_CHUNK_ROWS", 10), mock.patch.object(excel_writer, "EXCEL_PREFETCH_CHUNKS", 2):
+            sheets = fetch_sheets(lambda: FakeSession(sessions), sources)
+            first = next(sheets)
+            time.sleep(0.3)
+            # Two chunks queued and one waiting to be queued
+            self.assertLessEqual(pulled["count"], 30)
+            self.assertEqual(len(list(first.rows)), 1)
+            self.assertEqual(len(list(next(sheets).rows)), 1000)
+            sheets.close()
+        self.assertTrue(all(session.closed for session in sessions))
+
+    def test_stopping_early_releases_the_fetches(self):
+        sessions = []
+        sources = [SheetSource("First", COLUMNS, lambda db: list(_items(1))), SheetSource("Second", COLUMNS, lambda db: _items(10 ** 6))]
+        with mock.patch.object(excel_writer, "EXCEL_EXPORT_CHUNK_ROWS", 10), mock.patch.object(excel_writer, "EXCEL_PREFETCH_CHUNKS", 1):
+            sheets = fetch_sheets(lambda: FakeSession(sessions), sources)
+            next(sheets)
+            sheets.close()
+            deadline = time.monotonic() + 2
+            while not (len(sessions) == 2 and all(session.closed for session in sessions)) and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertTrue(len(sessions) == 2 and all(session.closed for session in sessions))
+
+    def test_fetch_errors_reach_the_writer(self):
+        def broken(db):
+            raise RuntimeError("query failed")
+
+        sources = [SheetSource("Items", COLUMNS, lambda db: list(_items(1))), SheetSource("Broken", COLUMNS, broken)]
+        with self.assertRaisesRegex(RuntimeError, "query failed"):
+            write_workbook(fetch_sheets(lambda: FakeSession([]), sources))
+
+class TestFetchSheetsFromAPool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # Two connections, like the report pool, and a short timeout instead of DB_POOL_TIMEOUT
+        self.engine = create_engine(
+            f"sqlite:///{os.path.join(self.tmpdir.name, 'export.db')}",
+            poolclass=QueuePool, pool_size=2, max_overflow=0, pool_timeout=0.5
+        )
+        self.session_factory = sessionmaker(bind=self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _sources(self):
+        def slow(db):
+            db.execute(text("SELECT 1"))
+            time.sleep(1.0)
+            return list(_items(1))
+
+        def large(db):
+            db.execute(text("SELECT 1"))
+            return _items(100)
+
+        return [SheetSource("Slow", COLUMNS, slow)] + [SheetSource(f"Large {i}", COLUMNS, large) for i in range(3)]
+
+    def test_more_sheets_than_connections_wait_for_one(self):
+        results = []
+
+        def export():
+            output = io.BytesIO()
+            write_sheets(output, fetch_sheets(self.session_factory, self._sources()))
+            results.append(zipfile.ZipFile(output))
+
+        # Two workbooks of four sheets each share the two connections
+        with mock.patch.object(excel_writer, "EXCEL_EXPORT_CHUNK_ROWS", 10), mock.patch.object(excel_writer, "EXCEL_PREFETCH_CHUNKS", 1):
+            threads = [threading.Thread(target=export) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=30)
+        self.assertEqual(len(results), 2)
+        for workbook in results:
+            self.assertIn("<t>item-99</t>", workbook.read("xl/worksheets/sheet4.xml").decode())
+        self.assertEqual(self.engine.pool.checkedout(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import asyncio
+import sys
+import os
+import io
+import tempfile
+import threading
+import time
+import zipfile
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.excel_export import _export_excel, build_export
+from app.db.models import Base, Organization as DBOrganization
+from app.models.export_job import ExcelExport, ExportJobStatus
+from app.services.bulkhead import Bulkhead
+from app.services.export_jobs import ExportJobManager
+
+def _wait(job, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while job.status in (ExportJobStatus.QUEUED, ExportJobStatus.RUNNING) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job
+
+class TestExportJobManager(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.bulkhead = Bulkhead("test-exports", max_concurrent=1, max_queue=4)
+        self.jobs = ExportJobManager(self.directory.name, ttl_seconds=60, bulkhead=self.bulkhead)
+
+    def tearDown(self):
+        self.bulkhead._executor.shutdown(wait=True)
+        self.directory.cleanup()
+
+    def test_identical_requests_attach_to_the_running_job(self):
+        release = threading.Event()
+
+        def build(path, report_progress):
+            report_progress(0.5)
+            release.wait(5)
+            with open(path, "wb") as f:
+                f.write(b"export")
+
+        first = self.jobs.submit("report:primary", "report", "report.xlsx", build)
+        second = self.jobs.submit("report:primary", "report", "report.xlsx", build)
+        self.assertIs(first, second)
+        other = self.jobs.submit("report:replica", "report", "report.xlsx", build)
+        self.assertIsNot(first, other)
+
+        release.set()
+        _wait(first)
+        _wait(other)
+        self.assertEqual(first.status, ExportJobStatus.SUCCEEDED)
+        self.assertEqual(first.progress, 1.0)
+        with open(first.path, "rb") as f:
+            self.assertEqual(f.read(), b"export")
+        self.assertEqual(self.jobs.stats()["attached"], 1)
+
+        # A finished job is not attached to; the next request starts a new one
+        self.assertIsNot(self.jobs.submit("report:primary", "report", "report.xlsx", build), first)
+
+    def test_failed_jobs_keep_the_error_and_no_file(self):
+        def build(path, report_progress):
+            with open(path, "wb") as f:
+                f.write(b"partial")
+            raise RuntimeError("database went away")
+
+        job = _wait(self.jobs.submit("report:primary", "report", "report.xlsx", build))
+        self.assertEqual(job.status, ExportJobStatus.FAILED)
+        self.assertEqual(job.error, "database went away")
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_expired_jobs_and_stale_files_are_removed(self):
+        stale = os.path.join(self.directory.name, "0123456789abcdef.xlsx")
+        with open(stale, "wb") as f:
+            f.write(b"left over")
+        os.utime(stale, (time.time() - 120, time.time() - 120))
+
+        job = _wait(self.jobs.submit("report:primary", "report", "report.xlsx", lambda path, _: open(path, "wb").close()))
+        self.assertTrue(os.path.exists(job.path))
+        self.assertFalse(os.path.exists(stale))
+        self.assertIs(self.jobs.get(job.job_id), job)
+
+        job._expires = time.monotonic()
+        self.assertIsNone(self.jobs.get(job.job_id))
+        self.assertFalse(os.path.exists(job.path))
+
+class TestBuildExport(unittest.TestCase):
+    def test_export_written_with_a_session_of_its_own(self):
+        # A database file, since the sheets are fetched from other threads
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        engine = create_engine(f"sqlite:///{os.path.join(directory.name, 'exports.db')}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        with session_factory() as db:
+            db.add(DBOrganization(organization_pk="org-1", name="Parent"))
+            db.commit()
+
+        progress = []
+        path = os.path.join(directory.name, "organizations.xlsx")
+        build_export(session_factory, ExcelExport.ORGANIZATIONS, path, progress.append)
+        engine.dispose()
+        with zipfile.ZipFile(path) as workbook:
+            self.assertIn('name="Organizations"', workbook.read("xl/workbook.xml").decode())
+            self.assertIn("<t>Parent</t>", workbook.read("xl/worksheets/sheet1.xml").decode())
+        self.assertEqual(progress, [0.0, 1.0])
+
+    def test_exports_read_plain_rows_of_every_record(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        db.add_all([DBOrganization(organization_pk=f"org-{i:03d}", name=f"Organization {i}") for i in range(150)])
+        db.commit()
+        db.expunge_all()
+
+        response = _export_excel(db, ExcelExport.ORGANIZATIONS)
+        async def read_body():
+            return b"".join([chunk async for chunk in response.body_iterator])
+
+        data = asyncio.run(read_body())
+        self.assertEqual(len(db.identity_map), 0)
+        sheet = zipfile.ZipFile(io.BytesIO(data)).read("xl/worksheets/sheet1.xml").decode()
+        self.assertIn('<row r="151"', sheet)
+        self.assertIn("<t>Organization 149</t>", sheet)
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    unittest.main()
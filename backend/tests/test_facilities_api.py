@@ -1,5 +1,6 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
 import sys
 import os
 import json
@@ -32,32 +33,32 @@ class TestFacilitiesAPI(unittest.TestCase):
     @patch('app.api.facilities.facility_service')
     def test_get_facilities(self, mock_service):
         # Mock the service response
-        mock_service.get_facilities.return_value = [MagicMock()]
+        mock_service.get_facilities_async = AsyncMock(return_value=[MagicMock()])
         
         # Test the API endpoint
-        with patch('app.api.facilities.get_db', return_value=MagicMock()):
+        with patch('app.api.facilities.get_async_db', return_value=MagicMock()):
             response = self.client.get("/api/facilities/")
         
         # Assert that the response is successful
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called
-        mock_service.get_facilities.assert_called_once()
+        mock_service.get_facilities_async.assert_called_once()
     
     @patch('app.api.facilities.facility_service')
     def test_get_facility(self, mock_service):
         # Mock the service response
-        mock_service.get_facility.return_value = MagicMock()
+        mock_service.get_facility_async = AsyncMock(return_value=MagicMock())
         
         # Test the API endpoint
-        with patch('app.api.facilities.get_db', return_value=MagicMock()):
+        with patch('app.api.facilities.get_async_db', return_value=MagicMock()):
             response = self.client.get(f"/api/facilities/{self.sample_facility['facility_pk']}")
         
         # Assert that the response is successful
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called with the correct parameters
-        mock_service.get_facility.assert_called_once_with(
+        mock_service.get_facility_async.assert_called_once_with(
             MagicMock(), 
             facility_pk=self.sample_facility['facility_pk']
         )
@@ -65,16 +66,16 @@ class TestFacilitiesAPI(unittest.TestCase):
     @patch('app.api.facilities.facility_service')
     def test_get_facility_not_found(self, mock_service):
         # Mock the service response
-        mock_service.get_facility.return_value = None
+        mock_service.get_facility_async = AsyncMock(return_value=None)
         
         # Test the API endpoint
-        with patch('app.api.facilities.get_db', return_value=MagicMock()):
+        with patch('app.api.facilities.get_async_db', return_value=MagicMock()):
             # This should raise an HTTPException with status code 404
             with self.assertRaises(HTTPException) as context:
-                facilities.get_facility(
+                asyncio.run(facilities.get_facility(
                     self.sample_facility['facility_pk'],
                     MagicMock()
-                )
+                ))
             
             # Assert that the exception has the correct status code
             self.assertEqual(context.exception.status_code, 404)
@@ -82,10 +83,10 @@ class TestFacilitiesAPI(unittest.TestCase):
     @patch('app.api.facilities.facility_service')
     def test_create_facility(self, mock_service):
         # Mock the service response
-        mock_service.create_facility.return_value = MagicMock()
+        mock_service.create_facility_async = AsyncMock(return_value=MagicMock())
         
         # Test the API endpoint
-        with patch('app.api.facilities.get_db', return_value=MagicMock()):
+        with patch('app.api.facilities.get_async_db', return_value=MagicMock()):
             response = self.client.post(
                 "/api/facilities/",
                 json=self.sample_facility
@@ -95,7 +96,7 @@ class TestFacilitiesAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called
-        mock_service.create_facility.assert_called_once()
+        mock_service.create_facility_async.assert_called_once()
 
 if __name__ == '__main__':
     unittest.main()
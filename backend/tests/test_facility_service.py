@@ -63,7 +63,7 @@ class TestFacilityService(unittest.TestCase):
     def test_get_facilities(self):
         # Mock the database query
         mock_facilities = [MagicMock(), MagicMock()]
-        self.mock_db.query.return_value.offset.return_value.limit.return_value.all.return_value = mock_facilities
+        self.mock_db.query.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_facilities
         
         # Call the service method
         result = facility_service.get_facilities(self.mock_db, skip=0, limit=100)
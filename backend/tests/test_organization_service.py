@@ -54,7 +54,7 @@ class TestOrganizationService(unittest.TestCase):
     def test_get_organizations(self):
         # Mock the database query
         mock_orgs = [MagicMock(), MagicMock()]
-        self.mock_db.query.return_value.offset.return_value.limit.return_value.all.return_value = mock_orgs
+        self.mock_db.query.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_orgs
         
         # Call the service method
         result = organization_service.get_organizations(self.mock_db, skip=0, limit=100)
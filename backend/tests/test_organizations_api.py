@@ -1,5 +1,6 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
 import sys
 import os
 import json
@@ -28,32 +29,32 @@ class TestOrganizationsAPI(unittest.TestCase):
     @patch('app.api.organizations.organization_service')
     def test_get_organizations(self, mock_service):
         # Mock the service response
-        mock_service.get_organizations.return_value = [MagicMock()]
+        mock_service.get_organizations_async = AsyncMock(return_value=[MagicMock()])
         
         # Test the API endpoint
-        with patch('app.api.organizations.get_db', return_value=MagicMock()):
+        with patch('app.api.organizations.get_async_db', return_value=MagicMock()):
             response = self.client.get("/api/organizations/")
         
         # Assert that the response is successful
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called
-        mock_service.get_organizations.assert_called_once()
+        mock_service.get_organizations_async.assert_called_once()
     
     @patch('app.api.organizations.organization_service')
     def test_get_organization(self, mock_service):
         # Mock the service response
-        mock_service.get_organization.return_value = MagicMock()
+        mock_service.get_organization_async = AsyncMock(return_value=MagicMock())
         
         # Test the API endpoint
-        with patch('app.api.organizations.get_db', return_value=MagicMock()):
+        with patch('app.api.organizations.get_async_db', return_value=MagicMock()):
             response = self.client.get(f"/api/organizations/{self.sample_organization['organization_pk']}")
         
         # Assert that the response is successful
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called with the correct parameters
-        mock_service.get_organization.assert_called_once_with(
+        mock_service.get_organization_async.assert_called_once_with(
             MagicMock(), 
             organization_pk=self.sample_organization['organization_pk']
         )
@@ -61,16 +62,16 @@ class TestOrganizationsAPI(unittest.TestCase):
     @patch('app.api.organizations.organization_service')
     def test_get_organization_not_found(self, mock_service):
         # Mock the service response
-        mock_service.get_organization.return_value = None
+        mock_service.get_organization_async = AsyncMock(return_value=None)
         
         # Test the API endpoint
-        with patch('app.api.organizations.get_db', return_value=MagicMock()):
+        with patch('app.api.organizations.get_async_db', return_value=MagicMock()):
             # This should raise an HTTPException with status code 404
             with self.assertRaises(HTTPException) as context:
-                organizations.get_organization(
+                asyncio.run(organizations.get_organization(
                     self.sample_organization['organization_pk'],
                     MagicMock()
-                )
+                ))
             
             # Assert that the exception has the correct status code
             self.assertEqual(context.exception.status_code, 404)
@@ -78,10 +79,10 @@ class TestOrganizationsAPI(unittest.TestCase):
     @patch('app.api.organizations.organization_service')
     def test_create_organization(self, mock_service):
         # Mock the service response
-        mock_service.create_organization.return_value = MagicMock()
+        mock_service.create_organization_async = AsyncMock(return_value=MagicMock())
         
         # Test the API endpoint
-        with patch('app.api.organizations.get_db', return_value=MagicMock()):
+        with patch('app.api.organizations.get_async_db', return_value=MagicMock()):
             response = self.client.post(
                 "/api/organizations/",
                 json=self.sample_organization
@@ -91,7 +92,7 @@ class TestOrganizationsAPI(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         
         # Assert that the service method was called
-        mock_service.create_organization.assert_called_once()
+        mock_service.create_organization_async.assert_called_once()
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import base64
+import sys
+import os
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base
+from app.models.facility import FacilityCreate
+from app.services import facility_service
+from app.services.pagination import InvalidCursorError, decode_cursor, encode_cursor, next_cursor
+
+class TestPagination(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        # Inserted out of order on purpose; pages must come back sorted by key
+        for i in [3, 0, 4, 1, 2]:
+            facility_service.create_facility(self.db, FacilityCreate(
+                facility_pk=f"namespace:master-data--Facility:{i}",
+                name=f"Facility {i}"
+            ))
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor("namespace:master-data--Facility:1")
+        self.assertEqual(decode_cursor(cursor), "namespace:master-data--Facility:1")
+
+    def test_invalid_cursor(self):
+        for cursor in ["not base64!", encode_cursor("x")[:-2] + "$$", "e30"]:
+            with self.assertRaises(InvalidCursorError):
+                decode_cursor(cursor)
+
+    def test_cursor_keys_must_be_strings(self):
+        payloads = [b'{"a":1}', b'[1,2]', b'1', b'"x"']
+        cursors = [base64.urlsafe_b64encode(payload).decode() for payload in payloads]
+        cursors += [encode_cursor(key) for key in [{"a": 1}, [1, 2], 1, None]]
+        for cursor in cursors:
+            with self.assertRaises(InvalidCursorError):
+                decode_cursor(cursor)
+
+    def test_pages_through_all_rows_once(self):
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            page = facility_service.get_facilities(self.db, limit=2, cursor=cursor)
+            seen.extend(f.facility_pk for f in page)
+            pages += 1
+            cursor = next_cursor(page, "facility_pk", 2)
+            if cursor is None:
+                break
+        self.assertEqual(seen, [f"namespace:master-data--Facility:{i}" for i in range(5)])
+        self.assertEqual(pages, 3)
+
+    def test_next_cursor_on_short_page(self):
+        page = facility_service.get_facilities(self.db, limit=10)
+        self.assertEqual(len(page), 5)
+        self.assertIsNone(next_cursor(page, "facility_pk", 10))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine
+
+from app.db.partitioning import detach_partition, is_partitioned, partition_name, partition_range
+
+class TestPartitioning(unittest.TestCase):
+    def test_partition_ranges(self):
+        self.assertEqual(partition_range(datetime(2024, 7, 15, 8, 30), "year"), (datetime(2024, 1, 1), datetime(2025, 1, 1)))
+        self.assertEqual(partition_range(datetime(2024, 12, 31, 23, 59, 59), "month"), (datetime(2024, 12, 1), datetime(2025, 1, 1)))
+        self.assertEqual(partition_name(datetime(2024, 1, 1), "year"), "emission_statements_y2024")
+        self.assertEqual(partition_name(datetime(2024, 3, 1), "month"), "emission_statements_m202403")
+        with self.assertRaises(ValueError):
+            partition_range(datetime(2024, 1, 1), "week")
+
+    def test_other_databases_are_not_partitioned(self):
+        engine = create_engine("sqlite://")
+        with engine.connect() as conn:
+            self.assertFalse(is_partitioned(conn))
+            with self.assertRaises(ValueError):
+                detach_partition(conn, "emission_statements_default")
+        engine.dispose()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base
+from app.services import emission_aggregation_service, emission_service
+from app.services.prorating import prorate
+
+class TestProrate(unittest.TestCase):
+    def test_split_by_days_in_month(self):
+        # A bill from 15 January to 14 February: 17 days in January, 14 in February
+        rows, starts, portions = prorate(
+            [datetime(2024, 1, 15)], [datetime(2024, 2, 14, 23, 59, 59)], [31.0], "month"
+        )
+        self.assertEqual(rows.tolist(), [0, 0])
+        self.assertEqual(starts.tolist(), [datetime(2024, 1, 1), datetime(2024, 2, 1)])
+        np.testing.assert_allclose(portions, [17.0, 14.0])
+
+    def test_buckets_and_window(self):
+        starts = [datetime(2023, 12, 1), datetime(2024, 3, 10, 12), datetime(2024, 5, 1)]
+        ends = [datetime(2024, 5, 31, 23, 59, 59), datetime(2024, 3, 10, 12), datetime(2024, 4, 1)]
+        values = [183.0, 5.0, 1.0]
+
+        rows, starts_of_buckets, portions = prorate(starts, ends, values, "quarter")
+        self.assertEqual(rows.tolist(), [0, 0, 0, 1, 2])
+        self.assertEqual([d.month for d in starts_of_buckets.tolist()], [10, 1, 4, 1, 4])
+        np.testing.assert_allclose(portions, [31.0, 91.0, 61.0, 5.0, 1.0])
+
+        # Only the part inside the window counts, still as a share of the whole period
+        rows, _, portions = prorate(starts, ends, values, "year", datetime(2024, 1, 1), datetime(2024, 3, 1))
+        self.assertEqual(rows.tolist(), [0])
+        np.testing.assert_allclose(portions, [60.0])
+
+class TestProratedAggregation(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        rows = [
+            ("s1", "org-1", 31.0, "kg CO2e", datetime(2024, 1, 15), datetime(2024, 2, 14, 23, 59, 59)),
+            ("s2", "org-1", 0.029, "t CO2e", datetime(2024, 2, 1), datetime(2024, 2, 29, 23, 59, 59)),
+            ("s3", "org-2", 90.0, "kg CO2e", datetime(2024, 3, 1), datetime(2024, 5, 29, 23, 59, 59)),
+        ]
+        emission_service.bulk_create_emission_statements(self.db, [
+            {
+                "emission_statement_pk": pk,
+                "emission_activity_id": "activity-1",
+                "value": value,
+                "unit": unit,
+                "reporting_period_start": start,
+                "reporting_period_end": end,
+                "organization_id": organization
+            }
+            for pk, organization, value, unit, start, end in rows
+        ])
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_prorated_months(self):
+        rows = emission_aggregation_service.prorate_emissions(
+            self.db, ["period"], "month", normalize=True, start=datetime(2024, 2, 1), end=datetime(2024, 4, 1)
+        )
+        self.assertEqual([(row["period_start"], row["statement_count"]) for row in rows], [
+            (datetime(2024, 2, 1), 2), (datetime(2024, 3, 1), 1),
+        ])
+        self.assertAlmostEqual(rows[0]["total"], 14.0 + 29.0)
+        self.assertAlmostEqual(rows[1]["total"], 31.0)
+
+        rows = emission_aggregation_service.prorate_emissions(self.db, ["organization"], "quarter")
+        self.assertEqual([(row["organization_id"], row["unit"]) for row in rows], [
+            ("org-1", "kg CO2e"), ("org-1", "t CO2e"), ("org-2", "kg CO2e"),
+        ])
+        self.assertEqual([round(row["total"], 6) for row in rows], [31.0, 0.029, 90.0])
+
+if __name__ == '__main__':
+    unittest.main()
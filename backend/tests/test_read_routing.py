@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import time
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.db import routing
+
+class TestReadRouting(unittest.TestCase):
+    def _request(self, cookies=None):
+        request = MagicMock()
+        request.cookies = cookies or {}
+        return request
+
+    def test_without_replica_reads_use_primary(self):
+        with patch('app.db.database.DATABASE_REPLICA_URL', None):
+            self.assertFalse(routing.use_replica(self._request()))
+
+    def test_reads_use_replica_when_configured(self):
+        with patch('app.db.database.DATABASE_REPLICA_URL', "postgresql://replica/db"):
+            self.assertTrue(routing.use_replica(self._request()))
+
+    def test_recent_write_sticks_to_primary(self):
+        with patch('app.db.database.DATABASE_REPLICA_URL', "postgresql://replica/db"):
+            recent = {routing.PRIMARY_STICKY_COOKIE: str(time.time() + 30)}
+            expired = {routing.PRIMARY_STICKY_COOKIE: str(time.time() - 1)}
+            garbage = {routing.PRIMARY_STICKY_COOKIE: "not-a-number"}
+            self.assertFalse(routing.use_replica(self._request(recent)))
+            self.assertTrue(routing.use_replica(self._request(expired)))
+            self.assertTrue(routing.use_replica(self._request(garbage)))
+
+    def test_report_read_db_picks_session_factory(self):
+        replica_factory = MagicMock()
+        primary_factory = MagicMock()
+        with patch('app.db.database.ReplicaSessionLocal', replica_factory), \
+                patch('app.db.database.ReportSessionLocal', primary_factory), \
+                patch('app.db.database.DATABASE_REPLICA_URL', "postgresql://replica/db"):
+            dependency = routing.get_report_read_db(self._request())
+            self.assertIs(next(dependency), replica_factory.return_value)
+            dependency.close()
+        replica_factory.return_value.close.assert_called_once()
+        primary_factory.assert_not_called()
+
+    def test_middleware_sets_cookie_after_successful_write(self):
+        app = FastAPI()
+        app.middleware("http")(routing.primary_stickiness_middleware)
+
+        @app.get("/items")
+        async def read_items():
+            return []
+
+        @app.post("/items")
+        async def create_item():
+            return {}
+
+        client = TestClient(app)
+        self.assertNotIn(routing.PRIMARY_STICKY_COOKIE, client.get("/items").cookies)
+        response = client.post("/items")
+        self.assertIn(routing.PRIMARY_STICKY_COOKIE, response.cookies)
+        self.assertGreater(float(response.cookies[routing.PRIMARY_STICKY_COOKIE]), time.time())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.models import Base, EmissionStatement as DBEmissionStatement
+from app.services import emission_service
+from app.services.streaming_upload import ingest_stream, upload_format
+
+HEADER = "emission_statement_pk,emission_activity_id,emission_calculation_model_id,value,unit,reporting_period_start,reporting_period_end,facility_id,organization_id\n"
+
+def csv_line(i, value=None):
+    return (
+        f"stmt-{i},activity-1,,{value if value is not None else i},kg CO2e,"
+        f"2024-01-01T00:00:00,2024-01-31T23:59:59,,org-1\n"
+    )
+
+async def byte_chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+class TestStreamingUpload(unittest.TestCase):
+    def setUp(self):
+        # The writer runs in the threadpool, so the in-memory database must be shared across threads
+        self.engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def ingest(self, data: bytes, format: str, chunk_size: int = 4, read_size: int = 7, **kwargs):
+        return asyncio.run(ingest_stream(
+            self.db,
+            byte_chunks(data, read_size),
+            format,
+            emission_service.bulk_create_emission_statements,
+            chunk_size=chunk_size,
+            **kwargs
+        ))
+
+    def count(self):
+        return self.db.scalar(select(func.count()).select_from(DBEmissionStatement))
+
+    def test_upload_format(self):
+        self.assertEqual(upload_format("text/csv; charset=utf-8"), "csv")
+        self.assertEqual(upload_format("application/x-ndjson"), "ndjson")
+        self.assertEqual(upload_format("application/json", "NDJSON"), "ndjson")
+        self.assertIsNone(upload_format("application/json"))
+
+    def test_csv_upload_in_chunks(self):
+        body = HEADER + "".join(csv_line(i) for i in range(10))
+        # A quoted unit spanning two lines and a multi-byte character split across reads
+        body += 'stmt-10,activity-1,,1.5,"t CO2e\nper ünit",2024-01-01T00:00:00,2024-01-31T23:59:59,,org-1\n'
+        body += csv_line(11, value="not-a-number")
+        body += "stmt-12,activity-1\n"
+
+        result = self.ingest(body.encode(), "csv")
+
+        self.assertEqual((result.received, result.inserted, result.failed), (13, 11, 2))
+        self.assertEqual(result.chunks, 3)
+        self.assertEqual(result.bytes_received, len(body.encode()))
+        self.assertEqual([error.index for error in result.errors], [11, 12])
+        self.assertIn("value", result.errors[0].message)
+        self.assertIn("columns", result.errors[1].message)
+        self.assertEqual(self.count(), 11)
+        self.assertEqual(self.db.get(DBEmissionStatement, "stmt-10").unit, "t CO2e\nper ünit")
+        self.assertIsNone(self.db.get(DBEmissionStatement, "stmt-0").facility_id)
+
+    def test_ndjson_upload_with_bad_lines(self):
+        lines = []
+        for i in range(5):
+            lines.append(json.dumps({
+                "emission_statement_pk": f"stmt-{i}",
+                "emission_activity_id": "activity-1",
+                "value": i,
+                "unit": "kg CO2e",
+                "reporting_period_start": "2024-01-01T00:00:00",
+                "reporting_period_end": "2024-01-31T23:59:59",
+                "organization_id": "org-1"
+            }))
+        lines.insert(2, "{not json")
+        lines.insert(4, "")
+        lines.append(lines[0])
+
+        result = self.ingest("\n".join(lines).encode(), "ndjson", max_errors=1)
+
+        self.assertEqual((result.received, result.inserted, result.failed), (7, 5, 2))
+        self.assertEqual(len(result.errors), 1)
+        self.assertTrue(result.errors_truncated)
+        self.assertIn("Invalid JSON", result.errors[0].message)
+        self.assertEqual(self.count(), 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from sqlalchemy import create_engine, literal_column, select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, EmissionStatement as DBEmissionStatement
+from app.services import emission_aggregation_service, emission_service
+from app.services.units import UnitRegistry, sql_unit_key, unit_key, unit_registry
+
+class TestUnitRegistry(unittest.TestCase):
+    def test_unit_key(self):
+        self.assertEqual(unit_key("kg CO2e"), unit_key("kgCO2e"))
+        self.assertEqual(unit_key(" kg  CO2-eq "), unit_key("kg CO2e"))
+        self.assertNotEqual(unit_key("Mt CO2e"), unit_key("mt CO2e"))
+
+    def test_convert_many(self):
+        values, units = unit_registry.convert_many(
+            [1.0, 2.0, 3.0, 4.0, 5.0], ["t CO2e", "g CO2e", "furlong", None, "t CO2e"]
+        )
+        np.testing.assert_allclose(values[[0, 1, 4]], [1000.0, 0.002, 5000.0])
+        self.assertTrue(np.isnan(values[2]) and np.isnan(values[3]))
+        self.assertEqual(units.tolist(), ["kg CO2e", "kg CO2e", None, None, "kg CO2e"])
+
+    def test_sql_factor_matches_registry(self):
+        engine = create_engine("sqlite://")
+        units = ["kg CO2e", "t CO2e", "kgCO2-eq", "lb CO2e", "furlong"]
+        with engine.connect() as conn:
+            factors = [
+                conn.execute(select(unit_registry.sql_factor(literal_column(f"'{unit}'")))).scalar()
+                for unit in units
+            ]
+        self.assertEqual(factors, [1.0, 1000.0, 1.0, 0.45359237, None])
+
+    def test_sql_unit_key_matches_unit_key(self):
+        engine = create_engine("sqlite://")
+        units = [
+            "kg CO2e", "kg co2e", "t co2eq", "kg CO2_e", "kg CO2-equivalent", "t Co2_Eq", " kg  CO2-eq ",
+            "kg\tCO2e", "Mt CO2e", "mt CO2e", "CO2e", "kg CO2", "kg CO2e per year", "furlong",
+        ]
+        with engine.connect() as conn:
+            keys = [conn.execute(select(sql_unit_key(literal_column(f"'{unit}'")))).scalar() for unit in units]
+            factors = [
+                conn.execute(select(unit_registry.sql_factor(literal_column(f"'{unit}'")))).scalar()
+                for unit in units
+            ]
+        self.assertEqual(keys, [unit_key(unit) for unit in units])
+        self.assertEqual(factors, [unit_registry.convert(1.0, unit)[0] for unit in units])
+
+    def test_custom_registry(self):
+        registry = UnitRegistry()
+        registry.register("MWh", 1000.0, "kWh")
+        self.assertEqual(registry.convert(2.5, "MWh"), (2500.0, "kWh"))
+        self.assertEqual(registry.convert(1.0, "kg CO2e"), (None, None))
+
+class TestNormalizedValues(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        rows = [
+            {
+                "emission_statement_pk": f"stmt-{i}",
+                "emission_activity_id": "activity-1",
+                "value": value,
+                "unit": unit,
+                "reporting_period_start": datetime(2024, 1, 1),
+                "reporting_period_end": datetime(2024, 1, 31),
+                "organization_id": "org-1"
+            }
+            for i, (value, unit) in enumerate([(1.5, "t CO2e"), (500.0, "kg CO2e"), (250.0, "g CO2e"), (7.0, "furlong")])
+        ]
+        emission_service.bulk_create_emission_statements(self.db, rows)
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_normalized_at_ingest(self):
+        stored = {
+            row.emission_statement_pk: (row.normalized_value, row.normalized_unit)
+            for row in self.db.scalars(select(DBEmissionStatement))
+        }
+        self.assertEqual(stored, {
+            "stmt-0": (1500.0, "kg CO2e"),
+            "stmt-1": (500.0, "kg CO2e"),
+            "stmt-2": (0.25, "kg CO2e"),
+            "stmt-3": (None, None),
+        })
+
+    def test_normalized_aggregation_and_backfill(self):
+        rows = emission_aggregation_service.aggregate_emissions(self.db, [], normalize=True)
+        self.assertEqual([(row["unit"], row["total"], row["statement_count"]) for row in rows], [
+            ("furlong", 7.0, 1), ("kg CO2e", 2000.25, 3),
+        ])
+
+        # Rows stored without normalized values are converted after aggregation and then backfilled
+        self.db.execute(update(DBEmissionStatement).values(normalized_value=None, normalized_unit=None))
+        self.db.commit()
+        rows = emission_aggregation_service.aggregate_emissions(self.db, [], normalize=True)
+        self.assertEqual([(row["unit"], row["total"], row["statement_count"]) for row in rows], [
+            ("furlong", 7.0, 1), ("kg CO2e", 2000.25, 3),
+        ])
+        self.assertEqual(emission_service.backfill_normalized_values(self.db, batch_size=2), 3)
+        self.assertEqual(self.db.get(DBEmissionStatement, "stmt-0").normalized_value, 1500.0)
+
+if __name__ == '__main__':
+    unittest.main()
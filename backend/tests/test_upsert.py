@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+
+# Add the backend directory to the path so we can import the modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Base, Organization as DBOrganization
+from app.services import facility_service, organization_service
+
+class TestUpsert(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+
+        @event.listens_for(self.engine, "connect")
+        def enable_foreign_keys(connection, record):
+            connection.execute("PRAGMA foreign_keys=ON")
+
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_reports_inserted_updated_and_unchanged(self):
+        rows = [{"facility_pk": f"facility-{i}", "name": f"Facility {i}", "city": "Utrecht"} for i in range(5)]
+        result = facility_service.upsert_facilities(self.db, rows)
+        self.assertEqual((result.inserted, result.updated, result.unchanged, result.failed), (5, 0, 0, 0))
+
+        # Re-delivering the same batch is a no-op
+        result = facility_service.upsert_facilities(self.db, rows)
+        self.assertEqual((result.inserted, result.updated, result.unchanged, result.failed), (0, 0, 5, 0))
+
+        rows[1]["city"] = "Delft"
+        rows[3]["city"] = None
+        rows.append({"facility_pk": "facility-5", "name": "Facility 5"})
+        result = facility_service.upsert_facilities(self.db, rows)
+        self.assertEqual((result.received, result.inserted, result.updated, result.unchanged), (6, 1, 2, 3))
+        self.assertEqual(facility_service.get_facility(self.db, "facility-1").city, "Delft")
+        self.assertIsNone(facility_service.get_facility(self.db, "facility-3").city)
+
+    def test_row_errors_do_not_abort_batch(self):
+        rows = [
+            {"organization_pk": "org-parent", "name": "Parent"},
+            {"organization_pk": "org-child", "name": "Child", "parent_organization_id": "org-parent"},
+            {"organization_pk": "org-orphan", "name": "Orphan", "parent_organization_id": "org-missing"},
+            {"organization_pk": "org-nameless"},
+            {"organization_pk": "org-parent", "name": "Parent again"},
+        ]
+        result = organization_service.upsert_organizations(self.db, rows)
+
+        self.assertEqual((result.received, result.inserted, result.failed), (5, 2, 3))
+        self.assertEqual([error.index for error in result.errors], [2, 3, 4])
+        self.assertIn("FOREIGN KEY", result.errors[0].message)
+        self.assertIn("name", result.errors[1].message)
+        self.assertIn("Duplicate", result.errors[2].message)
+        self.assertEqual(self.db.get(DBOrganization, "org-parent").name, "Parent")
+
+if __name__ == '__main__':
+    unittest.main()